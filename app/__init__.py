@@ -15,11 +15,11 @@ def create_app():
     # Enable CORS
     CORS(app)
 
-    # Initialize database
-    from .db import init_db
-    from .game_teams_init_db import init_game_teams_db
-    init_db()
-    init_game_teams_db()
+    # Initialize database (no-op when the schema is already current)
+    from .db import init_app
+    from .migrations import migrate
+    init_app(app)
+    migrate()
 
     # Initialize Swagger
     swagger = Swagger(app)
@@ -0,0 +1,196 @@
+import sqlite3
+import logging
+import threading
+import time
+import heapq
+from bisect import bisect_left
+from .db import get_connection, close_connection
+from .data_versions import get_data_versions
+
+logger = logging.getLogger(__name__)
+
+# suggestion type -> (table, column) pairs whose distinct values are suggested
+SOURCES = {
+    'teams': (('game_teams', 'team_name'), ('ewc_teams_players', 'team_name'),
+              ('team_information', 'team_page_name'), ('matches', 'team1'), ('matches', 'team2')),
+    'players': (('transfers', 'player_name'), ('player_information', 'player_page_name')),
+    'tournaments': (('matches', 'tournament'), ('ewc_teams_players', 'tournament')),
+    'games': (('games', 'game_name'), ('game_teams', 'game_name'), ('matches', 'game')),
+}
+SOURCE_TABLES = sorted({table for sources in SOURCES.values() for table, _ in sources})
+
+MAX_SUGGESTIONS = 20
+# Prefixes matching more keys than this get their top MAX_SUGGESTIONS
+# precomputed; anything narrower is ranked on the fly
+SCAN_LIMIT = 64
+# search_logs window used for popularity, and how long a built index may
+# serve before popularity is re-read even if no source table changed
+POPULARITY_DAYS = 90
+POPULARITY_TTL = 300
+
+_END = '\U0010ffff'
+
+# The current index, replaced wholesale on rebuild so readers never lock
+_index = None
+_lock = threading.Lock()
+_refreshing = False
+
+
+def _keys(name):
+    """The lowercased name plus every word-start suffix, so 'liq' finds 'Team Liquid'"""
+    words = name.lower().split()
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+def _load(conn):
+    """[(name, type, searches, mentions)] for every distinct suggestion"""
+    mentions = {}
+    for entity_type, sources in SOURCES.items():
+        for table, column in sources:
+            rows = conn.execute(f'''
+                SELECT {column}, COUNT(*) FROM {table}
+                WHERE {column} IS NOT NULL AND TRIM({column}) != ''
+                GROUP BY {column}
+            ''').fetchall()
+            for value, count in rows:
+                name = ' '.join(str(value).split())
+                spellings = mentions.setdefault((entity_type, name.lower()), {})
+                spellings[name] = spellings.get(name, 0) + count
+
+    searches = dict(conn.execute('''
+        SELECT LOWER(TRIM(query)), COUNT(*) FROM search_logs
+        WHERE created_at >= datetime('now', ?) AND TRIM(query) != ''
+        GROUP BY LOWER(TRIM(query))
+    ''', (f'-{POPULARITY_DAYS} days',)).fetchall())
+
+    entries = []
+    for (entity_type, _), spellings in mentions.items():
+        # Show the most common spelling of the name
+        name = max(spellings, key=lambda spelling: (spellings[spelling], spelling))
+        hits = sum(searches.get(key, 0) for key in _keys(name))
+        entries.append((name, entity_type, hits, sum(spellings.values())))
+    return entries
+
+
+def _top_lists(keys, ranks):
+    """{prefix: best ranks} for every prefix matching more than SCAN_LIMIT keys"""
+    top = {}
+    pending = [(0, len(keys), 1)]
+    while pending:
+        lo, hi, length = pending.pop()
+        i = lo
+        while i < hi:
+            if len(keys[i]) < length:
+                i += 1
+                continue
+            prefix = keys[i][:length]
+            j = bisect_left(keys, prefix + _END, i, hi)
+            if j - i > SCAN_LIMIT:
+                top[prefix] = heapq.nsmallest(MAX_SUGGESTIONS, set(ranks[i:j]))
+                pending.append((i, j, length + 1))
+            i = j
+    return top
+
+
+def _build(conn, versions):
+    """
+    Build the index: entries ranked once by (searches, mentions) so a lower
+    rank is a better suggestion, and per type a sorted key array standing in
+    for a trie, with the rank lists of its crowded nodes precomputed.
+    """
+    entries = sorted(_load(conn), key=lambda e: (-e[2], -e[3], e[0].lower(), e[1]))
+    types = {}
+    for entity_type in SOURCES:
+        pairs = sorted((key, rank) for rank, entry in enumerate(entries)
+                       if entry[1] == entity_type for key in _keys(entry[0]))
+        keys = [key for key, _ in pairs]
+        ranks = [rank for _, rank in pairs]
+        types[entity_type] = (keys, ranks, _top_lists(keys, ranks))
+
+    signature = tuple(versions.get(table) for table in SOURCE_TABLES)
+    return {'signature': signature, 'built_at': time.monotonic(), 'entries': entries, 'types': types}
+
+
+def _rebuild():
+    global _index
+    conn = get_connection()
+    try:
+        index = _build(conn, get_data_versions())
+        _index = index
+        logger.debug(f"Built autocomplete index: {len(index['entries'])} suggestions")
+        return index
+    finally:
+        conn.close()
+
+
+def _refresh_in_background():
+    global _refreshing
+
+    def run():
+        global _refreshing
+        try:
+            _rebuild()
+        except sqlite3.Error as e:
+            logger.error(f"Error refreshing autocomplete index: {str(e)}")
+        finally:
+            _refreshing = False
+            close_connection()
+
+    with _lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    threading.Thread(target=run, name='autocomplete-refresh', daemon=True).start()
+
+
+def get_autocomplete_index():
+    """
+    Return the current index. The first call builds it; after that a stale
+    index (source tables changed, or older than POPULARITY_TTL) keeps
+    serving while a background thread rebuilds it.
+    """
+    index = _index
+    if index is None:
+        with _lock:
+            index = _index if _index is not None else _rebuild()
+        return index
+
+    versions = get_data_versions()
+    signature = tuple(versions.get(table) for table in SOURCE_TABLES)
+    if signature != index['signature'] or time.monotonic() - index['built_at'] > POPULARITY_TTL:
+        _refresh_in_background()
+    return index
+
+
+def _ranks(type_index, prefix, limit):
+    keys, ranks, top = type_index
+    best = top.get(prefix)
+    if best is not None:
+        return best[:limit]
+    lo = bisect_left(keys, prefix)
+    hi = bisect_left(keys, prefix + _END, lo)
+    return heapq.nsmallest(limit, set(ranks[lo:hi]))
+
+
+def autocomplete(prefix, limit=10, types=None):
+    """
+    Up to limit suggestions whose name, or a word within it, starts with
+    prefix, most searched first and then most mentioned.
+    """
+    prefix = ' '.join(prefix.lower().split())
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    if not prefix:
+        return []
+
+    try:
+        index = get_autocomplete_index()
+    except sqlite3.Error as e:
+        logger.error(f"Error building autocomplete index: {str(e)}")
+        return []
+
+    selected = [t for t in (types or SOURCES) if t in index['types']]
+    ranks = heapq.nsmallest(limit, (rank for entity_type in selected
+                                    for rank in _ranks(index['types'][entity_type], prefix, limit)))
+    entries = index['entries']
+    return [{'text': entries[rank][0], 'type': entries[rank][1], 'searches': entries[rank][2]}
+            for rank in ranks]
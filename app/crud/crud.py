@@ -1,6 +1,6 @@
-import json
-import os
 from app.db import get_connection
+from app.spelling import apply_spelling_changes
+from app.ewc_standings import latest_snapshot_ts, standings_by_week, store_standings_snapshot
 
 def get_games_from_db():
     conn = get_connection()
@@ -19,19 +19,26 @@ def store_games_in_db(games_data):
             "INSERT INTO games (game_name, logo_url) VALUES (?, ?)",
             (game["game_name"], game["logo_url"])
         )
+    apply_spelling_changes(cursor)
     conn.commit()
     conn.close()
 
 
 
 def get_ewc_rank_from_db():
-    if os.path.exists("club_championship_standings_api.json"):
-        with open("club_championship_standings_api.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    """The latest standings snapshot as {week name: [team dict, ...]}"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    snapshot_ts = latest_snapshot_ts(cursor)
+    data = standings_by_week(cursor, snapshot_ts) if snapshot_ts is not None else {}
+    conn.close()
+    return data
 
 def store_ewc_rank_in_db(data):
-    with open("club_championship_standings_api.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    conn = get_connection()
+    cursor = conn.cursor()
+    store_standings_snapshot(cursor, data)
+    conn.commit()
+    conn.close()
 
 
@@ -1,6 +1,7 @@
 import json
 import hashlib
 from app.db import get_connection
+from app.spelling import apply_spelling_changes
 
 def compute_hash(data_dict):
     json_str = json.dumps(data_dict, sort_keys=True)
@@ -81,6 +82,7 @@ def save_teams_players(game: str, tournament: str, teams_data: list[dict]) -> bo
                 (game, tournament, team_name, placement, tournament_logo, years, players, hash_value)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (game, tournament, team_name, placement, tournament_logo, years, players_json, hash_value))
+        apply_spelling_changes(cursor)
         conn.commit()
         return True
     except Exception as e:
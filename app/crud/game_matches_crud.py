@@ -1,5 +1,6 @@
 import json
 from app.game_matches_init_db import get_connection
+from app.match_times import parse_day, local_day_range
 
 def get_tournament_by_link(conn, link):
     cursor = conn.cursor()
@@ -14,69 +15,182 @@ def insert_or_update_match_game(conn, match_id, game):
     ''', (match_id, game))
     conn.commit()
 
-def get_grouped_matches(conn, game=None, day=None, tournament=None, status=None, page=1, per_page=10):
-    offset = (page - 1) * per_page
-    query = '''
-        SELECT m.*, t.name as tournament_name, t.game as primary_game, t.link as tournament_link, t.icon as tournament_icon, mg.game
-        FROM matches m
-        JOIN tournaments t ON m.tournament_id = t.id
-        JOIN matches_games mg ON m.match_id = mg.match_id
-        WHERE 1=1
-    '''
+GAME_MATCH_COLUMNS = (
+    'status', 'team1', 'team1_url', 'logo1_light', 'logo1_dark', 'team2', 'team2_url', 'logo2_light',
+    'logo2_dark', 'timestamp', 'match_time', 'format', 'score', 'stream_links', 'details_link', 'group_name'
+)
+
+def _game_match_values(status, match):
+    return (status, match["team1"], match["team1_url"], match["logo1_light"], match["logo1_dark"],
+            match["team2"], match["team2_url"], match["logo2_light"], match["logo2_dark"], match["timestamp"],
+            match["match_time"], match["format"], match["score"], json.dumps(match["stream_link"]),
+            match["details_link"], match.get("group"))
+
+def save_scraped_game_matches(conn, game, match_data):
+    """
+    Write one scrape_matches(game) result in a single transaction.
+
+    Tournaments (by link), matches (by match_id) and their match-game links
+    are upserted with executemany; rows the scrape did not change are not
+    rewritten. Returns the inserted/updated/unchanged counts per table and
+    the number of match-game links added.
+    """
+    tournaments, matches = {}, {}
+    for status, scraped in match_data.items():
+        for name, tournament_data in scraped.items():
+            link = tournament_data["tournament_link"]
+            tournaments[link] = (game, name, tournament_data["tournament_icon"])
+            for match in tournament_data["matches"]:
+                match_id = match["match_id"]
+                if match_id:
+                    # A match keeps the tournament it was first seen under
+                    first_link = matches[match_id][0] if match_id in matches else link
+                    matches[match_id] = (first_link, _game_match_values(status, match))
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        links = json.dumps(list(tournaments))
+        cursor.execute("SELECT link, game, name, icon FROM tournaments "
+                       "WHERE link IN (SELECT value FROM json_each(?))", (links,))
+        stored_tournaments = {row["link"]: (row["game"], row["name"], row["icon"]) for row in cursor.fetchall()}
+        tournament_rows = [values + (link,) for link, values in tournaments.items()
+                           if stored_tournaments.get(link) != values]
+        cursor.executemany('''
+            INSERT INTO tournaments (game, name, icon, link)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                game = excluded.game,
+                name = excluded.name,
+                icon = excluded.icon,
+                updated_at = CURRENT_TIMESTAMP
+        ''', tournament_rows)
+        cursor.execute("SELECT link, id FROM tournaments WHERE link IN (SELECT value FROM json_each(?))", (links,))
+        tournament_ids = {row["link"]: row["id"] for row in cursor.fetchall()}
+
+        cursor.execute(f"SELECT match_id, {', '.join(GAME_MATCH_COLUMNS)} FROM game_matches "
+                       "WHERE match_id IN (SELECT value FROM json_each(?))", (json.dumps(list(matches)),))
+        stored_matches = {row["match_id"]: tuple(row)[1:] for row in cursor.fetchall()}
+        match_rows = [(tournament_ids[link], match_id) + values for match_id, (link, values) in matches.items()
+                      if stored_matches.get(match_id) != values]
+        # tournament_id is only written on insert
+        cursor.executemany(f'''
+            INSERT INTO game_matches (tournament_id, match_id, {', '.join(GAME_MATCH_COLUMNS)})
+            VALUES ({', '.join(['?'] * (len(GAME_MATCH_COLUMNS) + 2))})
+            ON CONFLICT(match_id) DO UPDATE SET
+                {', '.join(f'{column} = excluded.{column}' for column in GAME_MATCH_COLUMNS)},
+                updated_at = CURRENT_TIMESTAMP
+        ''', match_rows)
+
+        cursor.executemany("INSERT OR IGNORE INTO matches_games (match_id, game) VALUES (?, ?)",
+                           [(match_id, game) for match_id in matches])
+        match_games_added = max(cursor.rowcount, 0)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    tournaments_inserted = len(tournaments.keys() - stored_tournaments.keys())
+    matches_inserted = len(matches.keys() - stored_matches.keys())
+    return {
+        "tournaments": {
+            "inserted": tournaments_inserted,
+            "updated": len(tournament_rows) - tournaments_inserted,
+            "unchanged": len(tournaments) - len(tournament_rows)
+        },
+        "matches": {
+            "inserted": matches_inserted,
+            "updated": len(match_rows) - matches_inserted,
+            "unchanged": len(matches) - len(match_rows)
+        },
+        "match_games_added": match_games_added
+    }
+
+def grouped_matches_filters(game=None, day=None, tournament=None, status=None, timezone='UTC'):
+    """
+    WHERE clause and params for get_grouped_matches. Days are YYYY-MM-DD in
+    timezone and become timestamp ranges, so idx_game_matches_timestamp
+    still applies; a day in any other form matches nothing, as it did when
+    compared against DATE(m.timestamp, 'unixepoch').
+    """
+    where = []
     params = []
-    
+
     if game:
-        query += " AND mg.game IN ({})".format(','.join(['?'] * len(game)))
+        # With a day filter the timestamp range is the narrower index; the
+        # unary + keeps the planner from starting at matches_games instead
+        column = "+mg.game" if day else "mg.game"
+        where.append("{} IN ({})".format(column, ','.join(['?'] * len(game))))
         params.extend(game)
-    
+
     if day:
-        query += " AND DATE(m.timestamp, 'unixepoch') IN ({})".format(','.join(['?'] * len(day)))
-        params.extend(day)
-    
+        ranges = []
+        for value in day:
+            filter_date = parse_day(value)
+            if filter_date and filter_date.isoformat() == value:
+                ranges.append("(m.timestamp >= ? AND m.timestamp < ?)")
+                params.extend(local_day_range(filter_date, timezone))
+        where.append("({})".format(' OR '.join(ranges)) if ranges else "0")
+
     if tournament:
-        query += " AND t.name IN ({})".format(','.join(['?'] * len(tournament)))
+        where.append("t.name IN ({})".format(','.join(['?'] * len(tournament))))
         params.extend(tournament)
-    
+
     if status:
-        query += " AND m.status = ?"
+        where.append("m.status = ?")
         params.append(status)
-    
-    query += " ORDER BY m.timestamp ASC"
-    query += " LIMIT ? OFFSET ?"
-    params.extend([per_page, offset])
-    
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    matches = cursor.fetchall()
-    
-    count_query = '''
-        SELECT COUNT(*)
-        FROM matches m
+
+    return ' AND '.join(where) or '1=1', params
+
+
+def get_grouped_matches(conn, game=None, day=None, tournament=None, status=None, page=1, per_page=10,
+                        timezone='UTC'):
+    offset = (page - 1) * per_page
+    where_sql, params = grouped_matches_filters(game, day, tournament, status, timezone)
+    joins = '''
+        FROM game_matches m
         JOIN tournaments t ON m.tournament_id = t.id
         JOIN matches_games mg ON m.match_id = mg.match_id
-        WHERE 1=1
     '''
-    count_params = []
-    if game:
-        count_query += " AND mg.game IN ({})".format(','.join(['?'] * len(game)))
-        count_params.extend(game)
-    if day:
-        count_query += " AND DATE(m.timestamp, 'unixepoch') IN ({})".format(','.join(['?'] * len(day)))
-        count_params.extend(day)
-    if tournament:
-        count_query += " AND t.name IN ({})".format(','.join(['?'] * len(tournament)))
-        count_params.extend(tournament)
-    if status:
-        count_query += " AND m.status = ?"
-        count_params.append(status)
-    cursor.execute(count_query, count_params)
-    total = cursor.fetchone()[0]
+
+    # Game, day and tournament filters reach their rows through an index and
+    # the page has to sort all of them anyway, so the same pass counts them.
+    # Unfiltered (or status-only) pages stop early in timestamp order, where
+    # a window count would join and sort every match instead.
+    single_pass = bool(game or day or tournament)
+    total_column = ", COUNT(*) OVER () AS total_count" if single_pass else ""
+
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        WITH page AS (
+            SELECT m.id AS page_id, mg.game AS page_game{total_column}
+            {joins}
+            WHERE {where_sql}
+            ORDER BY m.timestamp ASC, m.id ASC, mg.game ASC
+            LIMIT ? OFFSET ?
+        )
+        SELECT m.*, t.name as tournament_name, t.game as primary_game, t.link as tournament_link,
+               t.icon as tournament_icon, page.*
+        FROM page
+        JOIN game_matches m ON m.id = page.page_id
+        JOIN tournaments t ON m.tournament_id = t.id
+        ORDER BY m.timestamp ASC, m.id ASC, page.page_game ASC
+    ''', params + [per_page, offset])
+    matches = cursor.fetchall()
+
+    if single_pass and matches:
+        total = matches[0]['total_count']
+    elif 0 < len(matches) < per_page or (not matches and offset == 0):
+        total = offset + len(matches)
+    else:
+        cursor.execute(f"SELECT COUNT(*) {joins} WHERE {where_sql}", params)
+        total = cursor.fetchone()[0]
     
     # Group matches by tournament and game
     tournaments = {}
     for match in matches:
         tournament_name = match['tournament_name']
-        game_name = match['game']
+        game_name = match['page_game']
         
         if tournament_name not in tournaments:
             tournaments[tournament_name] = {
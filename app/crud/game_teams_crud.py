@@ -3,6 +3,8 @@ import os
 import sqlite3
 import logging
 from app.db import get_connection
+from app.trigram_index import substring_filter
+from app.spelling import apply_spelling_changes
 from app.game_teams import JSON_FILE_PATH
 
 logger = logging.getLogger(__name__)
@@ -66,6 +68,7 @@ def parse_and_update_teams():
                     ))
                     total_records += 1
         
+        apply_spelling_changes(cursor)
         conn.commit()
         logger.info(f"Inserted {total_records} records for {len(teams_data)} teams into game_teams")
     except sqlite3.Error as e:
@@ -85,17 +88,19 @@ def get_teams(page=1, per_page=100, name_filter=None, game_filter=None, logo_mod
 
     try:
         # ====== Step 1: Get distinct team names for pagination ======
-        team_name_query = "SELECT DISTINCT team_name FROM game_teams"
+        team_name_query = "SELECT team_name FROM game_teams"
         count_query = "SELECT COUNT(DISTINCT team_name) FROM game_teams"
         params = []
         where_clauses = []
 
         if name_filter:
-            where_clauses.append("team_name LIKE ?")
-            params.append(f"%{name_filter}%")
+            condition, values = substring_filter('game_teams', ['team_name'], name_filter)
+            where_clauses.append(condition)
+            params.extend(values)
         if game_filter:
-            where_clauses.append("game_name LIKE ?")
-            params.append(f"%{game_filter}%")
+            condition, values = substring_filter('game_teams', ['game_name'], game_filter)
+            where_clauses.append(condition)
+            params.extend(values)
         if logo_mode_filter:
             where_clauses.append("logo_mode = ?")
             params.append(logo_mode_filter)
@@ -105,7 +110,8 @@ def get_teams(page=1, per_page=100, name_filter=None, game_filter=None, logo_mod
             team_name_query += where_sql
             count_query += where_sql
 
-        team_name_query += " LIMIT ? OFFSET ?"
+        # First-seen order, as a plain table scan gave it, whichever index the filter uses
+        team_name_query += " GROUP BY team_name ORDER BY MIN(id) LIMIT ? OFFSET ?"
         team_params = params + [per_page, offset]
 
         # Get total count
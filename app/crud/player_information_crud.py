@@ -1,5 +1,6 @@
 import json
 from app.db import get_connection
+from app.spelling import apply_spelling_changes
 def get_player_info(game: str, player_page_name: str) -> dict | None:
     """Retrieve player information from the database."""
     conn = get_connection()
@@ -34,6 +35,7 @@ def save_player_info(game: str, player_page_name: str, data: dict) -> bool:
             INSERT OR REPLACE INTO player_information (game, player_page_name, data)
             VALUES (?, ?, ?)
         ''', (game, player_page_name, json.dumps(data)))
+        apply_spelling_changes(cursor)
         conn.commit()
         return True
     except Exception as e:
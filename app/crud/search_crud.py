@@ -1,5 +1,6 @@
 import json
 from app.db import get_connection
+from app.trigram_index import substring_filter
 
 MAX_RESULTS_PER_TABLE = 1000
 
@@ -40,15 +41,14 @@ def search_table(search_type, query, page, per_page, filter_field=None, filter_v
             search_fields = SEARCH_FIELDS.get(search_type, [])
             if not search_fields:
                 return [], 0
-            where_clauses = [f"{field} LIKE ?" for field in search_fields]
-            sql = f"SELECT * FROM {table_name} WHERE " + " OR ".join(where_clauses)
-            params = [f"%{query}%"] * len(search_fields)
+            where_sql, params = substring_filter(table_name, search_fields, query)
+            sql = f"SELECT * FROM {table_name} WHERE " + where_sql
             if filter_field and filter_value and filter_field in FILTER_FIELDS.get(search_type, []):
                 sql += f" AND {filter_field} = ?"
                 params.append(filter_value)
             
             # Get total count
-            count_sql = f"SELECT COUNT(*) FROM {table_name} WHERE " + " OR ".join(where_clauses)
+            count_sql = f"SELECT COUNT(*) FROM {table_name} WHERE " + where_sql
             count_params = params.copy()
             if filter_field and filter_value and filter_field in FILTER_FIELDS.get(search_type, []):
                 count_sql += f" AND {filter_field} = ?"
@@ -1,5 +1,6 @@
 import json
 from app.db import get_connection
+from app.spelling import apply_spelling_changes
 
 def get_team_info(game: str, team_page_name: str) -> dict | None:
     """Retrieve team information from the database."""
@@ -36,6 +37,7 @@ def save_team_info(game: str, team_page_name: str, data: dict) -> bool:
             INSERT OR REPLACE INTO team_information (game, team_page_name, data)
             VALUES (?, ?, ?)
         ''', (game, team_page_name, json.dumps(data)))
+        apply_spelling_changes(cursor)
         conn.commit()
         return True
     except Exception as e:
@@ -0,0 +1,43 @@
+import logging
+from .db import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes bump a row in data_versions. In-process caches compare
+# these counters instead of re-reading or hashing the table itself.
+TRACKED_TABLES = (
+    'news', 'games', 'matches', 'prize_distribution', 'ewc_info', 'transfers',
+    'ewc_teams_players', 'player_information', 'team_information', 'game_teams'
+)
+
+
+def create_version_triggers(cursor, table):
+    """Track writes to table in data_versions"""
+    cursor.execute('INSERT OR IGNORE INTO data_versions (table_name) VALUES (?)', (table,))
+    for suffix, event in (('ai', 'INSERT'), ('ad', 'DELETE'), ('au', 'UPDATE')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+                UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}';
+            END
+        ''')
+
+
+def create_data_versions_schema(cursor):
+    """Create the data_versions table and its triggers for TRACKED_TABLES"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    for table in TRACKED_TABLES:
+        create_version_triggers(cursor, table)
+
+
+def get_data_versions():
+    """Return {table_name: version} for every tracked table"""
+    conn = get_connection()
+    try:
+        return dict(conn.execute('SELECT table_name, version FROM data_versions').fetchall())
+    finally:
+        conn.close()
@@ -5,6 +5,7 @@ from flask import request
 from .db import get_connection
 from .fts_search import fts_global_search, fts_search_news, fts_search_teams, fts_search_events, fts_search_games, fts_search_matches
 from .fuzzy_search import fuzzy_global_search, suggest_corrections
+from .search_index import search_entity_keyset, search_all_keyset
 from .optimized_pagination import OptimizedOffsetPagination, CursorPagination
 from .search_logger import log_search_query
 
@@ -40,6 +41,10 @@ class EnhancedSearch:
         start_time = time.time()
         
         try:
+            if use_cursor and search_mode in ('auto', 'fts'):
+                return self._keyset_search(query, search_type, per_page, search_mode,
+                                           fuzzy_threshold, cursor, start_time)
+
             if search_mode == 'auto':
                 # Auto mode: try FTS first, fall back to fuzzy if no results
                 results, total = self._auto_search(query, search_type, page, per_page, fuzzy_threshold)
@@ -88,7 +93,10 @@ class EnhancedSearch:
                     response['suggestions'] = suggestions
             
             return response
-            
+
+        except ValueError:
+            # A malformed cursor is the caller's mistake; the route answers 400
+            raise
         except Exception as e:
             logger.error(f"Enhanced search error: {str(e)}")
             return {
@@ -97,6 +105,53 @@ class EnhancedSearch:
                 'pagination': {'total': 0, 'page': page, 'per_page': per_page, 'total_pages': 0}
             }
     
+    def _keyset_search(self, query, search_type, per_page, search_mode, fuzzy_threshold, cursor, start_time):
+        """
+        Ranked FTS pages addressed by cursor instead of page number. The
+        total is a capped count, and only computed for the first page.
+        """
+        first_page = not cursor
+        if search_type:
+            page = search_entity_keyset(search_type, query, cursor, per_page, with_total=first_page)
+        else:
+            page = search_all_keyset(query, cursor, per_page, with_total=first_page)
+        results = page['data']
+
+        # Auto mode falls back to fuzzy matching the same way the offset path does
+        if search_mode == 'auto' and first_page and page['total'] < 3:
+            fuzzy_results, fuzzy_total = self._fuzzy_search(query, search_type, 1, per_page, fuzzy_threshold)
+            if fuzzy_total > page['total']:
+                results = fuzzy_results
+                page.update({'has_next': False, 'next_cursor': None,
+                             'total': fuzzy_total, 'total_capped': False})
+
+        execution_time = time.time() - start_time
+        if first_page:
+            self._log_search(query, search_type, execution_time, page['total'], 1, per_page)
+
+        response = {
+            'query': query,
+            'search_mode': search_mode,
+            'execution_time': round(execution_time, 3),
+            'pagination': {
+                'per_page': per_page,
+                'has_next': page['has_next'],
+                'next_cursor': page['next_cursor'],
+                'total': page['total'],
+                'total_capped': page['total_capped']
+            }
+        }
+        if search_type:
+            response[search_type] = results
+        else:
+            response.update(results)
+
+        if first_page and page['total'] < 3 and query:
+            suggestions = suggest_corrections(query)
+            if suggestions:
+                response['suggestions'] = suggestions
+        return response
+
     def _auto_search(self, query, search_type, page, per_page, fuzzy_threshold):
         """Auto search: FTS first, then fuzzy if needed"""
         # Try FTS first
@@ -1,9 +1,11 @@
 import sqlite3
-import requests
 import json
 import logging
 import hashlib
 from bs4 import BeautifulSoup
+from .db import get_connection
+from .liquipedia_client import get_client
+from .spelling import apply_spelling_changes
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,7 @@ def get_ewc_information(live=False, url="https://liquipedia.net/esports/Esports_
 
     if not live:
         try:
-            conn = sqlite3.connect('news.db')
+            conn = get_connection()
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM ewc_info WHERE url_hash = ? ORDER BY updated_at DESC LIMIT 1', (url_hash,))
             row = cursor.fetchone()
@@ -41,8 +43,7 @@ def get_ewc_information(live=False, url="https://liquipedia.net/esports/Esports_
             logger.error(f"DB error while fetching info: {str(e)}")
 
     try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers)
+        response = get_client().get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -77,7 +78,7 @@ def get_ewc_information(live=False, url="https://liquipedia.net/esports/Esports_
 
         # Save to DB
         try:
-            conn = sqlite3.connect('news.db')
+            conn = get_connection()
             cursor = conn.cursor()
             cursor.execute('DELETE FROM ewc_info WHERE url_hash = ?', (url_hash,))
             cursor.execute('''
@@ -92,6 +93,7 @@ def get_ewc_information(live=False, url="https://liquipedia.net/esports/Esports_
                 data.get('logo_light'), data.get('logo_dark'), data.get('location_logo'),
                 json.dumps(data.get('social_links')), url_hash
             ))
+            apply_spelling_changes(cursor)
             conn.commit()
         except sqlite3.Error as e:
             logger.error(f"DB error while storing info: {str(e)}")
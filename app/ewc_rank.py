@@ -1,12 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+from app.html_parsing import make_soup
 import hashlib
-import os
+from app.db import get_connection
+from app.page_revisions import fetch_page_html
+from app.ewc_standings import get_team_history, latest_snapshot_ts, standings_page, store_standings_snapshot
 
-API_URL = 'https://liquipedia.net/esports/api.php'
+STANDINGS_PAGE = 'Esports_World_Cup/2025/Club_Championship_Standings'
 BASE_URL = 'https://liquipedia.net'
-OUTPUT_FILE = "club_championship_standings_api.json"
 
 TOGGLE_AREAS = {
     "Week 1": "4",
@@ -18,25 +17,13 @@ TOGGLE_AREAS = {
     "Week 7": "25"
 }
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-}
-
 
 def get_html_from_api():
-    params = {
-        'action': 'parse',
-        'page': 'Esports_World_Cup/2025/Club_Championship_Standings',
-        'format': 'json',
-        'prop': 'text'
-    }
-    response = requests.get(API_URL, headers=HEADERS, params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if 'parse' in data and 'text' in data['parse'] and '*' in data['parse']['text']:
-            return data['parse']['text']['*']
-    print("Failed to get HTML from API")
-    return None
+    try:
+        return fetch_page_html('esports', STANDINGS_PAGE)
+    except Exception as e:
+        print(f"Failed to get HTML from API: {e}")
+        return None
 
 
 def find_main_table(soup):
@@ -55,7 +42,7 @@ def calculate_hash(week_name, team_name, points):
 
 
 def extract_standings_from_html(html):
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = make_soup(html, 'standings')
     table = find_main_table(soup)
     if not table:
         print("Could not find main table.")
@@ -130,7 +117,8 @@ def get_ewc_rank_data(live=False, week=None, team=None, page=1, per_page=10):
     Get EWC rank data with pagination and filtering support
     
     Args:
-        live (bool): If True, fetch from API; if False, use cached data
+        live (bool): If True, fetch from API and store it as a new snapshot;
+            if False, use the latest stored snapshot
         week (str): Filter by specific week (e.g., "Week 1")
         team (str): Filter by team name (partial match)
         page (int): Page number for pagination (1-based)
@@ -139,100 +127,38 @@ def get_ewc_rank_data(live=False, week=None, team=None, page=1, per_page=10):
     Returns:
         dict: Paginated and filtered data with metadata
     """
-    if live:
-        html = get_html_from_api()
-        if html:
-            new_data = extract_standings_from_html(html)
-            if new_data:
-                # Update the JSON file with new data
-                with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-                    json.dump(new_data, f, ensure_ascii=False, indent=2)
-                print("Live data fetched and saved.")
-                raw_data = new_data
-            else:
-                print("Failed to extract live data.")
-                raw_data = {}
-        else:
-            print("Failed to get HTML from API for live data.")
-            raw_data = {}
-    else:
-        if os.path.exists(OUTPUT_FILE):
-            with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-            print("Data loaded from file.")
-        else:
-            print("No cached data found. Fetching live data.")
-            return get_ewc_rank_data(live=True, week=week, team=team, page=page, per_page=per_page)
-    
-    # Apply filters and pagination
-    return apply_filters_and_pagination(raw_data, week, team, page, per_page)
-
-
-def apply_filters_and_pagination(data, week_filter=None, team_filter=None, page=1, per_page=10):
-    """
-    Apply filters and pagination to the rank data
-    
-    Args:
-        data (dict): Raw data organized by weeks
-        week_filter (str): Filter by specific week
-        team_filter (str): Filter by team name (case-insensitive partial match)
-        page (int): Page number (1-based)
-        per_page (int): Items per page
-    
-    Returns:
-        dict: Filtered and paginated data with metadata
-    """
-    # Flatten data for filtering and pagination
-    all_teams = []
-    
-    for week_name, teams in data.items():
-        if week_filter and week_filter.lower() != week_name.lower():
-            continue
-            
-        for team in teams:
-            # Add week information to each team record
-            team_with_week = team.copy()
-            team_with_week['Week'] = week_name
-            
-            # Apply team filter if specified
-            if team_filter:
-                if team_filter.lower() not in team['Team'].lower():
-                    continue
-            
-            all_teams.append(team_with_week)
-    
-    # Sort by ranking within each week, then by week
-    def sort_key(team):
-        week_num = int(team['Week'].split()[-1]) if team['Week'].split()[-1].isdigit() else 999
-        ranking = team['Ranking'].replace('.', '')
-        try:
-            ranking_num = int(ranking) if ranking.isdigit() else 999
-        except:
-            ranking_num = 999
-        return (week_num, ranking_num)
-    
-    all_teams.sort(key=sort_key)
-    
-    # Calculate pagination
-    total_items = len(all_teams)
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        if not live and latest_snapshot_ts(cursor) is None:
+            print("No stored standings found. Fetching live data.")
+            live = True
+        if live:
+            html = get_html_from_api()
+            new_data = extract_standings_from_html(html) if html else {}
+            if not new_data:
+                print("Failed to get live data.")
+                return build_rank_response([], 0, page, per_page, week, team)
+            # Readers keep seeing the previous snapshot until this commits
+            cursor.execute("BEGIN IMMEDIATE")
+            store_standings_snapshot(cursor, new_data)
+            conn.commit()
+            print("Live data fetched and saved.")
+
+        teams, total_items, page = standings_page(cursor, latest_snapshot_ts(cursor), week, team, page, per_page)
+        return build_rank_response(teams, total_items, page, per_page, week, team)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def build_rank_response(teams, total_items, page, per_page, week_filter=None, team_filter=None):
+    """The paginated response around one page of standings"""
     total_pages = (total_items + per_page - 1) // per_page  # Ceiling division
-    
-    # Validate page number
-    if page < 1:
-        page = 1
-    elif page > total_pages and total_pages > 0:
-        page = total_pages
-    
-    # Calculate start and end indices
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    
-    # Get paginated data
-    paginated_teams = all_teams[start_idx:end_idx]
-    
-    # Prepare response
-    result = {
-        "data": paginated_teams,
+    return {
+        "data": teams,
         "pagination": {
             "current_page": page,
             "per_page": per_page,
@@ -248,8 +174,15 @@ def apply_filters_and_pagination(data, week_filter=None, team_filter=None, page=
             "team": team_filter
         }
     }
-    
-    return result
+
+
+def get_ewc_rank_history(team):
+    """A team's standings history from ewc_standings_history, or None for an unknown team"""
+    conn = get_connection()
+    try:
+        return get_team_history(conn.cursor(), team)
+    finally:
+        conn.close()
 
 
 def get_available_weeks():
@@ -268,7 +201,7 @@ def get_teams_summary(data):
 
 if __name__ == "__main__":
     # This part will be executed when the script is run directly
-    # It will fetch data and save it to the JSON file
+    # It will fetch data and store it as a new ewc_standings snapshot
     get_ewc_rank_data(live=True)
 
 
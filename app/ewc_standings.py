@@ -0,0 +1,319 @@
+import os
+import json
+import time
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Where get_ewc_rank_data kept the standings before ewc_standings existed
+LEGACY_JSON_FILE = "club_championship_standings_api.json"
+
+# Rankings that are not a number sort last within their week, as they did
+UNRANKED = 999
+
+STANDINGS_COLUMNS = (
+    'week', 'position', 'team', 'team_key', 'ranking', 'ranking_label', 'points', 'points_label',
+    'total_rank', 'trend', 'logo_light', 'logo_dark'
+)
+
+
+def create_ewc_standings_schema(cursor):
+    """
+    ewc_standings keeps every distinct scrape of the club championship
+    standings, one row per (snapshot_ts, week, position). The page shows
+    the latest snapshot; older ones are the ranking history.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ewc_standings_snapshots (
+            snapshot_ts INTEGER PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ewc_standings (
+            snapshot_ts INTEGER NOT NULL REFERENCES ewc_standings_snapshots(snapshot_ts),
+            week INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            team TEXT NOT NULL,
+            team_key TEXT NOT NULL,
+            ranking INTEGER NOT NULL,
+            ranking_label TEXT,
+            points INTEGER,
+            points_label TEXT,
+            total_rank TEXT,
+            trend TEXT,
+            logo_light TEXT,
+            logo_dark TEXT,
+            PRIMARY KEY (snapshot_ts, week, position)
+        ) WITHOUT ROWID
+    ''')
+    # Page order within a snapshot, and one team's rows across snapshots
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_ewc_standings_week_ranking
+        ON ewc_standings(snapshot_ts, week, ranking, position)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ewc_standings_team ON ewc_standings(team, snapshot_ts, week)')
+
+
+def import_legacy_standings(cursor, directory):
+    """Import the standings JSON get_ewc_rank_data kept in directory as the first snapshot"""
+    path = os.path.join(directory, LEGACY_JSON_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _insert_snapshot(cursor, data, int(os.path.getmtime(path)))
+        logger.info(f"Imported {path} into ewc_standings")
+
+
+def week_number(week_name):
+    """'Week 3' -> 3, None for anything else"""
+    parts = week_name.split() if isinstance(week_name, str) else []
+    if len(parts) == 2 and parts[0].lower() == 'week' and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+
+def _parse_int(value, default=None):
+    digits = (value or '').replace('.', '').replace(',', '')
+    return int(digits) if digits.isdigit() else default
+
+
+def standings_rows(data):
+    """Table rows for a {week name: [team dict, ...]} scrape"""
+    rows = []
+    for week_name, teams in data.items():
+        week = week_number(week_name)
+        if week is None:
+            continue
+        for position, team in enumerate(teams):
+            rows.append((week, position, team["Team"], team["Team"].lower(),
+                         _parse_int(team["Ranking"], UNRANKED), team["Ranking"],
+                         _parse_int(team["Points"]), team["Points"], team["Total Rank"], team["Trend"],
+                         team["Logo_Light"], team["Logo_Dark"]))
+    return rows
+
+
+def latest_snapshot_ts(cursor):
+    cursor.execute("SELECT MAX(snapshot_ts) FROM ewc_standings_snapshots")
+    return cursor.fetchone()[0]
+
+
+def _insert_snapshot(cursor, data, snapshot_ts=None):
+    """Insert a scrape unless it matches the latest snapshot; (snapshot_ts, rows) or None"""
+    rows = standings_rows(data)
+    if not rows:
+        return None
+    content_hash = hashlib.md5(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+    cursor.execute("SELECT snapshot_ts, content_hash FROM ewc_standings_snapshots "
+                   "ORDER BY snapshot_ts DESC LIMIT 1")
+    latest = cursor.fetchone()
+    if latest and latest[1] == content_hash:
+        return None
+
+    snapshot_ts = int(time.time()) if snapshot_ts is None else snapshot_ts
+    if latest and snapshot_ts <= latest[0]:
+        snapshot_ts = latest[0] + 1
+    cursor.execute("INSERT INTO ewc_standings_snapshots (snapshot_ts, content_hash, row_count) VALUES (?, ?, ?)",
+                   (snapshot_ts, content_hash, len(rows)))
+    cursor.executemany(
+        f"INSERT INTO ewc_standings (snapshot_ts, {', '.join(STANDINGS_COLUMNS)}) "
+        f"VALUES ({', '.join(['?'] * (len(STANDINGS_COLUMNS) + 1))})",
+        [(snapshot_ts,) + row for row in rows])
+    return snapshot_ts, rows
+
+
+def store_standings_snapshot(cursor, data, snapshot_ts=None):
+    """
+    Store a scrape as a new snapshot unless it matches the latest one, and
+    fold it into ewc_standings_history. Runs in the caller's transaction.
+    Returns the new snapshot_ts, or None when nothing changed.
+    """
+    inserted = _insert_snapshot(cursor, data, snapshot_ts)
+    if inserted is None:
+        return None
+    update_standings_history(cursor, *inserted)
+    return inserted[0]
+
+
+def create_standings_history_schema(cursor):
+    """
+    ewc_standings_history has one row per team with its latest snapshot as
+    per-week JSON arrays: points, rankings, the change from the previous
+    week and the change since the previous snapshot. Filled in at ingest,
+    so reading a team never touches the snapshots themselves.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ewc_standings_history (
+            team TEXT PRIMARY KEY,
+            team_key TEXT NOT NULL,
+            snapshot_ts INTEGER NOT NULL,
+            previous_snapshot_ts INTEGER,
+            snapshots INTEGER NOT NULL,
+            weeks TEXT NOT NULL,
+            points TEXT NOT NULL,
+            rankings TEXT NOT NULL,
+            week_points_delta TEXT NOT NULL,
+            week_rank_delta TEXT NOT NULL,
+            scrape_points_delta TEXT NOT NULL,
+            scrape_rank_delta TEXT NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ewc_standings_history_team_key ON ewc_standings_history(team_key)')
+
+    # Replay the snapshots stored so far
+    cursor.execute("DELETE FROM ewc_standings_history")
+    cursor.execute("SELECT snapshot_ts FROM ewc_standings_snapshots ORDER BY snapshot_ts")
+    for snapshot_ts in [row[0] for row in cursor.fetchall()]:
+        cursor.execute(f"SELECT {', '.join(STANDINGS_COLUMNS)} FROM ewc_standings WHERE snapshot_ts = ? "
+                       "ORDER BY week, position", (snapshot_ts,))
+        update_standings_history(cursor, snapshot_ts, [tuple(row) for row in cursor.fetchall()])
+
+
+def _delta(current, previous):
+    return current - previous if current is not None and previous is not None else None
+
+
+def update_standings_history(cursor, snapshot_ts, rows):
+    """
+    Rebuild the history rows of the teams in a new snapshot from its rows
+    and their previous history row. Rank deltas are positive when a team
+    moved up.
+    """
+    by_team = {}
+    for row in rows:
+        record = dict(zip(STANDINGS_COLUMNS, row))
+        weeks = by_team.setdefault(record['team'], {'team_key': record['team_key'], 'weeks': {}})['weeks']
+        # A team listed twice in a week keeps its first row
+        weeks.setdefault(record['week'], (record['points'],
+                                          None if record['ranking'] == UNRANKED else record['ranking']))
+
+    cursor.execute("SELECT team, snapshot_ts, snapshots, weeks, points, rankings FROM ewc_standings_history "
+                   "WHERE team IN (SELECT value FROM json_each(?))", (json.dumps(list(by_team)),))
+    previous = {row['team']: row for row in cursor.fetchall()}
+
+    history_rows = []
+    for team, entry in by_team.items():
+        week_numbers = sorted(entry['weeks'])
+        points = [entry['weeks'][week][0] for week in week_numbers]
+        rankings = [entry['weeks'][week][1] for week in week_numbers]
+        week_points_delta = [None] + [_delta(points[i], points[i - 1]) for i in range(1, len(points))]
+        week_rank_delta = [None] + [_delta(rankings[i - 1], rankings[i]) for i in range(1, len(rankings))]
+
+        before = previous.get(team)
+        if before:
+            before_weeks = dict(zip(json.loads(before['weeks']),
+                                    zip(json.loads(before['points']), json.loads(before['rankings']))))
+        else:
+            before_weeks = {}
+        scrape_points_delta, scrape_rank_delta = [], []
+        for week, week_points, week_ranking in zip(week_numbers, points, rankings):
+            before_points, before_ranking = before_weeks.get(week, (None, None))
+            scrape_points_delta.append(_delta(week_points, before_points))
+            scrape_rank_delta.append(_delta(before_ranking, week_ranking))
+
+        history_rows.append((
+            team, entry['team_key'], snapshot_ts, before['snapshot_ts'] if before else None,
+            before['snapshots'] + 1 if before else 1,
+            *(json.dumps(values) for values in (week_numbers, points, rankings, week_points_delta,
+                                                 week_rank_delta, scrape_points_delta, scrape_rank_delta))))
+    cursor.executemany('''
+        INSERT OR REPLACE INTO ewc_standings_history (
+            team, team_key, snapshot_ts, previous_snapshot_ts, snapshots, weeks, points, rankings,
+            week_points_delta, week_rank_delta, scrape_points_delta, scrape_rank_delta
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', history_rows)
+
+
+def get_team_history(cursor, team):
+    """
+    A team's per-week points and rankings in the latest snapshot it is in,
+    with their changes from the previous week and the previous snapshot.
+    Matches the team name exactly, then case-insensitively. None if unknown.
+    """
+    cursor.execute("SELECT * FROM ewc_standings_history WHERE team = ?", (team,))
+    row = cursor.fetchone()
+    if row is None:
+        cursor.execute("SELECT * FROM ewc_standings_history WHERE team_key = ? ORDER BY team LIMIT 1",
+                       (team.lower(),))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+
+    columns = ('points', 'rankings', 'week_points_delta', 'week_rank_delta', 'scrape_points_delta',
+               'scrape_rank_delta')
+    arrays = [json.loads(row[column]) for column in columns]
+    return {
+        "team": row["team"],
+        "snapshot_ts": row["snapshot_ts"],
+        "previous_snapshot_ts": row["previous_snapshot_ts"],
+        "snapshots": row["snapshots"],
+        "weeks": [
+            {
+                "week": f"Week {week}",
+                "points": points,
+                "ranking": ranking,
+                "points_change": week_points,
+                "rank_change": week_rank,
+                "points_change_since_last_scrape": scrape_points,
+                "rank_change_since_last_scrape": scrape_rank,
+            }
+            for week, (points, ranking, week_points, week_rank, scrape_points, scrape_rank)
+            in zip(json.loads(row["weeks"]), zip(*arrays))
+        ],
+    }
+
+
+def standings_by_week(cursor, snapshot_ts):
+    """A snapshot in the {week name: [team dict, ...]} shape it was scraped in"""
+    cursor.execute("SELECT * FROM ewc_standings WHERE snapshot_ts = ? ORDER BY week, position", (snapshot_ts,))
+    data = {}
+    for row in cursor.fetchall():
+        data.setdefault(f"Week {row['week']}", []).append(_team_record(row))
+    return data
+
+
+def _team_record(row):
+    week_name = f"Week {row['week']}"
+    raw_id = f"{week_name}-{row['team']}-{row['points_label']}"
+    return {
+        "id": hashlib.md5(raw_id.encode('utf-8')).hexdigest(),
+        "Ranking": row["ranking_label"],
+        "Trend": row["trend"],
+        "Team": row["team"],
+        "Logo_Light": row["logo_light"],
+        "Logo_Dark": row["logo_dark"],
+        "Points": row["points_label"],
+        "Total Rank": row["total_rank"],
+    }
+
+
+def standings_page(cursor, snapshot_ts, week_filter=None, team_filter=None, page=1, per_page=10):
+    """
+    One page of a snapshot ordered by week then ranking, filtered by week
+    name (case-insensitive) and team substring (case-insensitive).
+    Returns (rows as team dicts with their Week, total rows, page), the
+    page clamped to the last one like the response always did.
+    """
+    where, params = ["snapshot_ts = ?"], [snapshot_ts]
+    if week_filter:
+        where.append("week = ?")
+        params.append(week_number(week_filter))
+    if team_filter:
+        where.append("instr(team_key, ?) > 0")
+        params.append(team_filter.lower())
+    where_sql = " AND ".join(where)
+
+    cursor.execute(f"SELECT COUNT(*) FROM ewc_standings WHERE {where_sql}", params)
+    total_items = cursor.fetchone()[0]
+    total_pages = (total_items + per_page - 1) // per_page
+    if page < 1:
+        page = 1
+    elif page > total_pages and total_pages > 0:
+        page = total_pages
+
+    cursor.execute(f"SELECT * FROM ewc_standings WHERE {where_sql} ORDER BY week, ranking, position "
+                   "LIMIT ? OFFSET ?", params + [per_page, (page - 1) * per_page])
+    teams = [dict(_team_record(row), Week=f"Week {row['week']}") for row in cursor.fetchall()]
+    return teams, total_items, page
@@ -1,37 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
+from app.html_parsing import make_soup
 import json
-import random
-
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/125.0.0.0 Safari/537.36'
-]
-
-HEADERS = {
-    'User-Agent': random.choice(USER_AGENTS),
-    'Accept-Language': 'en-US,en;q=0.9',
-    'Referer': 'https://www.google.com/'
-}
+from app.page_revisions import fetch_page_html
 
 BASE_URL = 'https://liquipedia.net'
-API_URL_TEMPLATE = 'https://liquipedia.net/{game}/api.php'
 
 def fetch_html_via_api(game, page_title):
-    api_url = API_URL_TEMPLATE.format(game=game)
-    params = {
-        'action': 'parse',
-        'page': page_title,
-        'format': 'json',
-        'prop': 'text'
-    }
     try:
-        res = requests.get(api_url, headers=HEADERS, params=params)
-        res.raise_for_status()
-        data = res.json()
-        html = data['parse']['text']['*']
-        return BeautifulSoup(html, 'html.parser')
+        return make_soup(fetch_page_html(game, page_title))
     except Exception as e:
         print(f"Error fetching API HTML for {page_title}: {e}")
         return None
@@ -0,0 +1,117 @@
+import sqlite3
+import logging
+import threading
+import numpy
+from rapidfuzz import fuzz, process
+from .db import get_connection
+from .data_versions import get_data_versions
+
+logger = logging.getLogger(__name__)
+
+# search type -> (table, fields joined into the fuzzy-matched text)
+FUZZY_FIELDS = {
+    'news': ('news', ('title', 'description', 'writer')),
+    'teams': ('game_teams', ('team_name',)),
+    'games': ('games', ('game_name', 'genre', 'platform', 'description')),
+    'matches': ('matches', ('game', 'tournament', 'match_group', 'team1', 'team2')),
+    'prize_distribution': ('prize_distribution', ('place', 'prize', 'participants')),
+    'ewc_info': ('ewc_info', ('header', 'series', 'organizers', 'location', 'prize_pool', 'liquipedia_tier')),
+    'transfers': ('transfers', ('game', 'player_name', 'old_team_name', 'new_team_name')),
+    'ewc_teams_players': ('ewc_teams_players', ('game', 'team_name', 'placement', 'tournament', 'players')),
+    'player_information': ('player_information', ('game', 'player_page_name', 'data')),
+    'team_information': ('team_information', ('game', 'team_page_name', 'data')),
+}
+
+# search type -> (data version, ids, lowercased texts), shared by every
+# request in the process and rebuilt when the table's data_versions row moves
+_indexes = {}
+_lock = threading.Lock()
+
+
+def _load(search_type):
+    table, fields = FUZZY_FIELDS[search_type]
+    text = " || ' ' || ".join(f"COALESCE({field}, '')" for field in fields)
+    conn = get_connection()
+    try:
+        rows = conn.execute(f'SELECT id, {text} FROM {table} ORDER BY id').fetchall()
+    finally:
+        conn.close()
+    ids = numpy.fromiter((row[0] for row in rows), dtype=numpy.int64, count=len(rows))
+    return ids, [row[1].lower() for row in rows]
+
+
+def get_index(search_type, versions=None):
+    """Return (ids, texts) for a search type, rebuilding it if its table changed"""
+    table = FUZZY_FIELDS[search_type][0]
+    version = (versions if versions is not None else get_data_versions()).get(table)
+    if version is None:
+        # Untracked table: nothing tells us when it changes, so never cache it
+        return _load(search_type)
+
+    cached = _indexes.get(search_type)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    with _lock:
+        cached = _indexes.get(search_type)
+        if not cached or cached[0] != version:
+            ids, texts = _load(search_type)
+            cached = _indexes[search_type] = (version, ids, texts)
+            logger.debug(f"Built fuzzy index for {search_type}: {len(texts)} rows at version {version}")
+    return cached[1], cached[2]
+
+
+def clear_indexes():
+    """Drop every cached index"""
+    with _lock:
+        _indexes.clear()
+
+
+def fuzzy_search(search_type, query, threshold=70, page=1, per_page=10, versions=None):
+    """
+    Score query against every row of a search type with partial_ratio and
+    return the page of rows scoring at least threshold, best first.
+    """
+    if search_type not in FUZZY_FIELDS:
+        return [], 0
+
+    try:
+        ids, texts = get_index(search_type, versions)
+        if not texts:
+            return [], 0
+
+        # Rows are passed as the queries so cdist spreads them over all cores;
+        # partial_ratio is symmetric, so the scores are the same either way
+        scores = process.cdist(texts, [query.lower()], scorer=fuzz.partial_ratio,
+                               score_cutoff=threshold, dtype=numpy.uint8, workers=-1)[:, 0]
+        matched = numpy.flatnonzero(scores >= threshold)
+        # Best score first, ties in id order like the old per-row loop
+        matched = matched[numpy.argsort(-scores[matched].astype(numpy.int16), kind='stable')]
+
+        total = len(matched)
+        start = (page - 1) * per_page
+        page_rows = matched[start:start + per_page]
+        if not len(page_rows):
+            return [], total
+
+        page_ids = [int(row_id) for row_id in ids[page_rows]]
+        table = FUZZY_FIELDS[search_type][0]
+        conn = get_connection()
+        try:
+            cursor = conn.execute(
+                f"SELECT * FROM {table} WHERE id IN ({', '.join('?' * len(page_ids))})", page_ids
+            )
+            records = {row['id']: dict(row) for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        results = []
+        for row_id, score in zip(page_ids, scores[page_rows]):
+            if row_id in records:
+                records[row_id]['fuzzy_score'] = int(score)
+                results.append(records[row_id])
+        return results, total
+
+    except sqlite3.Error as e:
+        logger.error(f"Fuzzy search error in {search_type}: {str(e)}")
+        return [], 0
@@ -2,6 +2,7 @@ import sqlite3
 import logging
 from fuzzywuzzy import fuzz, process
 from .db import get_connection
+from .spelling import suggest
 
 logger = logging.getLogger(__name__)
 
@@ -318,20 +319,5 @@ def fuzzy_global_search(query, threshold=70, page=1, per_page=10):
 
 def suggest_corrections(query, threshold=60):
     """Suggest spelling corrections for a query"""
-    suggestions = set()
-    
-    # Get terms from different tables
-    tables_fields = [
-        ('news', 'title'),
-        ('teams', 'team_name'),
-        ('events', 'name'),
-        ('games', 'game_name')
-    ]
-    
-    for table, field in tables_fields:
-        terms = get_searchable_terms(table, field)
-        matches = fuzzy_match_terms(query, terms, threshold, limit=3)
-        suggestions.update(matches)
-    
-    return list(suggestions)[:5]  # Return top 5 suggestions
+    return suggest(query, threshold, limit=5)
 
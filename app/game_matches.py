@@ -1,28 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import random
+from app.html_parsing import make_soup
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from app.page_revisions import MATCHES_MAX_AGE, fetch_if_changed, fetch_page_html
 
 BASE_URL = "https://liquipedia.net"
-
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.1 Safari/605.1.15',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; rv:125.0) Gecko/20100101 Firefox/125.0'
-]
-
-session = requests.Session()
-session.headers.update({
-    'User-Agent': random.choice(USER_AGENTS),
-    'Referer': 'https://www.google.com/',
-    'Accept-Language': 'en-US,en;q=0.9',
-    'DNT': '1',
-    'Cache-Control': 'no-cache',
-    'Pragma': 'no-cache',
-    'X-Requested-With': 'XMLHttpRequest'
-})
+MATCHES_PAGE = "Liquipedia:Matches"
 
 def convert_timestamp_to_eest(timestamp: int) -> str:
     dt_utc = datetime.utcfromtimestamp(timestamp).replace(tzinfo=ZoneInfo("UTC"))
@@ -43,20 +25,15 @@ def extract_team_logos(team_side_element):
     return logo_light, logo_dark
 
 def scrape_matches(game: str):
-    API_URL = f"{BASE_URL}/{game}/api.php"
-    PAGE = "Liquipedia:Matches"
-
-    params = {
-        'action': 'parse',
-        'page': PAGE,
-        'format': 'json',
-        'prop': 'text'
-    }
+    return parse_game_matches_html(game, fetch_page_html(game, MATCHES_PAGE))
+
+def scrape_matches_if_changed(game: str):
+    """(matches, revision) like scrape_matches, or (None, revision) while Liquipedia:Matches is unchanged"""
+    return fetch_if_changed('game_matches', game, MATCHES_PAGE, lambda html: parse_game_matches_html(game, html),
+                            max_age=MATCHES_MAX_AGE)
 
-    response = session.get(API_URL, params=params, timeout=10)
-    response.raise_for_status()
-    html_content = response.json()['parse']['text']['*']
-    soup = BeautifulSoup(html_content, "html.parser")
+def parse_game_matches_html(game, html_content):
+    soup = make_soup(html_content, 'matches')
 
     data = {
         "Upcoming": {},
@@ -1,10 +1,7 @@
 from app.db import get_connection
 
-def init_game_teams_db():
+def create_game_teams_schema(cursor):
     """Create the game_teams table and FTS5 table with triggers."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     # Create game_teams table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS game_teams (
@@ -51,6 +48,12 @@ def init_game_teams_db():
             VALUES (new.id, new.team_name, new.game_name, new.logo_mode);
         END
     ''')
-    
+
+
+def init_game_teams_db():
+    """Create the game_teams table and FTS5 table with triggers."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    create_game_teams_schema(cursor)
     conn.commit()
     conn.close()
\ No newline at end of file
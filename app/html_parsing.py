@@ -0,0 +1,71 @@
+import os
+import logging
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+# lxml builds the same trees as html.parser for Liquipedia's markup several
+# times faster. It is optional: without it every page goes to html.parser.
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+BACKENDS = ("lxml", "html.parser")
+HTML_PARSER = os.environ.get("LIQUIPEDIA_HTML_PARSER", "lxml" if HAVE_LXML else "html.parser").lower()
+# 0 builds the whole page even where an extractor reads only part of it
+STRAIN = os.environ.get("LIQUIPEDIA_HTML_STRAIN", "1") != "0"
+
+
+def _has_class(name):
+    # While parsing, a strainer sees class as the raw attribute string, so
+    # class_='x' would miss class="a x b"
+    def match(value):
+        if value is None:
+            return False
+        return name in (value.split() if isinstance(value, str) else value)
+    return match
+
+
+# The subtrees an extractor reads; everything else on the page is skipped
+# while parsing. Extractors that look around the whole document (infoboxes,
+# team cards followed by their roster tables) are not strained.
+STRAINERS = {
+    # Upcoming and completed sections of Liquipedia:Matches, both layouts
+    'matches': SoupStrainer('div', attrs={'data-toggle-area-content': True}),
+    'transfers': SoupStrainer('div', class_=_has_class('mainpage-transfer')),
+    'standings': SoupStrainer('table', class_=_has_class('wikitable')),
+    'tables': SoupStrainer('table'),
+    'brackets': SoupStrainer('div', class_=_has_class('template-box')),
+}
+
+_warned = False
+
+
+def _backend():
+    global _warned
+    if HTML_PARSER not in BACKENDS:
+        raise ValueError(f"LIQUIPEDIA_HTML_PARSER must be one of {', '.join(BACKENDS)}, not {HTML_PARSER!r}")
+    if HTML_PARSER == "lxml" and not HAVE_LXML:
+        if not _warned:
+            logger.warning("lxml is not installed, parsing Liquipedia pages with html.parser")
+            _warned = True
+        return "html.parser"
+    return HTML_PARSER
+
+
+def make_soup(html, only=None):
+    """
+    BeautifulSoup of html with the configured backend. only names the
+    STRAINERS entry to keep, so just the subtrees the extractor reads are built.
+    """
+    parse_only = STRAINERS[only] if only and STRAIN else None
+    return BeautifulSoup(html, _backend(), parse_only=parse_only)
+
+
+def set_html_parser(parser, strain=True):
+    """Parse with parser ('lxml' or 'html.parser') and strain or not from now on"""
+    global HTML_PARSER, STRAIN
+    HTML_PARSER, STRAIN = parser, strain
@@ -1,47 +1,13 @@
-import json
-import requests
-from bs4 import BeautifulSoup
-import hashlib
-import os
+from app.html_parsing import make_soup
+from app.page_revisions import fetch_if_changed
 
 BASE_URL = 'https://liquipedia.net'
+WIKI = 'esports'
 GAME_PAGE = 'Esports_World_Cup/2025'
-API_URL = f'{BASE_URL}/esports/api.php'
-HASH_FILE = 'ewc_2025_games_hash.txt'
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-}
-
-def calculate_hash(text):
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
-
-def fetch_ewc_games_from_web():
-    params = {
-        'action': 'parse',
-        'page': GAME_PAGE,
-        'format': 'json',
-        'prop': 'text'
-    }
-
-    try:
-        response = requests.get(API_URL, headers=HEADERS, params=params)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"API request failed: {e}")
-        return []
-
-    html = response.json().get('parse', {}).get('text', {}).get('*', '')
-    current_hash = calculate_hash(html)
-
-    # check if content changed
-    if os.path.exists(HASH_FILE):
-        with open(HASH_FILE, 'r', encoding='utf-8') as f:
-            if f.read().strip() == current_hash:
-                print("No changes detected.")
-                return []
-
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_ewc_games_html(html):
+    """[{game_name, logo_url}] from the List of Tournaments table"""
+    soup = make_soup(html, 'tables')
     games_data = []
 
     target_table = next(
@@ -63,8 +29,25 @@ def fetch_ewc_games_from_web():
             logo_url = BASE_URL + logo['src'] if logo else None
             games_data.append({"game_name": game_name, "logo_url": logo_url})
 
-    # Save the new hash
-    with open(HASH_FILE, 'w', encoding='utf-8') as f:
-        f.write(current_hash)
+    return games_data
+
+def fetch_ewc_games_from_web():
+    """
+    The EWC games when the page changed since the last fetch, otherwise [].
+    An unchanged revision costs one prop=info query and no action=parse.
+    """
+    try:
+        games_data, revision = fetch_if_changed('games', WIKI, GAME_PAGE, parse_ewc_games_html)
+    except Exception as e:
+        print(f"API request failed: {e}")
+        return []
+
+    if games_data is None:
+        print("No changes detected.")
+        return []
+
+    # An empty parse is retried next time rather than recorded
+    if games_data:
+        revision.record()
 
     return games_data
@@ -0,0 +1,281 @@
+import os
+import time
+import asyncio
+import random
+import logging
+import threading
+from collections import deque, defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://liquipedia.net"
+
+# Liquipedia's API terms: identify the client, accept gzip, at most one
+# request every 2 seconds and one action=parse every 30 seconds. Overridable
+# for local mirrors and benchmarks.
+USER_AGENT = os.environ.get("LIQUIPEDIA_USER_AGENT", "EsportsWorldCupAPI/1.0 (python-requests)")
+PARSE_INTERVAL = float(os.environ.get("LIQUIPEDIA_PARSE_INTERVAL", 30))
+REQUEST_INTERVAL = float(os.environ.get("LIQUIPEDIA_REQUEST_INTERVAL", 2))
+# Non-parse requests a short burst may make before REQUEST_INTERVAL applies.
+# action=parse never bursts: the terms allow one every PARSE_INTERVAL.
+BURST = int(os.environ.get("LIQUIPEDIA_BURST", 3))
+
+# Longest a call waits for the limiter before giving up, kept under the
+# 30 second gunicorn worker timeout. Batch jobs pass max_wait=None, which
+# is the default of AsyncLiquipediaClient.
+DEFAULT_MAX_WAIT = 20.0
+DEFAULT_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimitExceeded(requests.RequestException):
+    """The limiter could not grant a call within max_wait"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. reserve() takes a token now and returns how
+    long the caller has to wait before using it, so sync callers can
+    time.sleep() and async ones asyncio.sleep() on the same bucket.
+    """
+
+    def __init__(self, interval, burst=1):
+        self.interval = interval
+        self.rate = 1.0 / interval if interval > 0 else 0.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """Seconds until the reserved token is usable; RateLimitExceeded past max_wait"""
+        if self.interval <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitExceeded(f"Liquipedia rate limit: next call in {wait:.1f}s")
+            self.tokens -= 1
+            return wait
+
+
+# Process-wide, shared by every client
+PARSE_BUCKET = TokenBucket(PARSE_INTERVAL)
+REQUEST_BUCKET = TokenBucket(REQUEST_INTERVAL, BURST)
+
+
+def bucket_for(params):
+    return PARSE_BUCKET if (params or {}).get("action") == "parse" else REQUEST_BUCKET
+
+
+def wiki_of(url):
+    """'https://liquipedia.net/dota2/api.php' -> 'dota2'"""
+    parts = urlparse(url).path.strip("/").split("/")
+    return parts[0] if parts and parts[0] else ""
+
+
+def retry_after_seconds(response):
+    """The Retry-After header in seconds, or None"""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt, response=None):
+    """Exponential backoff with jitter, or the server's Retry-After when longer"""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+    retry_after = retry_after_seconds(response)
+    return max(delay, min(retry_after, BACKOFF_MAX)) if retry_after is not None else delay
+
+
+class CallMetrics:
+    """Latency of recent calls, aggregated per (wiki, action)"""
+
+    def __init__(self, window=500):
+        self.lock = threading.Lock()
+        self.recent = defaultdict(lambda: deque(maxlen=window))
+        self.totals = defaultdict(lambda: {"calls": 0, "errors": 0, "retries": 0, "limiter_wait_ms": 0.0})
+
+    def record(self, wiki, action, status, elapsed_ms, attempts, waited_ms):
+        key = (wiki, action)
+        with self.lock:
+            self.recent[key].append(elapsed_ms)
+            totals = self.totals[key]
+            totals["calls"] += 1
+            totals["retries"] += attempts - 1
+            totals["limiter_wait_ms"] += waited_ms
+            if status is None or status >= 400:
+                totals["errors"] += 1
+
+    def summary(self):
+        """{'wiki action': {calls, errors, retries, limiter_wait_ms, p50_ms, p95_ms, max_ms}}"""
+        with self.lock:
+            result = {}
+            for key, totals in self.totals.items():
+                latencies = sorted(self.recent[key])
+                result[f"{key[0]} {key[1]}"] = dict(
+                    totals,
+                    limiter_wait_ms=round(totals["limiter_wait_ms"], 1),
+                    p50_ms=round(latencies[len(latencies) // 2], 1),
+                    p95_ms=round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                    max_ms=round(latencies[-1], 1),
+                )
+            return result
+
+
+class LiquipediaClient:
+    """
+    The one HTTP stack for Liquipedia: a keep-alive connection pool, gzip,
+    the process-wide rate limits, retries with backoff on 429/5xx and
+    connection errors, and per-call latency metrics.
+    """
+
+    def __init__(self, user_agent=USER_AGENT, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES, pool_size=10):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.metrics = CallMetrics()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": "gzip",
+        })
+
+    def get(self, url, params=None, timeout=None, max_wait=DEFAULT_MAX_WAIT):
+        """
+        GET through the limiter, retrying 429/5xx responses and connection
+        errors unless the backoff would exceed max_wait. Returns the last
+        response, whatever its status, and raises the last exception when
+        every attempt failed to connect.
+        """
+        bucket = bucket_for(params)
+        wiki, action = wiki_of(url), (params or {}).get("action", "page")
+        waited = 0.0
+        response = None
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            wait = bucket.reserve(max_wait)
+            if wait:
+                time.sleep(wait)
+                waited += wait
+            try:
+                response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            if error is None and response.status_code not in RETRY_STATUSES:
+                break
+            delay = backoff_seconds(attempt, response)
+            if attempt == self.max_retries or (max_wait is not None and delay > max_wait):
+                break
+            logger.warning(f"Liquipedia {wiki} {action}: "
+                           f"{error or response.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            waited += delay
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        status = response.status_code if response is not None else None
+        self.metrics.record(wiki, action, status, elapsed_ms, attempt + 1, waited * 1000)
+        logger.debug(f"Liquipedia {wiki} {action} {(params or {}).get('page', '')}: {status} "
+                     f"in {elapsed_ms:.0f} ms ({attempt + 1} attempts, {waited * 1000:.0f} ms waiting)")
+        if response is None:
+            raise error
+        return response
+
+
+class AsyncLiquipediaClient:
+    """
+    LiquipediaClient for asyncio fan-out: the same buckets, retries and
+    metrics over an httpx.AsyncClient, so concurrent fetches still respect
+    the process-wide rate limits. It serves batch jobs, so calls wait for
+    the limiter as long as it takes unless max_wait is given.
+    """
+
+    def __init__(self, user_agent=USER_AGENT, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES,
+                 max_connections=10, metrics=None, transport=None):
+        self.max_retries = max_retries
+        self.metrics = metrics or get_client().metrics
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": user_agent, "Accept-Encoding": "gzip"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def get(self, url, params=None, max_wait=None):
+        """LiquipediaClient.get, awaiting the limiter and backoff instead of sleeping"""
+        bucket = bucket_for(params)
+        wiki, action = wiki_of(url), (params or {}).get("action", "page")
+        waited = 0.0
+        response = None
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            wait = bucket.reserve(max_wait)
+            if wait:
+                await asyncio.sleep(wait)
+                waited += wait
+            try:
+                response = await self.client.get(url, params=params)
+                error = None
+            except httpx.TransportError as e:
+                response, error = None, e
+            if error is None and response.status_code not in RETRY_STATUSES:
+                break
+            delay = backoff_seconds(attempt, response)
+            if attempt == self.max_retries or (max_wait is not None and delay > max_wait):
+                break
+            logger.warning(f"Liquipedia {wiki} {action}: "
+                           f"{error or response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            waited += delay
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        status = response.status_code if response is not None else None
+        self.metrics.record(wiki, action, status, elapsed_ms, attempt + 1, waited * 1000)
+        if response is None:
+            raise error
+        return response
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process's shared LiquipediaClient, recreated after a fork"""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = LiquipediaClient()
+            _client_pid = os.getpid()
+        return _client
@@ -0,0 +1,29 @@
+SEPARATOR = '\x1f'
+
+# The unordered team pair, match time and tournament; NULL when any of them is
+MATCH_KEY_SQL = (
+    "CASE WHEN team1 <= team2 THEN team1 || char(31) || team2 ELSE team2 || char(31) || team1 END"
+    " || char(31) || match_time || char(31) || tournament"
+)
+
+
+def create_match_key_schema(cursor):
+    """
+    Add the virtual match_key column to matches and index it.
+
+    Not UNIQUE: scraped rows are owned by their uid and can legitimately
+    share a key (two TBD vs TBD slots at the same time), so only the
+    dashboard ingest deduplicates on it.
+    """
+    columns = {row[1] for row in cursor.execute('PRAGMA table_xinfo(matches)')}
+    if 'match_key' not in columns:
+        cursor.execute(f'ALTER TABLE matches ADD COLUMN match_key TEXT GENERATED ALWAYS AS ({MATCH_KEY_SQL}) VIRTUAL')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_match_key ON matches(match_key)')
+
+
+def match_key(team1, team2, match_time, tournament):
+    """The matches.match_key of a match not stored yet"""
+    parts = (team1, team2, match_time, tournament)
+    if not all(isinstance(part, str) for part in parts):
+        return None
+    return SEPARATOR.join(sorted((team1, team2)) + [match_time, tournament])
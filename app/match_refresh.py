@@ -0,0 +1,97 @@
+import os
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from .db import get_connection
+from .liquipedia_client import AsyncLiquipediaClient
+from .page_revisions import (
+    MATCHES_MAX_AGE, PageRevision, fetch_page_html_async, fetch_page_info_async, get_stored_revision
+)
+from .matches_mohamed import parse_matches_html, save_matches_to_db
+from .game_matches import MATCHES_PAGE, parse_game_matches_html
+from .crud.game_matches_crud import save_scraped_game_matches
+
+logger = logging.getLogger(__name__)
+
+
+def _store_game_matches(game, match_data):
+    conn = get_connection()
+    try:
+        return save_scraped_game_matches(conn, game, match_data)
+    finally:
+        conn.close()
+
+
+# Both match stores read Liquipedia:Matches: consumer -> (parse, store).
+# The parsers run in worker processes, so they must be module-level.
+CONSUMERS = {
+    'matches': (parse_matches_html, save_matches_to_db),
+    'game_matches': (parse_game_matches_html, _store_game_matches),
+}
+
+
+async def _refresh_game(client, semaphore, pool, game, consumers):
+    """Check, fetch, parse and store one game's Liquipedia:Matches for the given consumers"""
+    async with semaphore:
+        info = await fetch_page_info_async(client, game, MATCHES_PAGE)
+        revisions = {name: PageRevision(name, game, MATCHES_PAGE, info,
+                                        get_stored_revision(name, game, MATCHES_PAGE), MATCHES_MAX_AGE)
+                     for name in consumers}
+        result = {name: {"unchanged": True} for name, revision in revisions.items() if revision.unchanged}
+        pending = [name for name in consumers if name not in result]
+        if not pending:
+            return result
+        # One download feeds every consumer that is behind
+        html = await fetch_page_html_async(client, game, MATCHES_PAGE, info, MATCHES_MAX_AGE)
+
+    # Parsing happens outside the semaphore, so the next downloads start
+    # while worker processes parse this one
+    loop = asyncio.get_running_loop()
+    for name in list(pending):
+        if revisions[name].same_content(html):
+            revisions[name].record()
+            result[name] = {"unchanged": True}
+            pending.remove(name)
+    parsed = await asyncio.gather(*(loop.run_in_executor(pool, CONSUMERS[name][0], game, html) for name in pending))
+    for name, match_data in zip(pending, parsed):
+        result[name] = CONSUMERS[name][1](game, match_data)
+        revisions[name].record()
+    return result
+
+
+async def _refresh_all(games, concurrency, consumers, processes):
+    semaphore = asyncio.Semaphore(concurrency)
+    workers = processes or min(len(games), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        async with AsyncLiquipediaClient(max_connections=concurrency) as client:
+            outcomes = await asyncio.gather(
+                *(_refresh_game(client, semaphore, pool, game, consumers) for game in games),
+                return_exceptions=True)
+    results = {}
+    for game, outcome in zip(games, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Refreshing {game} matches failed: {outcome}")
+            outcome = {"error": str(outcome)}
+        results[game] = outcome
+    return results
+
+
+def refresh_all_matches(games, concurrency=4, consumers=tuple(CONSUMERS), processes=None):
+    """
+    Refresh the stored matches of many games at once: up to concurrency
+    Liquipedia:Matches pages are checked and downloaded at a time through
+    the shared rate limits, parsed in a process pool and stored for each
+    consumer ('matches' for /matches, 'game_matches' for /game_matches).
+
+    Pages whose revision has not moved cost one prop=info query. Returns
+    {game: {consumer: sync counts or {"unchanged": True}}}, or
+    {game: {"error": ...}} for a game that failed.
+    """
+    games = list(dict.fromkeys(games))
+    unknown = set(consumers) - set(CONSUMERS)
+    if unknown:
+        raise ValueError(f"Unknown consumers: {', '.join(sorted(unknown))}")
+    if not games:
+        return {}
+    return asyncio.run(_refresh_all(games, max(1, concurrency), tuple(consumers), processes))
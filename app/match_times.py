@@ -0,0 +1,57 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+# matches.match_ts_utc is match_time as Unix seconds, computed by SQLite from
+# the stored ISO string ('N/A' and unparsable values give NULL). Filtering a
+# calendar day becomes a range on its index instead of a Python scan.
+MATCH_TS_COLUMN = "CAST(strftime('%s', match_time) AS INTEGER)"
+
+# Widest UTC offset in use (UTC+14 / UTC-12)
+MAX_UTC_OFFSET = 14 * 3600
+
+
+def create_match_ts_schema(cursor):
+    """Add the virtual match_ts_utc column to matches and index it, alone and per game"""
+    # Generated columns are hidden from PRAGMA table_info
+    columns = {row[1] for row in cursor.execute('PRAGMA table_xinfo(matches)')}
+    if 'match_ts_utc' not in columns:
+        cursor.execute(f'ALTER TABLE matches ADD COLUMN match_ts_utc INTEGER '
+                       f'GENERATED ALWAYS AS ({MATCH_TS_COLUMN}) VIRTUAL')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_match_ts_utc ON matches(match_ts_utc)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_game_match_ts_utc ON matches(game, match_ts_utc)')
+
+
+def parse_day(day):
+    """The date of a YYYY-MM-DD string, or None when it is not one"""
+    try:
+        return datetime.strptime(day, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def local_day_range(filter_date, timezone):
+    """
+    [start, end) Unix seconds of filter_date in timezone. Days that gain or
+    lose an hour to DST are 23 or 25 hours long.
+    """
+    tz = ZoneInfo(timezone)
+    start = datetime.combine(filter_date, time(), tz)
+    end = datetime.combine(filter_date + timedelta(days=1), time(), tz)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def own_offset_day_range(filter_date):
+    """
+    A range covering filter_date in whatever offset a match_time was stored
+    with; rows in it still need the date part of match_time checked.
+    """
+    start, end = local_day_range(filter_date, 'UTC')
+    return start - MAX_UTC_OFFSET, end + MAX_UTC_OFFSET
+
+
+def to_local_iso(match_time, timezone):
+    """match_time converted to timezone, or None when it cannot be parsed"""
+    try:
+        return datetime.fromisoformat(match_time.replace('Z', '+00:00')).astimezone(ZoneInfo(timezone)).isoformat()
+    except ValueError:
+        return None
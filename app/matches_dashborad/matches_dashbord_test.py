@@ -7,6 +7,10 @@ import json
 import sqlite3
 import pytz
 from app.db import get_connection
+from app.match_times import parse_day, local_day_range, own_offset_day_range, to_local_iso
+from app.tournament_catalog import featured_tournaments_page, raw_tournament_names, label_tournaments
+from app.match_keys import match_key
+from app.spelling import apply_spelling_changes
 from app.matches_dashborad.match_model import MatchModel
 import uuid
 
@@ -44,15 +48,30 @@ def determine_match_status(original_status: str, score: str) -> str:
         return "live"
     else:
         return original_status 
+
+
+LIVE_MATCH_COLUMNS = (
+    'uid', 'game', 'status', 'tournament', 'tournament_link', 'tournament_icon',
+    'team1', 'team1_url', 'logo1_light', 'logo1_dark',
+    'team2', 'team2_url', 'logo2_light', 'logo2_dark',
+    'score', 'match_time', 'format', 'stream_links', 'details_link', 'match_group'
+)
+
+
 def save_live_matches_to_db(game: str, matches: list):
-    conn = get_connection()
-    cursor = conn.cursor()
-    
+    """
+    Insert a batch of dashboard matches, skipping any whose unordered team
+    pair, match_time and tournament (matches.match_key) are already stored
+    or appear earlier in the batch. The whole batch is one INSERT ... SELECT
+    with an indexed NOT EXISTS probe, and RETURNING tells which rows went in.
+    """
     saved_matches = 0
     skipped_matches = 0
     status_summary = {"Upcoming": 0, "live": 0, "Completed": 0}
     duplicate_matches = []
 
+    batch = []
+    batch_keys = set()
     for match in matches:
         match_dict = {
             "team1": match.team1,
@@ -63,14 +82,46 @@ def save_live_matches_to_db(game: str, matches: list):
             skipped_matches += 1
             continue
 
-        cursor.execute('''
-            SELECT uid FROM matches
-            WHERE ((team1 = ? AND team2 = ?) OR (team1 = ? AND team2 = ?))
-              AND match_time = ? AND tournament = ?
-        ''', (match.team1, match.team2, match.team2, match.team1, match.match_time, match.tournament))
+        key = match_key(match.team1, match.team2, match.match_time, match.tournament)
+        if key is not None and key in batch_keys:
+            batch.append((None, match, None))
+            continue
+        batch_keys.add(key)
+
+        row = (
+            str(uuid.uuid4()), match.game, determine_match_status(match.status, match.score), match.tournament,
+            match.tournament_link, match.tournament_icon,
+            match.team1, match.team1_url, match.logo1_light, match.logo1_dark,
+            match.team2, match.team2_url, match.logo2_light, match.logo2_dark,
+            match.score, match.match_time, match.format,
+            json.dumps(match.stream_links) if match.stream_links else json.dumps([]),
+            match.details_link, match.match_group
+        )
+        batch.append((row, match, key))
+
+    columns = ', '.join(LIVE_MATCH_COLUMNS)
+    values = ', '.join(f"json_extract(value, '$[{i}]')" for i in range(len(LIVE_MATCH_COLUMNS)))
 
-        existing_match = cursor.fetchone()
-        if existing_match:
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(f'''
+            INSERT INTO matches ({columns})
+            SELECT {values}
+            FROM json_each(?) AS batch
+            WHERE NOT EXISTS (
+                SELECT 1 FROM matches WHERE match_key = json_extract(batch.value, '$[{len(LIVE_MATCH_COLUMNS)}]')
+            )
+            RETURNING uid
+        ''', (json.dumps([row + (key, ) for row, _, key in batch if row is not None]), ))
+        inserted = {r[0] for r in cursor.fetchall()}
+
+        for row, match, _ in batch:
+            if row is not None and row[0] in inserted:
+                status_summary[row[2]] += 1
+                saved_matches += 1
+                continue
             skipped_matches += 1
             duplicate_matches.append({
                 "team1": match.team1,
@@ -78,34 +129,15 @@ def save_live_matches_to_db(game: str, matches: list):
                 "match_time": match.match_time,
                 "tournament": match.tournament
             })
-            continue
-
-        actual_status = determine_match_status(match.status, match.score)
-        status_summary[actual_status] += 1
-        
-        uid = str(uuid.uuid4())
-        cursor.execute(
-            '''
-            INSERT INTO matches (
-                uid, game, status, tournament, tournament_link, tournament_icon,
-                team1, team1_url, logo1_light, logo1_dark,
-                team2, team2_url, logo2_light, logo2_dark,
-                score, match_time, format, stream_links, details_link, match_group
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                uid, match.game, actual_status, match.tournament,
-                match.tournament_link, match.tournament_icon,
-                match.team1, match.team1_url, match.logo1_light, match.logo1_dark,
-                match.team2, match.team2_url, match.logo2_light, match.logo2_dark,
-                match.score, match.match_time, match.format,
-                json.dumps(match.stream_links) if match.stream_links else json.dumps([]),
-                match.details_link, match.match_group
-            )
-        )
-        saved_matches += 1
 
-    conn.commit()
-    conn.close()
+        label_tournaments(cursor)
+        apply_spelling_changes(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
     return {
         'saved': saved_matches,
@@ -141,22 +173,14 @@ def update_match_in_db(uid: str, updated_data: dict):
     
     cursor.execute(query, params)
     affected_rows = cursor.rowcount
+    label_tournaments(cursor)
+    apply_spelling_changes(cursor)
     conn.commit()
     conn.close()
     
     if affected_rows == 0:
         return {"error": "Match not found"}
     return {"success": True}
-
-def normalize_tournament_name(tournament_name: str) -> str:
-    TOURNAMENT_NAME_MAP = {
-        "OWCS Midseason": "Overwatch Champions",
-        "FCP": "FC Pro 25 World Championship",
-    }
-    for keyword, replacement in TOURNAMENT_NAME_MAP.items():
-        if keyword in tournament_name:
-            return replacement
-    return tournament_name
 def get_matches_paginated(games: list = [],
                           tournaments: list = [],
                           live: bool = False,
@@ -164,6 +188,13 @@ def get_matches_paginated(games: list = [],
                           page: int = 1,
                           per_page: int = 10,
                           timezone: str = "UTC"):
+    """
+    Matches grouped by tournament and game, paginated by tournament.
+
+    Tournaments are paginated in SQL over tournament_catalog, the day filter
+    is a match_ts_utc range, and only the matches of the returned page are
+    loaded and converted to the local timezone.
+    """
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -179,155 +210,90 @@ def get_matches_paginated(games: list = [],
             f"tournament IN ({','.join(['?'] * len(tournaments))})")
         params.extend(tournaments)
 
+    # The catalog alone answers game and tournament filters
+    scan_matches = False
+
     if live:
         where_clauses.append("status = 'Not Started'")
+        scan_matches = True
+
+    to_local = not live and timezone
+    filter_date = parse_day(day) if day else None
+    if filter_date:
+        if to_local:
+            where_clauses.append("match_ts_utc >= ? AND match_ts_utc < ?")
+            params.extend(local_day_range(filter_date, timezone))
+        else:
+            # Without a timezone the day is read in each match_time's own offset
+            where_clauses.append("match_ts_utc >= ? AND match_ts_utc < ? AND substr(match_time, 1, 10) = ?")
+            params.extend(own_offset_day_range(filter_date) + (filter_date.isoformat(), ))
+        scan_matches = True
+
+    where_sql = " AND ".join(where_clauses) or "1=1"
+
+    try:
+        names, total = featured_tournaments_page(cursor, where_sql, params, page, per_page, scan_matches)
+        page_tournaments = raw_tournament_names(cursor, names)
+        cursor.execute(
+            f"""
+            SELECT *
+            FROM matches
+            WHERE {where_sql} AND tournament IN (SELECT value FROM json_each(?))
+            ORDER BY tournament, match_time, id
+            """, params + [json.dumps(list(page_tournaments))])
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
 
-    if day:
-        try:
-            filter_date = datetime.strptime(day, "%Y-%m-%d").date()
-            where_clauses.append(
-                "match_time != 'N/A' AND match_time IS NOT NULL")
-        except ValueError:
-            pass
-
-    where_sql = " AND ".join(where_clauses)
-    if where_sql:
-        where_sql = "WHERE " + where_sql
-
-    cursor.execute(
-        f"""
-        SELECT *
-        FROM matches
-        {where_sql}
-        ORDER BY tournament, match_time
-        """, params)
-
-    all_matches = cursor.fetchall()
-    keys = [column[0] for column in cursor.description]
-    matches_data = [dict(zip(keys, row)) for row in all_matches]
-
-    if not live and timezone:
-        for match in matches_data:
-            if match['match_time'] and match['match_time'] != 'N/A':
-                try:
-                    dt_utc = datetime.fromisoformat(match['match_time'].replace('Z', '+00:00'))
-                    local_tz = ZoneInfo(timezone)
-                    local_dt = dt_utc.astimezone(local_tz)
-                    match['match_time'] = local_dt.isoformat()
-                except ValueError:
-                    match['match_time'] = None
-
-    if day:
-        try:
-            filter_date = datetime.strptime(day, "%Y-%m-%d").date()
-            filtered_matches = []
-            for match in matches_data:
-                if match['match_time'] and match['match_time'] != 'N/A':
-                    match_dt = datetime.fromisoformat(
-                        match['match_time']).date()
-                    if match_dt == filter_date:
-                        filtered_matches.append(match)
-                else:
-                    continue
-            matches_data = filtered_matches
-        except ValueError:
-            pass
-        
+    # Group the page's matches by tournament and game
     tournaments_map = {}
-    for match in matches_data:
-        match['tournament'] = normalize_tournament_name(match['tournament'])
-        tournament_name = match['tournament']
+    for match in rows:
+        tournament_name = page_tournaments[match["tournament"]]
         if tournament_name not in tournaments_map:
             tournaments_map[tournament_name] = {
                 "tournament_name": tournament_name,
-                "tournament_icon": match.get("tournament_icon", ""),
-                "tournament_link": match.get("tournament_link", ""),
-                "games": []
+                "tournament_icon": match["tournament_icon"],
+                "tournament_link": match["tournament_link"],
+                "games": {}
             }
 
-        game_entry = next((g for g in tournaments_map[tournament_name]["games"]
-                           if g["game"] == match["game"]), None)
-        if not game_entry:
-            game_entry = {"game": match["game"], "matches": []}
-            tournaments_map[tournament_name]["games"].append(game_entry)
-
-        game_entry["matches"].append({
+        match_time = match["match_time"]
+        if to_local and match_time and match_time != 'N/A':
+            match_time = to_local_iso(match_time, timezone)
+        tournaments_map[tournament_name]["games"].setdefault(match["game"], []).append({
             "uid": match["uid"],
             "team1": match["team1"],
-            "team1_url": match.get("team1_url"),
+            "team1_url": match["team1_url"],
             "logo1_light": match["logo1_light"],
             "logo1_dark": match["logo1_dark"],
             "team2": match["team2"],
-            "team2_url": match.get("team2_url"),
+            "team2_url": match["team2_url"],
             "logo2_light": match["logo2_light"],
             "logo2_dark": match["logo2_dark"],
             "score": match["score"],
-            "match_time": match["match_time"],
+            "match_time": match_time,
             "format": match["format"],
-            "stream_link": json.loads(match["stream_links"]) if match.get("stream_links") else [],
-            "details_link": match.get("details_link"),
+            "stream_link": json.loads(match["stream_links"]) if match["stream_links"] else [],
+            "details_link": match["details_link"],
             "group": match["match_group"],
             "status": match["status"]
         })
 
-    total_tournaments = len(tournaments_map)
-    tournament_list = list(tournaments_map.values())
-
-    # Sort tournaments
-    priority_keywords = [
-        'FC',
-        'FCP',
-        'MSC',
-        'Hok World Cup',
-        'EWC',
-        'OWCS',
-        'OWCS Season',
-        'OWCS Midseason',
-        'Honor of Kings World Cup',
-        'Esports World Cup 2025',
-        'EWC 2025',
-        'Esports World Cup',
-        'Esports World',
-        'Esports',
-        'World Cup',
-        'PUBG Mobile World Cup',
-        'Overwatch',
-    ]
-
-    def get_priority_index(name: str) -> int:
-        name_lower = name.lower()
-        for i, keyword in enumerate(priority_keywords):
-            if keyword.lower() in name_lower:
-                return i
-        return len(priority_keywords) + 1
-
-    tournament_list = [
-        t for t in tournament_list
-        if any(keyword.lower() in t["tournament_name"].lower()
-               for keyword in priority_keywords)
-    ]
-
-    # ترتيب البطولات
-    tournament_list.sort(key=lambda t: (get_priority_index(t[
-        "tournament_name"]), t["tournament_name"].lower()))
-
-    # Apply pagination
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    paginated_tournaments = tournament_list[start_idx:end_idx]
-
-    # Sort matches within each tournament
-    for tournament in paginated_tournaments:
-        for game_entry in tournament["games"]:
-            game_entry["matches"].sort(key=lambda m: m["match_time"])
-        tournament["games"] = sorted(tournament["games"],
-                                     key=lambda g: g["game"])
-
-    conn.close()
+    paginated_tournaments = []
+    for name in names:
+        tournament = tournaments_map.get(name)
+        if tournament is None:  # its matches were deleted since the catalog query
+            continue
+        # Sort matches within each game, and games by name
+        for matches in tournament["games"].values():
+            matches.sort(key=lambda m: m["match_time"])
+        tournament["games"] = [{"game": game, "matches": matches}
+                               for game, matches in sorted(tournament["games"].items(), key=lambda g: g[0])]
+        paginated_tournaments.append(tournament)
 
     return {
         "page": page,
         "per_page": per_page,
-        "total": len(tournament_list),
+        "total": total,
         "tournaments": paginated_tournaments
-    }
\ No newline at end of file
+    }
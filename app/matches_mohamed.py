@@ -1,31 +1,19 @@
 # app/matches_mohamed.py
-import requests, random, json, os, hashlib
-from bs4 import BeautifulSoup
+import json, os, hashlib
+from app.html_parsing import make_soup
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from app.utils import clean_liquipedia_url, BASE_URL
+from app.page_revisions import MATCHES_MAX_AGE, PageRevision, fetch_if_changed, fetch_page_html, get_stored_revision
 import pytz
 from dateutil import tz
 import json
 from app.db import get_connection
+from app.spelling import apply_spelling_changes
+from app.optimized_pagination import KeysetPagination
+from app.match_times import parse_day, local_day_range, own_offset_day_range, to_local_iso
+from app.tournament_catalog import featured_tournaments_page, raw_tournament_names, label_tournaments
 
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.1 Safari/605.1.15',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; rv:125.0) Gecko/20100101 Firefox/125.0'
-]
-
-session = requests.Session()
-session.headers.update({
-    'User-Agent': random.choice(USER_AGENTS),
-    'Referer': 'https://www.google.com/',
-    'Accept-Language': 'en-US,en;q=0.9',
-    'DNT': '1',
-    'Cache-Control': 'no-cache',
-    'Pragma': 'no-cache',
-    'X-Requested-With': 'XMLHttpRequest'
-})
 
 
 def convert_timestamp_to_utc_iso(timestamp: int) -> str:
@@ -82,6 +70,10 @@ CUSTOM_STREAM_LINKS = {
     # },
 }
 
+def matches_page(use_matches_page=True):
+    return "Liquipedia:Matches" if use_matches_page else "Main_Page"
+
+
 def scrape_matches(game: str = "valorant", use_matches_page: bool = True):
     """
     Scrape matches from Liquipedia
@@ -90,20 +82,20 @@ def scrape_matches(game: str = "valorant", use_matches_page: bool = True):
         game: Game to scrape (valorant, cs2, etc.)
         use_matches_page: If True, use Liquipedia:Matches page, otherwise use Main_Page
     """
-    API_URL = f"{BASE_URL}/{game}/api.php"
-    PAGE = "Liquipedia:Matches" if use_matches_page else "Main_Page"
-
-    params = {
-        'action': 'parse',
-        'page': PAGE,
-        'format': 'json',
-        'prop': 'text'
-    }
+    return parse_matches_html(game, fetch_page_html(game, matches_page(use_matches_page)))
+
+
+def scrape_matches_if_changed(game: str, use_matches_page: bool = True):
+    """
+    (matches, revision) like scrape_matches, or (None, revision) when the
+    page has not changed since revision.record() was last called for it
+    """
+    return fetch_if_changed('matches', game, matches_page(use_matches_page),
+                            lambda html: parse_matches_html(game, html), max_age=MATCHES_MAX_AGE)
 
-    response = session.get(API_URL, params=params, timeout=10)
-    response.raise_for_status()
-    html_content = response.json()['parse']['text']['*']
-    soup = BeautifulSoup(html_content, "html.parser")
+
+def parse_matches_html(game, html_content):
+    soup = make_soup(html_content, 'matches')
 
     data = {"Upcoming": {}, "Completed": {}}
     sections = soup.select('div[data-toggle-area-content]')
@@ -198,92 +190,174 @@ def scrape_matches(game: str = "valorant", use_matches_page: bool = True):
     return data
 
 
-def calculate_hash(obj):
-    return hashlib.md5(json.dumps(obj, sort_keys=True).encode()).hexdigest()
-
-
 def update_file_if_changed(game, new_data):
     filename = f"{game}_matches.json"
-    old_data = {}
-    if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            old_data = json.load(f)
+    # Keyed by the file, and hashing the scraped data rather than the HTML
+    revision = PageRevision('matches_file', game, filename, stored=get_stored_revision('matches_file', game, filename))
 
-    if calculate_hash(old_data) != calculate_hash(new_data):
+    if not revision.same_content(json.dumps(new_data, sort_keys=True)) or not os.path.exists(filename):
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(new_data, f, ensure_ascii=False, indent=2)
+        revision.record()
         print(f"✅ Updated {filename}")
     else:
         print("🟡 No changes detected.")
 
 
-def save_matches_to_db(game: str, matches_data: dict):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM matches WHERE game = ?", (game, ))
+MATCH_COLUMNS = (
+    "game", "status", "tournament", "tournament_link", "tournament_icon",
+    "team1", "team1_url", "logo1_light", "logo1_dark",
+    "team2", "team2_url", "logo2_light", "logo2_dark",
+    "score", "match_time", "format", "stream_links", "details_link", "match_group"
+)
+
+
+def generate_match_uid(game, tournament, team1, team2, match_time, details_link):
+    """Stable natural key of a scraped match"""
+    key = f"{game}_{tournament}_{team1}_{team2}_{match_time}_{details_link}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def build_match_rows(game: str, matches_data: dict):
+    """
+    Flatten scrape_matches() output into {uid: (content_hash, row)} where row
+    follows MATCH_COLUMNS. Matches sharing a natural key (e.g. two TBD vs TBD
+    slots at the same time) are told apart by their order of appearance.
+    """
+    rows = {}
     for status, tournaments in matches_data.items():
         for tournament_name, tournament_info in tournaments.items():
             t_link = tournament_info.get("tournament_link", "")
             t_icon = tournament_info.get("tournament_icon", "")
             for match in tournament_info["matches"]:
-                cursor.execute(
-                    '''
-                    INSERT INTO matches (
-                        game, status, tournament, tournament_link, tournament_icon,
-                        team1, team1_url, logo1_light, logo1_dark,
-                        team2, team2_url, logo2_light, logo2_dark,
-                        score, match_time, format, stream_links, details_link, match_group
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (game, status, tournament_name, t_link, t_icon,
-                          match.get("team1"), match.get("team1_url"),
-                          match.get("logo1_light"), match.get("logo1_dark"),
-                          match.get("team2"), match.get("team2_url"),
-                          match.get("logo2_light"), match.get("logo2_dark"),
-                          match.get("score"), match.get("match_time"),
-                          match.get("format"),
-                          json.dumps(match.get("stream_link", [])),
-                          match.get("details_link"), match.get("group")))
-    cursor.execute("SELECT COUNT(*) FROM matches WHERE game = ?", (game,))
-    count = cursor.fetchone()[0]
-    print(f"Number of matches saved for {game}: {count}")
-    conn.commit()
-    conn.close()
+                row = (game, status, tournament_name, t_link, t_icon,
+                       match.get("team1"), match.get("team1_url"),
+                       match.get("logo1_light"), match.get("logo1_dark"),
+                       match.get("team2"), match.get("team2_url"),
+                       match.get("logo2_light"), match.get("logo2_dark"),
+                       match.get("score"), match.get("match_time"),
+                       match.get("format"),
+                       json.dumps(match.get("stream_link", [])),
+                       match.get("details_link"), match.get("group"))
+                uid = generate_match_uid(game, tournament_name, match.get("team1"), match.get("team2"),
+                                         match.get("match_time"), match.get("details_link"))
+                base_uid, n = uid, 1
+                while uid in rows:
+                    uid = f"{base_uid}-{n}"
+                    n += 1
+                # row only holds str/None, so its repr is a stable, cheap digest input
+                rows[uid] = (hashlib.md5(repr(row).encode()).hexdigest(), row)
+    return rows
 
 
-def get_matches_by_filters(games=[], tournaments=[], live=False, page=1, per_page=10):
+def save_matches_to_db(game: str, matches_data: dict):
+    """
+    Sync the stored matches of one game with a fresh scrape.
+
+    Only new matches are inserted, changed ones updated and vanished ones
+    deleted, all in a single transaction, so readers never see the game's
+    partition empty. Returns the inserted/updated/deleted/unchanged counts.
+    """
+    new_rows = build_match_rows(game, matches_data)
+
     conn = get_connection()
     cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT uid, content_hash FROM matches WHERE game = ? AND uid IS NOT NULL", (game,))
+        existing = {row["uid"]: row["content_hash"] for row in cursor.fetchall()}
+
+        inserts, updates = [], []
+        for uid, (content_hash, row) in new_rows.items():
+            if uid not in existing:
+                inserts.append((uid, content_hash) + row)
+            elif existing[uid] != content_hash:
+                updates.append(row + (content_hash, uid))
+        deletes = [(uid,) for uid in existing.keys() - new_rows.keys()]
+
+        cursor.executemany(
+            f"INSERT INTO matches (uid, content_hash, {', '.join(MATCH_COLUMNS)}) "
+            f"VALUES ({', '.join(['?'] * (len(MATCH_COLUMNS) + 2))})", inserts)
+        cursor.executemany(
+            f"UPDATE matches SET {', '.join(f'{c} = ?' for c in MATCH_COLUMNS)}, content_hash = ? "
+            "WHERE uid = ?", updates)
+        cursor.executemany("DELETE FROM matches WHERE uid = ?", deletes)
+        # Rows written before matches had a natural key cannot be diffed
+        cursor.execute("DELETE FROM matches WHERE game = ? AND uid IS NULL", (game,))
+        legacy_deleted = cursor.rowcount
+        label_tournaments(cursor)
+        apply_spelling_changes(cursor)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    result = {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletes) + legacy_deleted,
+        "unchanged": len(new_rows) - len(inserts) - len(updates)
+    }
+    print(f"Matches synced for {game}: {result}")
+    return result
+
 
-    query = "SELECT * FROM matches WHERE 1=1"
+def _matches_filters(games, tournaments, live):
+    where = "1=1"
     params = []
 
     if games:
-        query += f" AND game IN ({','.join(['?'] * len(games))})"
+        where += f" AND game IN ({','.join(['?'] * len(games))})"
         params.extend(games)
 
     if tournaments:
-        query += f" AND tournament IN ({','.join(['?'] * len(tournaments))})"
+        where += f" AND tournament IN ({','.join(['?'] * len(tournaments))})"
         params.extend(tournaments)
 
     if live:
-        query += " AND status = 'Not Started'"
+        where += " AND status = 'Not Started'"
 
-    query += " ORDER BY id ASC LIMIT ? OFFSET ?"
-    params.extend([per_page, (page - 1) * per_page])
+    return where, params
 
-    cursor.execute(query, params)
-    matches = cursor.fetchall()
 
-    cursor.execute("SELECT COUNT(*) FROM matches WHERE 1=1", ())
-    total = cursor.fetchone()[0]
+def get_matches_by_filters(games=[], tournaments=[], live=False, page=1, per_page=10):
+    """Matches in id order, returned as (matches, total)"""
+    where, params = _matches_filters(games, tournaments, live)
+    conn = get_connection()
+    cursor_obj = conn.cursor()
 
-    keys = [column[0] for column in cursor.description]
+    cursor_obj.execute(f"SELECT * FROM matches WHERE {where} ORDER BY id ASC LIMIT ? OFFSET ?",
+                       params + [per_page, (page - 1) * per_page])
+    matches = cursor_obj.fetchall()
+    keys = [column[0] for column in cursor_obj.description]
     result = [dict(zip(keys, row)) for row in matches]
 
+    cursor_obj.execute(f"SELECT COUNT(*) FROM matches WHERE {where}", params)
+    total = cursor_obj.fetchone()[0]
+
     conn.close()
     return result, total
 
 
+def get_matches_by_filters_keyset(games=[], tournaments=[], live=False, per_page=10, cursor=None):
+    """
+    get_matches_by_filters with keyset pagination: (matches, next_cursor)
+    for the page after cursor (the first page when it is empty). next_cursor
+    is None on the last page; a malformed cursor raises ValueError.
+    """
+    where, params = _matches_filters(games, tournaments, live)
+    conn = get_connection()
+    try:
+        page_result = KeysetPagination('matches', 'id', 'ASC').paginate(
+            conn.cursor(), where, params, per_page, cursor)
+    finally:
+        conn.close()
+    return page_result['data'], page_result['next_cursor']
+
+
 def get_matches_from_db(game: str):
     conn = get_connection()
     cursor = conn.cursor()
@@ -319,16 +393,7 @@ def parse_match_date(match_time_str, timezone_str="UTC"):
         return local_dt
     except Exception as e:
         return None
-# Helper Function to Normalize Tournament Names
-def normalize_tournament_name(tournament_name: str) -> str:
-    TOURNAMENT_NAME_MAP = {
-        "OWCS Midseason": "Overwatch Champions",
-        "FCP": "FC Pro 25 World Championship",
-    }
-    for keyword, replacement in TOURNAMENT_NAME_MAP.items():
-        if keyword in tournament_name:
-            return replacement
-    return tournament_name
+
 
 def get_matches_paginated(games: list = [],
                           tournaments: list = [],
@@ -337,6 +402,13 @@ def get_matches_paginated(games: list = [],
                           page: int = 1,
                           per_page: int = 10,
                           timezone: str = "UTC"):
+    """
+    Matches grouped by tournament and game, paginated by tournament.
+
+    Tournaments are paginated in SQL over tournament_catalog, the day filter
+    is a match_ts_utc range, and only the matches of the returned page are
+    loaded and converted to the local timezone.
+    """
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -353,176 +425,90 @@ def get_matches_paginated(games: list = [],
             f"tournament IN ({','.join(['?'] * len(tournaments))})")
         params.extend(tournaments)
 
+    # The catalog alone answers game and tournament filters
+    scan_matches = False
+
     if live:
         where_clauses.append("status = 'Not Started'")
-
-    if day:
-        try:
-            filter_date = datetime.strptime(day, "%Y-%m-%d").date()
-            where_clauses.append(
-                "match_time != 'N/A' AND match_time IS NOT NULL")
-        except ValueError:
-            pass
-
-    where_sql = " AND ".join(where_clauses)
-    if where_sql:
-        where_sql = "WHERE " + where_sql
-
-    cursor.execute(
-        f"""
-        SELECT *
-        FROM matches
-        {where_sql}
-        ORDER BY tournament, match_time
-        """, params)
-
-    all_matches = cursor.fetchall()
-    keys = [column[0] for column in cursor.description]
-    matches_data = [dict(zip(keys, row)) for row in all_matches]
+        scan_matches = True
 
     # تحويل الوقت إلى التوقيت المحلي إذا كان live=False
-    if not live and timezone:
-        for match in matches_data:
-            if match['match_time'] and match['match_time'] != 'N/A':
-                try:
-                    # تحويل الوقت من UTC إلى التوقيت المحلي
-                    dt_utc = datetime.fromisoformat(match['match_time'])
-                    local_tz = ZoneInfo(timezone)
-                    local_dt = dt_utc.astimezone(local_tz)
-                    match['match_time'] = local_dt.isoformat()
-                except ValueError:
-                    match[
-                        'match_time'] = None  # في حالة وجود خطأ في تحويل الوقت
-
-    # Apply day filter in Python if specified
-    if day:
-        try:
-            filter_date = datetime.strptime(day, "%Y-%m-%d").date()
-            filtered_matches = []
-            for match in matches_data:
-                if match['match_time'] and match['match_time'] != 'N/A':
-                    match_dt = datetime.fromisoformat(
-                        match['match_time']).date()
-                    if match_dt == filter_date:
-                        filtered_matches.append(match)
-                else:
-                    continue
-            matches_data = filtered_matches
-        except ValueError:
-            pass
-    # Group matches by tournament
+    to_local = not live and timezone
+    filter_date = parse_day(day) if day else None
+    if filter_date:
+        if to_local:
+            where_clauses.append("match_ts_utc >= ? AND match_ts_utc < ?")
+            params.extend(local_day_range(filter_date, timezone))
+        else:
+            # Without a timezone the day is read in each match_time's own offset
+            where_clauses.append("match_ts_utc >= ? AND match_ts_utc < ? AND substr(match_time, 1, 10) = ?")
+            params.extend(own_offset_day_range(filter_date) + (filter_date.isoformat(), ))
+        scan_matches = True
+
+    where_sql = " AND ".join(where_clauses) or "1=1"
+
+    try:
+        names, total = featured_tournaments_page(cursor, where_sql, params, page, per_page, scan_matches)
+        page_tournaments = raw_tournament_names(cursor, names)
+        cursor.execute(
+            f"""
+            SELECT *
+            FROM matches
+            WHERE {where_sql} AND tournament IN (SELECT value FROM json_each(?))
+            ORDER BY tournament, match_time, id
+            """, params + [json.dumps(list(page_tournaments))])
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    # Group the page's matches by tournament and game
     tournaments_map = {}
-    for match in matches_data:
-        match['tournament'] = normalize_tournament_name(match['tournament'])
-        tournament_name = match['tournament']
+    for match in rows:
+        tournament_name = page_tournaments[match["tournament"]]
         if tournament_name not in tournaments_map:
             tournaments_map[tournament_name] = {
                 "tournament_name": tournament_name,
-                "tournament_icon": match.get("tournament_icon", ""),
-                "tournament_link": match.get("tournament_link", ""),
-                "games": []
+                "tournament_icon": match["tournament_icon"],
+                "tournament_link": match["tournament_link"],
+                "games": {}
             }
 
-        game_entry = next((g for g in tournaments_map[tournament_name]["games"]
-                           if g["game"] == match["game"]), None)
-        if not game_entry:
-            game_entry = {"game": match["game"], "matches": []}
-            tournaments_map[tournament_name]["games"].append(game_entry)
-
-        game_entry["matches"].append({
-            "team1":
-            match["team1"],
-            "team1_url":
-            match.get("team1_url"),
-            "logo1_light":
-            match["logo1_light"],
-            "logo1_dark":
-            match["logo1_dark"],
-            "team2":
-            match["team2"],
-            "team2_url":
-            match.get("team2_url"),
-            "logo2_light":
-            match["logo2_light"],
-            "logo2_dark":
-            match["logo2_dark"],
-            "score":
-            match["score"],
-            "match_time":
-            match["match_time"],
-            "format":
-            match["format"],
-            "stream_link":
-            json.loads(match["stream_links"])
-            if match.get("stream_links") else [],
-            "details_link":
-            match.get("details_link"),
-            "group":
-            match["match_group"],
-            "status":
-            match["status"]
+        match_time = match["match_time"]
+        if to_local and match_time and match_time != 'N/A':
+            match_time = to_local_iso(match_time, timezone)
+        tournaments_map[tournament_name]["games"].setdefault(match["game"], []).append({
+            "team1": match["team1"],
+            "team1_url": match["team1_url"],
+            "logo1_light": match["logo1_light"],
+            "logo1_dark": match["logo1_dark"],
+            "team2": match["team2"],
+            "team2_url": match["team2_url"],
+            "logo2_light": match["logo2_light"],
+            "logo2_dark": match["logo2_dark"],
+            "score": match["score"],
+            "match_time": match_time,
+            "format": match["format"],
+            "stream_link": json.loads(match["stream_links"]) if match["stream_links"] else [],
+            "details_link": match["details_link"],
+            "group": match["match_group"],
+            "status": match["status"]
         })
 
-    # Apply pagination to tournaments
-    total_tournaments = len(tournaments_map)
-    tournament_list = list(tournaments_map.values())
-
-    # Sort tournaments
-    priority_keywords = [
-        'FC',
-        'FCP',
-        'MSC',
-        'Hok World Cup',
-        'EWC',
-        'OWCS',
-        'OWCS Season',
-        'OWCS Midseason',
-        'Honor of Kings World Cup',
-        'Esports World Cup 2025',
-        'EWC 2025',
-        'Esports World Cup',
-        'Esports World',
-        'Esports',
-        'World Cup',
-        'PUBG Mobile World Cup',
-        'Overwatch',
-    ]
-
-    def get_priority_index(name: str) -> int:
-        name_lower = name.lower()
-        for i, keyword in enumerate(priority_keywords):
-            if keyword.lower() in name_lower:
-                return i
-        return len(priority_keywords) + 1  # non-priority
-
-    # فلترة البطولات ذات الأولوية فقط
-    tournament_list = [
-        t for t in tournament_list
-        if any(keyword.lower() in t["tournament_name"].lower()
-               for keyword in priority_keywords)
-    ]
-
-    # ترتيب البطولات
-    tournament_list.sort(key=lambda t: (get_priority_index(t[
-        "tournament_name"]), t["tournament_name"].lower()))
-
-    # Apply pagination
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    paginated_tournaments = tournament_list[start_idx:end_idx]
-
-    # Sort matches within each tournament
-    for tournament in paginated_tournaments:
-        for game_entry in tournament["games"]:
-            game_entry["matches"].sort(key=lambda m: m["match_time"])
-        tournament["games"] = sorted(tournament["games"],
-                                     key=lambda g: g["game"])
-
-    conn.close()
+    paginated_tournaments = []
+    for name in names:
+        tournament = tournaments_map.get(name)
+        if tournament is None:  # its matches were deleted since the catalog query
+            continue
+        # Sort matches within each game, and games by name
+        for matches in tournament["games"].values():
+            matches.sort(key=lambda m: m["match_time"])
+        tournament["games"] = [{"game": game, "matches": matches}
+                               for game, matches in sorted(tournament["games"].items(), key=lambda g: g[0])]
+        paginated_tournaments.append(tournament)
 
     return {
         "page": page,
         "per_page": per_page,
-        "total": len(tournament_list),
+        "total": total,
         "tournaments": paginated_tournaments
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import logging
+from .db import get_connection, create_core_schema
+from .game_teams_init_db import create_game_teams_schema
+from .game_matches_init_db import create_game_matches_schema, create_game_matches_filter_indexes
+from .search_index import rebuild_search_documents
+from .data_versions import create_data_versions_schema
+from .trigram_index import create_trigram_schema
+from .spelling import create_spelling_schema, create_spelling_changes_schema
+from .result_cache import create_search_cache_schema, create_search_cache_size_schema
+from .optimized_pagination import create_keyset_indexes
+from .match_times import create_match_ts_schema
+from .tournament_catalog import create_tournament_catalog_schema
+from .match_keys import create_match_key_schema
+from .ewc_standings import create_ewc_standings_schema, create_standings_history_schema, import_legacy_standings
+from .page_revisions import create_page_revisions_schema, import_legacy_hash_files
+
+logger = logging.getLogger(__name__)
+
+
+def add_column_if_missing(cursor, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists"""
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _baseline(cursor):
+    create_core_schema(cursor)
+    create_game_teams_schema(cursor)
+
+
+def _url_hash_columns(cursor):
+    # prizes.py and ewc_info.py key their rows on url_hash, which the
+    # original DDL never declared
+    for table in ('prize_distribution', 'ewc_info'):
+        add_column_if_missing(cursor, table, 'url_hash', 'TEXT')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_url_hash ON {table}(url_hash)')
+
+
+def _matches_content_hash(cursor):
+    # save_matches_to_db diffs each game's rows by uid + content_hash
+    add_column_if_missing(cursor, 'matches', 'content_hash', 'TEXT')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_game ON matches(game)')
+
+
+def _transfers_incremental_ingest(cursor):
+    # sync_transfers reads a game's (unique_id, hash_value) pairs, and only
+    # changes to indexed columns should reach transfers_fts on update
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_transfers_game ON transfers(game)')
+    cursor.execute('DROP TRIGGER IF EXISTS transfers_au')
+    cursor.execute('''
+        CREATE TRIGGER transfers_au
+        AFTER UPDATE OF game, player_name, old_team_name, new_team_name ON transfers
+        WHEN old.game IS NOT new.game
+          OR old.player_name IS NOT new.player_name
+          OR old.old_team_name IS NOT new.old_team_name
+          OR old.new_team_name IS NOT new.new_team_name
+        BEGIN
+            INSERT INTO transfers_fts(transfers_fts, rowid, game, player_name, old_team_name, new_team_name) 
+            VALUES('delete', old.id, old.game, old.player_name, old.old_team_name, old.new_team_name);
+            INSERT INTO transfers_fts(rowid, game, player_name, old_team_name, new_team_name) 
+            VALUES (new.id, new.game, new.player_name, new.old_team_name, new.new_team_name);
+        END
+    ''')
+
+
+def _unified_search_index(cursor):
+    # One search_documents index, fed by triggers generated from
+    # search_index.SEARCHABLE, replaces the per-table *_fts tables
+    for table in ('news', 'games', 'prize_distribution', 'ewc_info', 'transfers'):
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {table}_{suffix}')
+    for table in ('news', 'games', 'prize_distribution', 'ewc_info', 'transfers',
+                  'ewc_teams_players', 'player_information', 'team_information'):
+        cursor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+    rebuild_search_documents(cursor)
+
+
+def _trigram_filters(cursor):
+    create_trigram_schema(cursor)
+    # get_teams loads the full rows of each page's team names
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_game_teams_team_name ON game_teams(team_name)')
+
+
+# Ordered (version, name, step) entries. Only ever append: a step runs once
+# per database, inside the same transaction that records its version.
+MIGRATIONS = [
+    (1, 'baseline schema', _baseline),
+    (2, 'url_hash columns for prize_distribution and ewc_info', _url_hash_columns),
+    (3, 'game matches storage', create_game_matches_schema),
+    (4, 'content_hash for diff-based matches ingestion', _matches_content_hash),
+    (5, 'incremental transfers ingestion', _transfers_incremental_ingest),
+    (6, 'unified search_documents index', _unified_search_index),
+    (7, 'per-table data version counters', create_data_versions_schema),
+    (8, 'trigram indexes for substring filters', _trigram_filters),
+    (9, 'symmetric delete spelling index', create_spelling_schema),
+    (10, 'shared search result cache', create_search_cache_schema),
+    (11, 'composite indexes for keyset pagination', create_keyset_indexes),
+    (12, 'match_ts_utc column for day filters', create_match_ts_schema),
+    (13, 'tournament catalog for the matches dashboard', create_tournament_catalog_schema),
+    (14, 'match_key column for deduplicated dashboard ingest', create_match_key_schema),
+    (15, 'covering indexes for game matches filters', create_game_matches_filter_indexes),
+    (16, 'ewc_standings snapshots instead of the standings JSON file', create_ewc_standings_schema),
+    (17, 'per-team standings history arrays', create_standings_history_schema),
+    (18, 'page_revisions registry instead of the hash files', create_page_revisions_schema),
+    (19, 'spelling index fed from logged search document changes', create_spelling_changes_schema),
+    (20, 'search_cache entry counter', create_search_cache_size_schema),
+    (21, 'keyset indexes for the transfer team sorts', create_keyset_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Files the app kept in its working directory before these tables existed,
+# imported once, right after the migration that creates the table they
+# moved to. The migrations themselves never read files.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGACY_IMPORTS = {
+    16: import_legacy_standings,
+    18: import_legacy_hash_files,
+}
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration, or 0 for an unversioned database"""
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(legacy_dir=PROJECT_ROOT):
+    """
+    Bring the schema up to LATEST_VERSION.
+
+    When the database is already current this is a single SELECT and no DDL
+    runs, so booting extra workers never takes the write lock. legacy_dir
+    is where LEGACY_IMPORTS look for the old files; None skips them, for
+    databases that should start empty.
+    Returns the number of migrations applied.
+    """
+    conn = get_connection()
+    try:
+        if get_schema_version(conn) >= LATEST_VERSION:
+            return 0
+
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # Another worker may have finished migrating while we waited for the lock
+        current = get_schema_version(conn)
+
+        cursor = conn.cursor()
+        applied = 0
+        for version, name, step in MIGRATIONS:
+            if version <= current:
+                continue
+            step(cursor)
+            if legacy_dir is not None and version in LEGACY_IMPORTS:
+                LEGACY_IMPORTS[version](cursor, legacy_dir)
+            cursor.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)', (version, name))
+            logger.info(f"Applied migration {version}: {name}")
+            applied += 1
+
+        conn.commit()
+        logger.info(f"Database schema at version {LATEST_VERSION}")
+        return applied
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Database migration error: {str(e)}")
+        raise
+    finally:
+        conn.close()
@@ -3,6 +3,9 @@ import logging
 from flask import request  # Added import
 from datetime import datetime
 from app.db import get_connection
+from app.trigram_index import substring_filter
+from app.optimized_pagination import KeysetPagination
+from app.spelling import apply_spelling_changes
 from app.utils import save_uploaded_file, is_valid_url, is_valid_thumbnail, sanitize_input, allowed_file
 
 logger = logging.getLogger(__name__)
@@ -46,8 +49,9 @@ def create_news_item(title, writer, description, thumbnail_url, thumbnail_file,
             INSERT INTO news (title, description, writer, thumbnail_url, news_link)
             VALUES (?, ?, ?, ?, ?)
         ''', (title, description, writer, final_thumbnail_url, news_link))
-        conn.commit()
         news_id = cursor.lastrowid
+        apply_spelling_changes(cursor)
+        conn.commit()
         return {"message": "News created successfully", "id": news_id}
     except sqlite3.Error as e:
         logger.error(f"Database error: {str(e)}")
@@ -113,6 +117,7 @@ def update_news_item(id, title, description, writer, thumbnail_url,
         params = list(update_data.values()) + [id]
 
         cursor.execute(query, params)
+        apply_spelling_changes(cursor)
         conn.commit()
         return {"message": "News updated successfully"}
     except sqlite3.Error as e:
@@ -122,12 +127,32 @@ def update_news_item(id, title, description, writer, thumbnail_url,
         conn.close()
 
 
+def _news_item(row):
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'description': row['description'],
+        'writer': row['writer'],
+        'thumbnail_url': row['thumbnail_url'] or '',
+        'news_link': row['news_link'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at']
+    }
+
+
 def get_news_items(page=1,
                    per_page=10,
                    writer='',
                    search='',
-                   sort='created_at'):
-    """Retrieve paginated news items with filtering and sorting."""
+                   sort='created_at',
+                   cursor=None):
+    """
+    Retrieve paginated news items with filtering and sorting.
+
+    Passing cursor (empty for the first page) switches from page numbers to
+    keyset pagination over (sort, id); the total is only counted on the
+    first page.
+    """
     page = max(1, page)
     per_page = max(1, min(100, per_page))
     if sort not in ('created_at', 'title'):
@@ -135,46 +160,53 @@ def get_news_items(page=1,
 
     conn = get_connection()
     try:
-        cursor = conn.cursor()
-        query = '''SELECT id, title, description, writer, thumbnail_url, news_link, created_at, updated_at 
-                   FROM news WHERE 1=1'''
+        cursor_obj = conn.cursor()
+        columns = 'id, title, description, writer, thumbnail_url, news_link, created_at, updated_at'
+        query = f'SELECT {columns} FROM news WHERE 1=1'
         params = []
 
+        filters = ''
+        filter_params = []
         if writer:
-            query += ' AND writer LIKE ?'
-            params.append(f'%{writer}%')
+            sql, values = substring_filter('news', ['writer'], writer)
+            filters += f' AND {sql}'
+            filter_params.extend(values)
 
         if search:
-            query += ' AND (title LIKE ? OR description LIKE ?)'
-            params.extend([f'%{search}%', f'%{search}%'])
+            sql, values = substring_filter('news', ['title', 'description'], search)
+            filters += f' AND {sql}'
+            filter_params.extend(values)
+
+        count_query = 'SELECT COUNT(*) FROM news WHERE 1=1' + filters
+
+        if cursor is not None:
+            paginator = KeysetPagination('news', sort, 'DESC', columns)
+            result = paginator.paginate(cursor_obj, '1=1' + filters, filter_params, per_page, cursor)
+            total = None
+            if not cursor:
+                cursor_obj.execute(count_query, filter_params)
+                total = cursor_obj.fetchone()[0]
+            return {
+                'news': [_news_item(row) for row in result['data']],
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': result['has_next'],
+                    'next_cursor': result['next_cursor'],
+                    'total': total
+                }
+            }
 
-        query += f' ORDER BY {sort} DESC LIMIT ? OFFSET ?'
+        query += filters
+        params.extend(filter_params)
+        query += f' ORDER BY {sort} DESC, id DESC LIMIT ? OFFSET ?'
         params.extend([per_page, (page - 1) * per_page])
 
-        cursor.execute(query, params)
-        news_items = [{
-            'id': row[0],
-            'title': row[1],
-            'description': row[2],
-            'writer': row[3],
-            'thumbnail_url': row[4] or '',
-            'news_link': row[5],
-            'created_at': row[6],
-            'updated_at': row[7]
-        } for row in cursor.fetchall()]
+        cursor_obj.execute(query, params)
+        news_items = [_news_item(row) for row in cursor_obj.fetchall()]
 
         # Get total count
-        count_query = 'SELECT COUNT(*) FROM news WHERE 1=1'
-        count_params = []
-        if writer:
-            count_query += ' AND writer LIKE ?'
-            count_params.append(f'%{writer}%')
-        if search:
-            count_query += ' AND (title LIKE ? OR description LIKE ?)'
-            count_params.extend([f'%{search}%', f'%{search}%'])
-
-        cursor.execute(count_query, count_params)
-        total = cursor.fetchone()[0]
+        cursor_obj.execute(count_query, filter_params)
+        total = cursor_obj.fetchone()[0]
 
         return {
             'news': news_items,
@@ -233,6 +265,7 @@ def delete_news_item(id):
             raise ValueError("News item not found")
 
         cursor.execute('DELETE FROM news WHERE id = ?', (id, ))
+        apply_spelling_changes(cursor)
         conn.commit()
         return {"message": "News deleted successfully"}
     except sqlite3.Error as e:
@@ -249,6 +282,7 @@ def delete_all_news_items():
     try:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM news')
+        apply_spelling_changes(cursor)
         conn.commit()
         reset_db_sequence()
         return {
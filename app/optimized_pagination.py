@@ -101,6 +101,107 @@ class CursorPagination:
         finally:
             conn.close()
 
+class KeysetPagination:
+    """
+    Cursor pagination over (sort_column, id), for sort columns that are not
+    unique. Pages are read from a (sort_column, id) index with a row-value
+    comparison, so a deep page costs the same as the first one.
+
+    SQLite sorts NULLs first ascending and last descending; rows with a NULL
+    sort value are paged as their own segment (by id) so the keyset
+    predicates stay index range scans.
+    """
+
+    def __init__(self, table_name, sort_column='id', order_direction='ASC', columns='*'):
+        self.table_name = table_name
+        self.sort_column = sort_column
+        self.order_direction = 'DESC' if order_direction.upper() == 'DESC' else 'ASC'
+        self.columns = columns
+        self.op = '<' if self.order_direction == 'DESC' else '>'
+
+    def encode_cursor(self, row):
+        """Opaque cursor pointing just after row"""
+        cursor_data = {'sort': self.sort_column, 'direction': self.order_direction, 'id': row['id']}
+        if self.sort_column != 'id':
+            cursor_data['value'] = row[self.sort_column]
+        cursor_json = json.dumps(cursor_data)
+        return base64.urlsafe_b64encode(cursor_json.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return the cursor's data; ValueError if it is malformed or from another ordering"""
+        try:
+            cursor_json = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            cursor_data = json.loads(cursor_json)
+            valid = (cursor_data['sort'] == self.sort_column
+                     and cursor_data['direction'] == self.order_direction
+                     and isinstance(cursor_data['id'], int)
+                     and (self.sort_column == 'id' or 'value' in cursor_data))
+        except (ValueError, KeyError, TypeError):
+            valid = False
+        if not valid:
+            raise ValueError("Invalid cursor")
+        return cursor_data
+
+    def _segments(self):
+        """(name, condition, keyset) for each stretch of the ordering, in order"""
+        if self.sort_column == 'id':
+            return [('value', '1=1', f"id {self.op} ?")]
+        non_null = ('value', f"{self.sort_column} IS NOT NULL", f"({self.sort_column}, id) {self.op} (?, ?)")
+        null = ('null', f"{self.sort_column} IS NULL", f"id {self.op} ?")
+        return [null, non_null] if self.order_direction == 'ASC' else [non_null, null]
+
+    def paginate(self, db_cursor, where_clause='1=1', params=None, limit=10, cursor=None):
+        """
+        Return {'data', 'has_next', 'next_cursor', 'limit'} for the page
+        after cursor (the first page when cursor is empty).
+
+        Args:
+            db_cursor: sqlite3 cursor to run the queries on
+            where_clause: Filter conditions, without WHERE
+            params: Parameters for where_clause
+            limit: Number of items per page
+            cursor: next_cursor of the previous page
+        """
+        params = list(params or [])
+        cursor_data = self.decode_cursor(cursor) if cursor else None
+        segments = self._segments()
+
+        start = 0
+        if cursor_data:
+            segment = 'null' if cursor_data.get('value', 0) is None else 'value'
+            start = [name for name, _, _ in segments].index(segment)
+
+        rows = []
+        order = f"{self.sort_column} {self.order_direction}, id {self.order_direction}"
+        if self.sort_column == 'id':
+            order = f"id {self.order_direction}"
+        for index in range(start, len(segments)):
+            name, condition, keyset = segments[index]
+            conditions, values = [f"({where_clause})", condition], list(params)
+            if cursor_data and index == start:
+                conditions.append(keyset)
+                if name == 'value' and self.sort_column != 'id':
+                    values.append(cursor_data['value'])
+                values.append(cursor_data['id'])
+            db_cursor.execute(f'''
+                SELECT {self.columns} FROM {self.table_name}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY {order}
+                LIMIT ?
+            ''', values + [limit + 1 - len(rows)])
+            rows.extend(dict(row) for row in db_cursor.fetchall())
+            if len(rows) > limit:
+                break
+
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'data': rows,
+            'has_next': has_next,
+            'next_cursor': self.encode_cursor(rows[-1]) if has_next else None,
+            'limit': limit
+        }
+
 class OptimizedOffsetPagination:
     """Optimized offset-based pagination with performance improvements"""
     
@@ -213,6 +314,24 @@ class OptimizedOffsetPagination:
         finally:
             conn.close()
 
+# Composite (sort column, id) indexes behind the KeysetPagination orderings
+# used by the news and transfers list endpoints
+KEYSET_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_news_created_at_id ON news(created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_news_title_id ON news(title, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_date_id ON transfers(date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_game_date_id ON transfers(game, date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_player_name_id ON transfers(player_name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_old_team_name_id ON transfers(old_team_name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_new_team_name_id ON transfers(new_team_name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_created_at_id ON transfers(created_at, id)",
+)
+
+def create_keyset_indexes(cursor):
+    """Create the indexes KeysetPagination relies on"""
+    for index_sql in KEYSET_INDEXES:
+        cursor.execute(index_sql)
+
 def create_pagination_indexes():
     """Create indexes to optimize pagination queries"""
     try:
@@ -0,0 +1,272 @@
+import os
+import glob
+import time
+import hashlib
+import logging
+
+from .db import get_connection
+from .liquipedia_client import BASE_URL, RateLimitExceeded, get_client
+from .response_cache import CacheMiss, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+# Liquipedia:Matches renders match data kept on other pages, so its
+# revision can stay put while the output changes: refetch at least this often
+MATCHES_MAX_AGE = 300
+
+# Hash files the scrapers kept before page_revisions: (path pattern,
+# consumer, wiki for the file, page)
+LEGACY_HASH_FILES = (
+    ('ewc_2025_games_hash.txt', 'games', lambda path: 'esports', 'Esports_World_Cup/2025'),
+    ('*_transfer_hash.txt', 'transfers_file', lambda path: os.path.basename(path)[:-len('_transfer_hash.txt')],
+     'Main_Page'),
+)
+
+
+def create_page_revisions_schema(cursor):
+    """
+    page_revisions remembers, per consumer of a Liquipedia page, the
+    revision and rendered-HTML hash it last stored. Consumers are separate
+    because /matches and /game_matches both read Liquipedia:Matches into
+    different tables.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS page_revisions (
+            consumer TEXT NOT NULL,
+            wiki TEXT NOT NULL,
+            page TEXT NOT NULL,
+            lastrevid INTEGER,
+            touched TEXT,
+            content_hash TEXT,
+            fetched_at REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (consumer, wiki, page)
+        ) WITHOUT ROWID
+    ''')
+
+
+def import_legacy_hash_files(cursor, directory):
+    """Seed page_revisions with the content hashes the scrapers kept in directory"""
+    for pattern, consumer, wiki_of_file, page in LEGACY_HASH_FILES:
+        for path in glob.glob(os.path.join(glob.escape(directory), pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                legacy_hash = f.read().strip()
+            if legacy_hash:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO page_revisions (consumer, wiki, page, content_hash)
+                    VALUES (?, ?, ?, ?)
+                ''', (consumer, wiki_of_file(path), page, legacy_hash))
+
+
+def content_hash(html):
+    return hashlib.md5(html.encode('utf-8')).hexdigest()
+
+
+def api_url(wiki):
+    return f"{BASE_URL}/{wiki}/api.php"
+
+
+def _info_params(page):
+    return {'action': 'query', 'prop': 'info', 'titles': page, 'format': 'json', 'formatversion': '2'}
+
+
+def _parse_params(page):
+    return {'action': 'parse', 'page': page, 'format': 'json', 'prop': 'text'}
+
+
+def _page_info(payload):
+    pages = payload.get('query', {}).get('pages', [])
+    if not pages or pages[0].get('missing') or 'lastrevid' not in pages[0]:
+        return None
+    return {'lastrevid': pages[0]['lastrevid'], 'touched': pages[0].get('touched')}
+
+
+def fetch_page_info(wiki, page):
+    """
+    {'lastrevid', 'touched'} of a page from the cheap action=query&prop=info
+    call, or None when it failed or the page does not exist. touched moves
+    when a template the page transcludes changes, not only on edits.
+    In replay mode it is the newest recorded revision.
+
+    RateLimitExceeded is raised rather than read as "unknown": the caller
+    would otherwise go straight on to a full action=parse.
+    """
+    cache = get_response_cache()
+    if cache is not None and cache.replay:
+        return cache.latest_info(wiki, page)
+    try:
+        response = get_client().get(api_url(wiki), params=_info_params(page))
+        response.raise_for_status()
+        return _page_info(response.json())
+    except RateLimitExceeded:
+        raise
+    except Exception as e:
+        logger.warning(f"Revision check of {wiki}/{page} failed: {e}")
+        return None
+
+
+async def fetch_page_info_async(client, wiki, page):
+    """fetch_page_info through an AsyncLiquipediaClient"""
+    cache = get_response_cache()
+    if cache is not None and cache.replay:
+        return cache.latest_info(wiki, page)
+    try:
+        response = await client.get(api_url(wiki), params=_info_params(page))
+        response.raise_for_status()
+        return _page_info(response.json())
+    except RateLimitExceeded:
+        raise
+    except Exception as e:
+        logger.warning(f"Revision check of {wiki}/{page} failed: {e}")
+        return None
+
+
+def _cached_html(cache, wiki, page, info, max_age):
+    """The cached render for info, None on a miss, CacheMiss in replay mode"""
+    if cache.replay:
+        html = cache.get(wiki, page, info)
+        if html is None:
+            raise CacheMiss(f"{wiki}/{page} was not recorded in {cache.directory}")
+        return html
+    html = cache.get(wiki, page, info, max_age) if info is not None else None
+    if html is not None:
+        logger.debug(f"{wiki}/{page} served from the response cache at revision {info['lastrevid']}")
+    return html
+
+
+def fetch_page_html(wiki, page, info=None, max_age=None):
+    """
+    Rendered HTML of a page through action=parse, or from the response
+    cache when it holds the page's current revision (info, when the caller
+    already queried it). Cached renders older than max_age are refetched.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        if not cache.replay:
+            info = info or fetch_page_info(wiki, page)
+        html = _cached_html(cache, wiki, page, info, max_age)
+        if html is not None:
+            return html
+
+    response = get_client().get(api_url(wiki), params=_parse_params(page))
+    response.raise_for_status()
+    html = response.json()['parse']['text']['*']
+    if cache is not None and info is not None:
+        cache.put(wiki, page, info, html)
+    return html
+
+
+async def fetch_page_html_async(client, wiki, page, info=None, max_age=None):
+    """fetch_page_html through an AsyncLiquipediaClient"""
+    cache = get_response_cache()
+    if cache is not None:
+        if not cache.replay:
+            info = info or await fetch_page_info_async(client, wiki, page)
+        html = _cached_html(cache, wiki, page, info, max_age)
+        if html is not None:
+            return html
+
+    response = await client.get(api_url(wiki), params=_parse_params(page))
+    response.raise_for_status()
+    html = response.json()['parse']['text']['*']
+    if cache is not None and info is not None:
+        cache.put(wiki, page, info, html)
+    return html
+
+
+class PageRevision:
+    """
+    One consumer's view of a page: what page_revisions has stored and what
+    the wiki reports now. Call record() once the consumer has stored what
+    it parsed, so a failed store is retried on the next check.
+    """
+
+    def __init__(self, consumer, wiki, page, info=None, stored=None, max_age=None):
+        self.consumer = consumer
+        self.wiki = wiki
+        self.page = page
+        self.info = info
+        self.stored = stored
+        self.max_age = max_age
+        self.html_hash = None
+
+    @property
+    def unchanged(self):
+        """True when the page is at the stored revision, so neither parse nor store is needed"""
+        if self.info is None or self.stored is None or self.stored['lastrevid'] is None:
+            return False
+        if self.max_age is not None and time.time() - self.stored['fetched_at'] > self.max_age:
+            return False
+        return (self.info['lastrevid'] == self.stored['lastrevid']
+                and self.info['touched'] == self.stored['touched'])
+
+    def same_content(self, html):
+        """
+        Whether freshly downloaded HTML is what was stored last time, as when
+        a purge bumps touched without changing the output
+        """
+        self.html_hash = content_hash(html)
+        return self.stored is not None and self.stored['content_hash'] == self.html_hash
+
+    def record(self):
+        """Store the revision seen by check_page and the hash of the HTML parsed since"""
+        conn = get_connection()
+        try:
+            conn.execute('''
+                INSERT INTO page_revisions (consumer, wiki, page, lastrevid, touched, content_hash, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (consumer, wiki, page) DO UPDATE SET
+                    lastrevid = excluded.lastrevid,
+                    touched = excluded.touched,
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    fetched_at = excluded.fetched_at
+            ''', (self.consumer, self.wiki, self.page,
+                  self.info['lastrevid'] if self.info else None,
+                  self.info['touched'] if self.info else None,
+                  self.html_hash, time.time()))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def get_stored_revision(consumer, wiki, page):
+    conn = get_connection()
+    try:
+        row = conn.execute('''
+            SELECT lastrevid, touched, content_hash, fetched_at FROM page_revisions
+            WHERE consumer = ? AND wiki = ? AND page = ?
+        ''', (consumer, wiki, page)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def check_page(consumer, wiki, page, max_age=None):
+    """
+    The PageRevision of a page for one consumer. max_age (seconds) forces a
+    full fetch that long after the last one, for pages whose output changes
+    without touched moving. RateLimitExceeded propagates, so a throttled
+    check skips the refresh instead of downloading the page.
+    """
+    revision = PageRevision(consumer, wiki, page, fetch_page_info(wiki, page),
+                            get_stored_revision(consumer, wiki, page), max_age)
+    if revision.unchanged:
+        logger.info(f"{wiki}/{page} unchanged at revision {revision.info['lastrevid']} for {consumer}")
+    return revision
+
+
+def fetch_if_changed(consumer, wiki, page, parse, max_age=None):
+    """
+    (parse(html), revision) when the page changed since the consumer last
+    recorded it, or (None, revision) when it did not: then action=parse is
+    skipped if the revision matches, and parse() if the HTML does. The
+    caller records the revision after storing what parse() returned.
+    """
+    revision = check_page(consumer, wiki, page, max_age)
+    if revision.unchanged:
+        return None, revision
+    html = fetch_page_html(wiki, page, revision.info, max_age)
+    if revision.same_content(html):
+        logger.info(f"{wiki}/{page} re-rendered without changes for {consumer}")
+        revision.record()
+        return None, revision
+    return parse(html), revision
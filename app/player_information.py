@@ -1,50 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
+from app.html_parsing import make_soup
 import json
 from datetime import datetime
-import random
-import time
-
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.1 Safari/605.1.15',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; rv:125.0) Gecko/20100101 Firefox/125.0'
-]
-
-session = requests.Session()
-session.headers.update({
-    'User-Agent': random.choice(USER_AGENTS),
-    'Referer': 'https://www.google.com/',
-    'Accept-Language': 'en-US,en;q=0.9',
-    'DNT': '1',
-    'Cache-Control': 'no-cache',
-    'Pragma': 'no-cache',
-    'X-Requested-With': 'XMLHttpRequest'
-})
+from app.page_revisions import fetch_page_html
 
 BASE_URL = "https://liquipedia.net"
 
 def get_html_from_api(game: str, page: str) -> str | None:
     """Fetch HTML content from Liquipedia API for a given game and page."""
-    api_url = f"{BASE_URL}/{game}/api.php"
-    params = {
-        'action': 'parse',
-        'page': page,
-        'format': 'json',
-        'prop': 'text'
-    }
     try:
-        time.sleep(random.uniform(1, 3))
-        response = session.get(api_url, params=params, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            return data['parse']['text']['*']
-        else:
-            print(f"HTTP {response.status_code}: Failed to fetch {page} for {game}")
-            return None
+        return fetch_page_html(game, page)
     except Exception as e:
-        print(f"Exception during request: {e}")
+        print(f"Failed to fetch {page} for {game}: {e}")
         return None
 
 def get_player_info(game: str, player_page_name: str) -> tuple[dict, str]:
@@ -53,7 +19,7 @@ def get_player_info(game: str, player_page_name: str) -> tuple[dict, str]:
     if not html:
         return {}, player_page_name
 
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = make_soup(html)
     data_card = {}
 
     info_box = soup.select_one('div.fo-nttax-infobox')
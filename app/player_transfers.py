@@ -1,45 +1,21 @@
 import json
-import requests
-from bs4 import BeautifulSoup
+from .html_parsing import make_soup
 from datetime import datetime
 import hashlib
-import os
 import logging
 from .db import get_connection
+from .page_revisions import fetch_if_changed
+from .trigram_index import substring_filter
+from .optimized_pagination import KeysetPagination
+from .spelling import apply_spelling_changes
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = 'https://liquipedia.net'
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-}
-
-def get_main_page_html_via_api(game_name):
-    """
-    Get the HTML content for the main page using MediaWiki API (prop=text).
-    """
-    api_url = f"{BASE_URL}/{game_name}/api.php"
-    params = {
-        "action": "parse",
-        "page": "Main_Page",
-        "format": "json",
-        "prop": "text"
-    }
-    try:
-        response = requests.get(api_url, headers=HEADERS, params=params, timeout=10)
-        if response.status_code == 200:
-            return response.json().get("parse", {}).get("text", {}).get("*", "")
-    except Exception as e:
-        logger.error(f"API fetch failed: {e}")
-    return None
-
-def calculate_hash(text):
-    """Calculate MD5 hash of text"""
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
 
 def parse_transfer_html(html):
     """Parse transfer HTML and extract transfer data"""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = make_soup(html, 'transfers')
     table = soup.select_one('div.divTable.mainpage-transfer.Ref')
     if not table:
         logger.error("No transfer table found in HTML.")
@@ -96,60 +72,100 @@ def parse_transfer_html(html):
             continue
     return data
 
-def store_transfers_in_db(game: str, transfers_data: list, hash_value: str):
+TRANSFER_COLUMNS = (
+    "game", "date", "player_name", "player_flag",
+    "old_team_name", "old_team_logo_light", "old_team_logo_dark",
+    "new_team_name", "new_team_logo_light", "new_team_logo_dark"
+)
+
+def build_transfer_rows(game: str, transfers_data: list):
+    """
+    Flatten parsed transfers into {unique_id: (hash_value, row)}, one row per
+    player, where row follows TRANSFER_COLUMNS and hash_value is its digest
+    """
+    rows = {}
+    for transfer in transfers_data:
+        date = transfer.get('Date', '')
+        old_team = transfer.get('OldTeam', {})
+        new_team = transfer.get('NewTeam', {})
+        players = transfer.get('Players', [])
+
+        for i, player in enumerate(players):
+            unique_id = f"{date}_{player.get('Name', 'unknown')}_{i}"
+            row = (
+                game,
+                date,
+                player.get('Name', ''),
+                player.get('Flag', ''),
+                old_team.get('Name', ''),
+                old_team.get('Logo_Light', ''),
+                old_team.get('Logo_Dark', ''),
+                new_team.get('Name', ''),
+                new_team.get('Logo_Light', ''),
+                new_team.get('Logo_Dark', '')
+            )
+            rows[unique_id] = (hashlib.md5(repr(row).encode('utf-8')).hexdigest(), row)
+    return rows
+
+def sync_transfers(cursor, game: str, rows: dict):
+    """
+    Make the stored transfers of a game match rows (see build_transfer_rows).
+
+    Unchanged rows are not touched, so they keep their created_at and never
+    fire the transfers_fts triggers. Returns inserted/updated/deleted/unchanged counts.
+    """
+    cursor.execute("SELECT unique_id, hash_value FROM transfers WHERE game = ?", (game,))
+    existing = {row[0]: row[1] for row in cursor.fetchall()}
+
+    inserts, updates = [], []
+    for unique_id, (hash_value, row) in rows.items():
+        if unique_id not in existing:
+            inserts.append((unique_id, hash_value) + row)
+        elif existing[unique_id] != hash_value:
+            updates.append(row + (hash_value, unique_id))
+    deletes = [(unique_id,) for unique_id in existing.keys() - rows.keys()]
+
+    cursor.executemany(f"""
+        INSERT INTO transfers (unique_id, hash_value, {', '.join(TRANSFER_COLUMNS)})
+        VALUES ({', '.join(['?'] * (len(TRANSFER_COLUMNS) + 2))})
+    """, inserts)
+    cursor.executemany(f"""
+        UPDATE transfers
+        SET {', '.join(f'{column} = ?' for column in TRANSFER_COLUMNS)},
+            hash_value = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE unique_id = ?
+    """, updates)
+    cursor.executemany("DELETE FROM transfers WHERE unique_id = ?", deletes)
+
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletes),
+        "unchanged": len(rows) - len(inserts) - len(updates)
+    }
+
+def store_transfers_in_db(game: str, transfers_data: list):
     """
     Store transfers data in the transfers table
-    Note: Each transfer entry can have multiple players, so we create one row per player
+    Note: Each transfer entry can have multiple players, so we create one row per player.
+    Returns the change counts, or None if storing failed.
     """
+    rows = build_transfer_rows(game, transfers_data)
     conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        # Clear existing transfers for this game
-        cursor.execute("DELETE FROM transfers WHERE game = ?", (game,))
-        
-        # Insert new transfers
-        for transfer in transfers_data:
-            date = transfer.get('Date', '')
-            old_team = transfer.get('OldTeam', {})
-            new_team = transfer.get('NewTeam', {})
-            players = transfer.get('Players', [])
-            
-            # Create one row per player in the transfer
-            for i, player in enumerate(players):
-                # Create unique ID for each player in the transfer
-                unique_id = f"{date}_{player.get('Name', 'unknown')}_{i}"
-                
-                cursor.execute("""
-                    INSERT INTO transfers (
-                        unique_id, game, date, player_name, player_flag,
-                        old_team_name, old_team_logo_light, old_team_logo_dark,
-                        new_team_name, new_team_logo_light, new_team_logo_dark,
-                        hash_value
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    unique_id,
-                    game,
-                    date,
-                    player.get('Name', ''),
-                    player.get('Flag', ''),
-                    old_team.get('Name', ''),
-                    old_team.get('Logo_Light', ''),
-                    old_team.get('Logo_Dark', ''),
-                    new_team.get('Name', ''),
-                    new_team.get('Logo_Light', ''),
-                    new_team.get('Logo_Dark', ''),
-                    hash_value
-                ))
-        
+        cursor.execute("BEGIN IMMEDIATE")
+        counts = sync_transfers(cursor, game, rows)
+        apply_spelling_changes(cursor)
         conn.commit()
-        logger.info(f"Stored transfers for {game}")
-        return True
+        logger.info(f"Stored transfers for {game}: {counts}")
+        return counts
         
     except Exception as e:
         logger.error(f"Error storing transfers: {str(e)}")
         conn.rollback()
-        return False
+        return None
     finally:
         conn.close()
 
@@ -158,7 +174,6 @@ def update_data_file(game_name):
     Update data file with new transfers (file-based approach)
     """
     filename = f"{game_name.lower()}_transfers.json"
-    hasfile = f"{game_name.lower()}_transfer_hash.txt"
 
     try:
         with open(filename, 'r', encoding='utf-8') as f:
@@ -168,20 +183,16 @@ def update_data_file(game_name):
         old_data = []
         old_ids = set()
 
-    html = get_main_page_html_via_api(game_name)
-    if not html:
-        logger.error("Failed to get HTML from API.")
+    try:
+        new_data, revision = fetch_if_changed('transfers_file', game_name, 'Main_Page', parse_transfer_html)
+    except Exception as e:
+        logger.error(f"Failed to get HTML from API: {e}")
         return
 
-    current_hash = calculate_hash(html)
-    if os.path.exists(hasfile):
-        with open(hasfile, 'r', encoding='utf-8') as f:
-            old_hash = f.read().strip()
-        if current_hash == old_hash:
-            logger.info("No changes detected. Skipping update.")
-            return
+    if new_data is None:
+        logger.info("No changes detected. Skipping update.")
+        return
 
-    new_data = parse_transfer_html(html)
     added = 0
     for entry in new_data:
         if entry['Unique_ID'] not in old_ids:
@@ -191,65 +202,84 @@ def update_data_file(game_name):
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(old_data, f, ensure_ascii=False, indent=2)
 
-    with open(hasfile, 'w', encoding='utf-8') as f:
-        f.write(current_hash)
-
+    revision.record()
     logger.info(f"Updated '{filename}' - New transfers added: {added}")
 
 def fetch_and_store_transfers(game: str):
     """
-    Fetch transfers and store them in database if changed
+    Fetch transfers and store them in database if changed. Main_Page is
+    neither downloaded nor parsed while its revision is the one last stored.
     """
-    html = get_main_page_html_via_api(game)
-    if not html:
-        logger.error(f"Failed to get HTML for {game}")
+    try:
+        transfers_data, revision = fetch_if_changed('transfers', game, 'Main_Page', parse_transfer_html)
+    except Exception as e:
+        logger.error(f"Failed to get HTML for {game}: {e}")
         return {"status": "error", "message": "Failed to fetch transfer data"}
-    
-    # Calculate hash of the HTML content
-    new_hash = calculate_hash(html)
-    
-    # Check if data has changed
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT hash_value FROM transfers 
-        WHERE game = ? 
-        LIMIT 1
-    """, (game,))
-    
-    existing_hash = cursor.fetchone()
-    conn.close()
-    
-    if existing_hash and existing_hash[0] == new_hash:
-        logger.info(f"{game}: no changes detected")
-        return {"status": "no_changes", "message": "No changes detected"}
-    
-    # Parse new data
-    transfers_data = parse_transfer_html(html)
+
+    if transfers_data is None:
+        logger.info(f"{game}: Main_Page unchanged since the last fetch")
+        return {"status": "no_changes", "message": "No changes detected",
+                "revision": revision.info['lastrevid'] if revision.info else None}
+
     if not transfers_data:
         logger.warning(f"{game}: no transfers found")
         return {"status": "no_transfers", "message": "No transfers found"}
     
-    # Store new data
-    if store_transfers_in_db(game, transfers_data, new_hash):
-        transfer_count = sum(len(transfer.get('Players', [])) for transfer in transfers_data)
-        logger.info(f"{game}: {transfer_count} player transfers stored")
-        return {
-            "status": "updated", 
-            "message": f"{transfer_count} player transfers stored successfully",
-            "transfer_count": transfer_count
-        }
-    else:
+    # Store new data; only rows whose hash changed are written
+    counts = store_transfers_in_db(game, transfers_data)
+    if counts is None:
         return {"status": "error", "message": "Failed to store transfers"}
+    revision.record()
+
+    if not (counts["inserted"] or counts["updated"] or counts["deleted"]):
+        logger.info(f"{game}: no changes detected")
+        return {"status": "no_changes", "message": "No changes detected", "changes": counts}
+
+    transfer_count = sum(len(transfer.get('Players', [])) for transfer in transfers_data)
+    logger.info(f"{game}: {transfer_count} player transfers stored")
+    return {
+        "status": "updated", 
+        "message": f"{transfer_count} player transfers stored successfully",
+        "transfer_count": transfer_count,
+        "changes": counts
+    }
+
+def _transfer_item(transfer):
+    """API shape of a transfers row"""
+    return {
+        'id': transfer['id'],
+        'unique_id': transfer['unique_id'],
+        'game': transfer['game'],
+        'date': transfer['date'],
+        'player': {
+            'name': transfer['player_name'],
+            'flag': transfer['player_flag']
+        },
+        'old_team': {
+            'name': transfer['old_team_name'],
+            'logo_light': transfer['old_team_logo_light'],
+            'logo_dark': transfer['old_team_logo_dark']
+        },
+        'new_team': {
+            'name': transfer['new_team_name'],
+            'logo_light': transfer['new_team_logo_light'],
+            'logo_dark': transfer['new_team_logo_dark']
+        },
+        'created_at': transfer['created_at'],
+        'updated_at': transfer['updated_at']
+    }
 
 def get_transfers_from_db(game=None, player_name=None, old_team=None, new_team=None, 
                          date_from=None, date_to=None, page=1, per_page=20, 
-                         sort_by='date', sort_order='desc'):
+                         sort_by='date', sort_order='desc', cursor=None):
     """
     Retrieve transfers from database with filters and pagination
+
+    Passing cursor (empty for the first page) switches from page numbers to
+    keyset pagination over (sort_by, id); the total is only counted on the
+    first page.
     """
     conn = get_connection()
-    cursor = conn.cursor()
     
     # Build WHERE clause
     where_conditions = []
@@ -259,17 +289,12 @@ def get_transfers_from_db(game=None, player_name=None, old_team=None, new_team=N
         where_conditions.append("game = ?")
         params.append(game)
     
-    if player_name:
-        where_conditions.append("player_name LIKE ?")
-        params.append(f"%{player_name}%")
-    
-    if old_team:
-        where_conditions.append("old_team_name LIKE ?")
-        params.append(f"%{old_team}%")
-    
-    if new_team:
-        where_conditions.append("new_team_name LIKE ?")
-        params.append(f"%{new_team}%")
+    # Substring filters go through transfers_trigram for patterns of 3+ characters
+    for column, value in (('player_name', player_name), ('old_team_name', old_team), ('new_team_name', new_team)):
+        if value:
+            condition, values = substring_filter('transfers', [column], value)
+            where_conditions.append(condition)
+            params.extend(values)
     
     if date_from:
         where_conditions.append("date >= ?")
@@ -289,10 +314,31 @@ def get_transfers_from_db(game=None, player_name=None, old_team=None, new_team=N
     if sort_order.lower() not in ['asc', 'desc']:
         sort_order = 'desc'
     
-    # Get total count
     count_query = f"SELECT COUNT(*) FROM transfers WHERE {where_clause}"
-    cursor.execute(count_query, params)
-    total_count = cursor.fetchone()[0]
+    
+    if cursor is not None:
+        try:
+            paginator = KeysetPagination('transfers', sort_by, sort_order)
+            page_result = paginator.paginate(conn.cursor(), where_clause, params, per_page, cursor)
+            total_count = None
+            if not cursor:
+                total_count = conn.execute(count_query, params).fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            'transfers': [_transfer_item(transfer) for transfer in page_result['data']],
+            'pagination': {
+                'per_page': per_page,
+                'total_count': total_count,
+                'has_next': page_result['has_next'],
+                'next_cursor': page_result['next_cursor']
+            }
+        }
+    
+    # Get total count
+    db_cursor = conn.cursor()
+    db_cursor.execute(count_query, params)
+    total_count = db_cursor.fetchone()[0]
     
     # Calculate pagination
     offset = (page - 1) * per_page
@@ -306,36 +352,12 @@ def get_transfers_from_db(game=None, player_name=None, old_team=None, new_team=N
         LIMIT ? OFFSET ?
     """
     
-    cursor.execute(query, params + [per_page, offset])
-    transfers = cursor.fetchall()
+    db_cursor.execute(query, params + [per_page, offset])
+    transfers = db_cursor.fetchall()
     
     conn.close()
     
-    # Convert to list of dictionaries
-    transfers_list = []
-    for transfer in transfers:
-        transfers_list.append({
-            'id': transfer['id'],
-            'unique_id': transfer['unique_id'],
-            'game': transfer['game'],
-            'date': transfer['date'],
-            'player': {
-                'name': transfer['player_name'],
-                'flag': transfer['player_flag']
-            },
-            'old_team': {
-                'name': transfer['old_team_name'],
-                'logo_light': transfer['old_team_logo_light'],
-                'logo_dark': transfer['old_team_logo_dark']
-            },
-            'new_team': {
-                'name': transfer['new_team_name'],
-                'logo_light': transfer['new_team_logo_light'],
-                'logo_dark': transfer['new_team_logo_dark']
-            },
-            'created_at': transfer['created_at'],
-            'updated_at': transfer['updated_at']
-        })
+    transfers_list = [_transfer_item(transfer) for transfer in transfers]
     
     return {
         'transfers': transfers_list,
@@ -414,6 +436,7 @@ def delete_transfers(game=None):
             cursor.execute("DELETE FROM transfers")
         
         deleted_count = cursor.rowcount
+        apply_spelling_changes(cursor)
         conn.commit()
         logger.info(f"Deleted {deleted_count} transfers")
         return {"status": "success", "deleted_count": deleted_count}
@@ -433,40 +456,8 @@ def import_transfers_from_json(game: str, json_data: list):
     cursor = conn.cursor()
     
     try:
-        # Clear existing transfers for this game
-        cursor.execute("DELETE FROM transfers WHERE game = ?", (game,))
-        
-        # Insert transfers from JSON
-        for transfer in json_data:
-            date = transfer.get('Date', '')
-            old_team = transfer.get('OldTeam', {})
-            new_team = transfer.get('NewTeam', {})
-            players = transfer.get('Players', [])
-            
-            # Create one row per player in the transfer
-            for i, player in enumerate(players):
-                # Create unique ID for each player in the transfer
-                unique_id = f"{date}_{player.get('Name', 'unknown')}_{i}"
-                
-                cursor.execute("""
-                    INSERT INTO transfers (
-                        unique_id, game, date, player_name, player_flag,
-                        old_team_name, old_team_logo_light, old_team_logo_dark,
-                        new_team_name, new_team_logo_light, new_team_logo_dark
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    unique_id,
-                    game,
-                    date,
-                    player.get('Name', ''),
-                    player.get('Flag', ''),
-                    old_team.get('Name', ''),
-                    old_team.get('Logo_Light', ''),
-                    old_team.get('Logo_Dark', ''),
-                    new_team.get('Name', ''),
-                    new_team.get('Logo_Light', ''),
-                    new_team.get('Logo_Dark', '')
-                ))
+        cursor.execute("BEGIN IMMEDIATE")
+        counts = sync_transfers(cursor, game, build_transfer_rows(game, json_data))
         
         conn.commit()
         transfer_count = sum(len(transfer.get('Players', [])) for transfer in json_data)
@@ -474,7 +465,8 @@ def import_transfers_from_json(game: str, json_data: list):
         return {
             "status": "success", 
             "message": f"{transfer_count} transfers imported successfully",
-            "transfer_count": transfer_count
+            "transfer_count": transfer_count,
+            "changes": counts
         }
         
     except Exception as e:
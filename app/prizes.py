@@ -1,6 +1,9 @@
 import sqlite3
 import requests
 from bs4 import BeautifulSoup
+from .db import get_connection
+from .liquipedia_client import get_client
+from .spelling import apply_spelling_changes
 import logging
 import hashlib
 
@@ -17,7 +20,7 @@ def get_prize_distribution(live=False, url=None):
 
     if not live:
         try:
-            conn = sqlite3.connect('news.db')
+            conn = get_connection()
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT place, place_logo, prize, participants, logo_team 
@@ -42,12 +45,8 @@ def get_prize_distribution(live=False, url=None):
             logger.error(f"Database error while fetching prize distribution: {str(e)}")
 
     # Fetch from web if no data or live=True
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-    }
-
     try:
-        response = requests.get(URL, headers=headers)
+        response = get_client().get(URL)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -84,21 +83,9 @@ def get_prize_distribution(live=False, url=None):
 
         # Store in DB with url_hash
         try:
-            conn = sqlite3.connect('news.db')
+            conn = get_connection()
             cursor = conn.cursor()
 
-            # Ensure column url_hash exists (run only once safely)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS prize_distribution (
-                    place TEXT,
-                    place_logo TEXT,
-                    prize TEXT,
-                    participants TEXT,
-                    logo_team TEXT,
-                    url_hash TEXT
-                )
-            ''')
-
             cursor.execute('DELETE FROM prize_distribution WHERE url_hash = ?', (url_hash,))
             for item in prize_data:
                 cursor.execute('''
@@ -113,6 +100,7 @@ def get_prize_distribution(live=False, url=None):
                     item['logo_team'],
                     url_hash
                 ))
+            apply_spelling_changes(cursor)
             conn.commit()
             logger.debug("Stored prize distribution in DB")
 
@@ -0,0 +1,203 @@
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# off: every page comes from Liquipedia. cache: rendered pages are kept on
+# disk per (wiki, page, revision) and served again while the revision holds.
+# replay: only recorded pages are served and nothing touches the network, for
+# benchmarks and offline development against a fixture directory.
+CACHE_MODE = os.environ.get("LIQUIPEDIA_CACHE", "off").lower()
+CACHE_DIR = os.environ.get("LIQUIPEDIA_CACHE_DIR", ".liquipedia_cache")
+CACHE_MAX_BYTES = int(float(os.environ.get("LIQUIPEDIA_CACHE_MAX_MB", 256)) * 1024 * 1024)
+MODES = ("off", "cache", "replay")
+
+
+class CacheMiss(requests.RequestException):
+    """Replay mode was asked for a page that was never recorded"""
+
+
+class ResponseCache:
+    """
+    Rendered Liquipedia pages on disk. Bodies are gzipped and stored once
+    per SHA-256 of their content under objects/, so a purge that renders
+    the same HTML under a new touched costs no space; index.db maps
+    (wiki, page, lastrevid, touched) to a body and evicts the least
+    recently used entries once the bodies exceed max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, replay=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.replay = replay
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    wiki TEXT NOT NULL,
+                    page TEXT NOT NULL,
+                    lastrevid INTEGER NOT NULL,
+                    touched TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (wiki, page, lastrevid, touched)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_used_at ON entries(used_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_digest ON entries(digest)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.directory, "index.db"), timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.gz")
+
+    def latest_info(self, wiki, page):
+        """{'lastrevid', 'touched'} of the newest recorded render of a page, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                SELECT lastrevid, touched FROM entries WHERE wiki = ? AND page = ?
+                ORDER BY lastrevid DESC, stored_at DESC LIMIT 1
+            ''', (wiki, page)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def get(self, wiki, page, info=None, max_age=None):
+        """
+        The HTML recorded for a revision, the newest one when info is None,
+        or None. Entries older than max_age seconds are not served.
+        """
+        info = info or self.latest_info(wiki, page)
+        if info is None:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                SELECT digest, stored_at FROM entries
+                WHERE wiki = ? AND page = ? AND lastrevid = ? AND touched = ?
+            ''', (wiki, page, info['lastrevid'], info['touched'] or '')).fetchone()
+            if row is None or (max_age is not None and time.time() - row['stored_at'] > max_age):
+                return None
+            try:
+                with open(self._blob_path(row['digest']), 'rb') as f:
+                    html = gzip.decompress(f.read()).decode('utf-8')
+            except OSError:
+                return None
+            if not self.replay:
+                with conn:
+                    conn.execute('''
+                        UPDATE entries SET used_at = ?
+                        WHERE wiki = ? AND page = ? AND lastrevid = ? AND touched = ?
+                    ''', (time.time(), wiki, page, info['lastrevid'], info['touched'] or ''))
+            return html
+        finally:
+            conn.close()
+
+    def put(self, wiki, page, info, html):
+        """Record the HTML of a revision, then evict down to max_bytes"""
+        body = html.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        conn = self._connect()
+        try:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                compressed = gzip.compress(body, 6)
+                # Written aside and renamed, so readers never see half a body
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+                size = len(compressed)
+            else:
+                size = os.path.getsize(path)
+            now = time.time()
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO blobs (digest, size) VALUES (?, ?)', (digest, size))
+                conn.execute('''
+                    INSERT OR REPLACE INTO entries (wiki, page, lastrevid, touched, digest, stored_at, used_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (wiki, page, info['lastrevid'], info['touched'] or '', digest, now, now))
+            self._evict(conn)
+        finally:
+            conn.close()
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removed = []
+        with conn:
+            # Oldest entries first; a body goes once no entry points at it
+            for entry in conn.execute('SELECT wiki, page, lastrevid, touched, digest FROM entries '
+                                      'ORDER BY used_at').fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM entries WHERE wiki = ? AND page = ? AND lastrevid = ? AND touched = ?',
+                             tuple(entry)[:4])
+                if conn.execute('SELECT 1 FROM entries WHERE digest = ? LIMIT 1', (entry['digest'],)).fetchone():
+                    continue
+                size = conn.execute('SELECT size FROM blobs WHERE digest = ?', (entry['digest'],)).fetchone()[0]
+                conn.execute('DELETE FROM blobs WHERE digest = ?', (entry['digest'],))
+                removed.append(entry['digest'])
+                total -= size
+        for digest in removed:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+        logger.info(f"Response cache evicted {len(removed)} bodies, {total / 1024 / 1024:.1f} MiB left")
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            entries = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            blobs, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+            return {"entries": entries, "bodies": blobs, "bytes": size}
+        finally:
+            conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """The ResponseCache for LIQUIPEDIA_CACHE, or None when it is off"""
+    global _cache
+    if CACHE_MODE not in MODES:
+        raise ValueError(f"LIQUIPEDIA_CACHE must be one of {', '.join(MODES)}, not {CACHE_MODE!r}")
+    if CACHE_MODE == "off":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(CACHE_DIR, CACHE_MAX_BYTES, replay=CACHE_MODE == "replay")
+        return _cache
+
+
+def set_response_cache(cache):
+    """Use cache (or None for no cache) from now on, whatever LIQUIPEDIA_CACHE says"""
+    global _cache, CACHE_MODE
+    with _cache_lock:
+        _cache = cache
+        CACHE_MODE = "off" if cache is None else "replay" if cache.replay else "cache"
@@ -0,0 +1,296 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import request, current_app
+from .db import get_connection
+from .data_versions import TRACKED_TABLES, get_data_versions
+from .search_index import SEARCHABLE
+from .search_logger import log_search_query
+
+logger = logging.getLogger(__name__)
+
+# Serialized search responses, keyed by endpoint + normalized arguments.
+# Each entry records the data_versions of the tables it was computed from
+# and is served only while all of them are unchanged, so writes invalidate
+# exactly the entries they affect and nothing expires on a timer.
+#
+# Two tiers: a per-process LRU of response bytes, and the search_cache
+# table, which every worker on the database shares.
+MEMORY_MAX_BYTES = 32 * 1024 * 1024
+MAX_ENTRY_BYTES = 1024 * 1024
+SHARED_MAX_ENTRIES = 5000
+# Once search_cache_size passes SHARED_MAX_ENTRIES the oldest entries go
+# down to this share of it, so a trim runs once per many stores
+TRIM_TO = 0.9
+# A shared hit rewrites last_used only when it is at least this old; other
+# hits, memory-tier ones included, are collected in _touched and written
+# with the next write this process makes
+TOUCH_INTERVAL = 60
+
+_memory = OrderedDict()
+_memory_bytes = 0
+_touched = set()
+_lock = threading.Lock()
+_stats = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0, 'stores': 0}
+
+
+def create_search_cache_schema(cursor):
+    """Create the shared tier of the search result cache"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_cache (
+            key TEXT PRIMARY KEY,
+            versions TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            result_count INTEGER NOT NULL DEFAULT 0,
+            last_used TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache(last_used)')
+
+
+def create_search_cache_size_schema(cursor):
+    """Keep the number of shared entries in search_cache_size, so stores need not count them"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_cache_size (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            entries INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR REPLACE INTO search_cache_size (id, entries) SELECT 1, COUNT(*) FROM search_cache')
+    # _store upserts, so replacing an entry fires neither trigger
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS search_cache_size_ai AFTER INSERT ON search_cache BEGIN
+            UPDATE search_cache_size SET entries = entries + 1 WHERE id = 1;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS search_cache_size_ad AFTER DELETE ON search_cache BEGIN
+            UPDATE search_cache_size SET entries = entries - 1 WHERE id = 1;
+        END
+    ''')
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a search query"""
+    return ' '.join((query or '').lower().split())
+
+
+def _cache_key():
+    args = sorted((key, value) for key, value in request.args.items(multi=True)
+                  if key != 'query' and value != '')
+    raw = json.dumps([request.path, normalize_query(request.args.get('query')), args])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _dependencies(body):
+    """Tables a response was computed from"""
+    search_type = request.args.get('search_type')
+    if search_type in SEARCHABLE and 'suggestions' not in body:
+        return (SEARCHABLE[search_type]['table'],)
+    # Global results, and spelling suggestions drawn from every table
+    return TRACKED_TABLES
+
+
+def _is_current(versions, current):
+    return all(current.get(table) == version for table, version in versions.items())
+
+
+def _remember(key, versions, payload, result_count):
+    global _memory_bytes
+    with _lock:
+        previous = _memory.pop(key, None)
+        if previous:
+            _memory_bytes -= len(previous[1])
+        _memory[key] = (versions, payload, result_count)
+        _memory_bytes += len(payload)
+        while _memory_bytes > MEMORY_MAX_BYTES and _memory:
+            _, (_, evicted, _) = _memory.popitem(last=False)
+            _memory_bytes -= len(evicted)
+            _stats['evictions'] += 1
+
+
+def _forget(key):
+    global _memory_bytes
+    with _lock:
+        entry = _memory.pop(key, None)
+        if entry:
+            _memory_bytes -= len(entry[1])
+
+
+def _lookup(key, current):
+    """(payload, result_count, tier) for a current entry, or (None, 0, None)"""
+    with _lock:
+        entry = _memory.get(key)
+        if entry:
+            _memory.move_to_end(key)
+    if entry:
+        if _is_current(entry[0], current):
+            with _lock:
+                _touched.add(key)
+            return entry[1], entry[2], 'memory'
+        _forget(key)
+
+    conn = get_connection()
+    try:
+        row = conn.execute('''
+            SELECT versions, payload, result_count, CAST(strftime('%s', last_used) AS INTEGER)
+            FROM search_cache WHERE key = ?
+        ''', (key,)).fetchone()
+        if row is None:
+            if entry:
+                _stats['invalidations'] += 1
+            return None, 0, None
+        versions = json.loads(row[0])
+        if _is_current(versions, current):
+            with _lock:
+                _touched.add(key)
+            if row[3] is None or time.time() - row[3] >= TOUCH_INTERVAL:
+                _flush_touched(conn)
+                conn.commit()
+            _remember(key, versions, row[1], row[2])
+            return row[1], row[2], 'shared'
+        conn.execute('DELETE FROM search_cache WHERE key = ?', (key,))
+        conn.commit()
+        _stats['invalidations'] += 1
+        return None, 0, None
+    finally:
+        conn.close()
+
+
+def _flush_touched(conn):
+    """Write last_used for every entry hit since the last flush"""
+    with _lock:
+        keys = list(_touched)
+        _touched.clear()
+    conn.executemany('UPDATE search_cache SET last_used = CURRENT_TIMESTAMP WHERE key = ?',
+                     ((key,) for key in keys))
+
+
+def _store(key, versions, payload, result_count):
+    _remember(key, versions, payload, result_count)
+    conn = get_connection()
+    try:
+        conn.execute('''
+            INSERT INTO search_cache (key, versions, payload, result_count) VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                versions = excluded.versions, payload = excluded.payload,
+                result_count = excluded.result_count, last_used = CURRENT_TIMESTAMP
+        ''', (key, json.dumps(versions), payload, result_count))
+        _flush_touched(conn)
+        entries = conn.execute('SELECT entries FROM search_cache_size WHERE id = 1').fetchone()[0]
+        if entries > SHARED_MAX_ENTRIES:
+            conn.execute('''
+                DELETE FROM search_cache WHERE key IN (
+                    SELECT key FROM search_cache ORDER BY last_used LIMIT ?
+                )
+            ''', (entries - int(SHARED_MAX_ENTRIES * TRIM_TO),))
+        conn.commit()
+        _stats['stores'] += 1
+    finally:
+        conn.close()
+
+
+def _result_count(body):
+    pagination = body.get('pagination')
+    return pagination.get('total', 0) if isinstance(pagination, dict) else body.get('total', 0)
+
+
+def _log_hit(result_count, execution_time):
+    # Hits never reach the view, which is what logs misses; search_logs
+    # feeds analytics and autocomplete popularity, so log them here
+    log_search_query(
+        query=normalize_query(request.args.get('query')),
+        search_type=request.args.get('search_type'),
+        execution_time=execution_time,
+        result_count=result_count,
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', 10, type=int),
+        user_ip=request.remote_addr,
+        user_agent=request.headers.get('User-Agent', '')
+    )
+
+
+def cached_search(view):
+    """
+    Serve a search view's JSON response from the result cache. Empty
+    queries, errors and oversized responses are never cached.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not normalize_query(request.args.get('query')):
+            return view(*args, **kwargs)
+
+        start_time = time.time()
+        key = _cache_key()
+        try:
+            current = get_data_versions()
+            payload, result_count, tier = _lookup(key, current)
+        except sqlite3.Error as e:
+            logger.error(f"Search cache lookup failed: {str(e)}")
+            return view(*args, **kwargs)
+
+        if payload is not None:
+            _stats[f'{tier}_hits'] += 1
+            _log_hit(result_count, time.time() - start_time)
+            response = current_app.response_class(payload, mimetype='application/json')
+            response.headers['X-Cache'] = f'HIT-{tier.upper()}'
+            return response
+
+        _stats['misses'] += 1
+        response = view(*args, **kwargs)
+        if getattr(response, 'status_code', None) != 200 or not response.is_json:
+            return response
+        body = response.get_json()
+        payload = response.get_data()
+        if isinstance(body, dict) and 'error' not in body and len(payload) <= MAX_ENTRY_BYTES:
+            # Versions read before the search ran: a write that lands while
+            # it runs makes this entry stale instead of wrongly current
+            versions = {table: current.get(table) for table in _dependencies(body)}
+            try:
+                _store(key, versions, payload, _result_count(body))
+            except sqlite3.Error as e:
+                logger.error(f"Search cache store failed: {str(e)}")
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
+
+
+def clear_search_cache():
+    """Drop every cached response in this process and in the shared tier"""
+    global _memory_bytes
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+        _touched.clear()
+    conn = get_connection()
+    try:
+        conn.execute('DELETE FROM search_cache')
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error clearing search cache: {str(e)}")
+    finally:
+        conn.close()
+
+
+def get_cache_stats():
+    """Hit/miss counters for this process plus the size of both tiers"""
+    stats = dict(_stats)
+    lookups = stats['memory_hits'] + stats['shared_hits'] + stats['misses']
+    stats['hit_ratio'] = round((stats['memory_hits'] + stats['shared_hits']) / lookups, 4) if lookups else 0.0
+    with _lock:
+        stats['memory_entries'] = len(_memory)
+        stats['memory_bytes'] = _memory_bytes
+    conn = get_connection()
+    try:
+        stats['shared_entries'] = conn.execute('SELECT COUNT(*) FROM search_cache').fetchone()[0]
+    except sqlite3.Error as e:
+        logger.error(f"Error reading search cache size: {str(e)}")
+    finally:
+        conn.close()
+    return stats
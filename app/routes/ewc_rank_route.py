@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flasgger import swag_from
-from app.ewc_rank import get_ewc_rank_data, get_available_weeks
+from app.ewc_rank import get_ewc_rank_data, get_ewc_rank_history, get_available_weeks
 from app.crud.crud import get_ewc_rank_from_db, store_ewc_rank_in_db
 
 ewc_rank_bp = Blueprint("ewc_rank", __name__)
@@ -238,3 +238,65 @@ def get_weeks():
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 
+@ewc_rank_bp.route("/ewc_rank/history", methods=["GET"])
+@swag_from({
+    "tags": ["EWC Rank"],
+    "summary": "Get a Team's Club Championship Standings History",
+    "description": "Per-week points and rankings of a team in the latest stored standings, with the change from the previous week and the change since the previous scrape. Rank changes are positive when the team moved up.",
+    "parameters": [
+        {
+            "name": "team",
+            "in": "query",
+            "type": "string",
+            "required": True,
+            "description": "Exact team name, matched case-insensitively if there is no exact match. Example: 'Team Vitality'."
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "Team history retrieved successfully.",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "message": {"type": "string", "example": "Team standings history retrieved successfully."},
+                    "team": {"type": "string", "example": "Team Vitality"},
+                    "snapshot_ts": {"type": "integer", "example": 1756502314},
+                    "previous_snapshot_ts": {"type": "integer", "example": 1756415914},
+                    "snapshots": {"type": "integer", "example": 12},
+                    "weeks": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "week": {"type": "string", "example": "Week 2"},
+                                "points": {"type": "integer", "example": 2400},
+                                "ranking": {"type": "integer", "example": 1},
+                                "points_change": {"type": "integer", "example": 400},
+                                "rank_change": {"type": "integer", "example": 2},
+                                "points_change_since_last_scrape": {"type": "integer", "example": 0},
+                                "rank_change_since_last_scrape": {"type": "integer", "example": 0}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        400: {"description": "Missing team parameter."},
+        404: {"description": "No stored standings for this team."}
+    }
+})
+def get_ewc_rank_history_route():
+    """Get a Team's Club Championship Standings History"""
+    team = request.args.get("team", "").strip()
+    if not team:
+        return jsonify({"error": "The team parameter is required."}), 400
+    try:
+        history = get_ewc_rank_history(team)
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+    if history is None:
+        return jsonify({"error": f"No standings history found for team: {team}"}), 404
+    return jsonify({
+        "message": "Team standings history retrieved successfully.",
+        **history
+    })
@@ -1,16 +1,15 @@
 from flask import Blueprint, request, jsonify
-from app.game_matches_init_db import get_connection, init_game_matches_db
-from app.crud.game_matches_crud import get_grouped_matches, insert_or_update_match_game
-from app.game_matches import scrape_matches
-import json
+from zoneinfo import ZoneInfo
+from app.game_matches_init_db import get_connection
+from app.crud.game_matches_crud import get_grouped_matches, save_scraped_game_matches
+from app.game_matches import scrape_matches_if_changed
+from app.liquipedia_client import RateLimitExceeded
 
 game_matches_bp = Blueprint('game_matches', __name__)
 
 @game_matches_bp.route('/game_matches', methods=['GET'])
 def game_matches():
-    # Initialize game matches tables
-    init_game_matches_db()
-
+    # Tables are created by app.migrations at startup, not per request
     # Handle multiple values for parameters only when live=false
     game = request.args.get('game', '').split(',') if request.args.get('game') and request.args.get('live', 'false').lower() == 'false' else [request.args.get('game')] if request.args.get('game') else None
     day = request.args.get('day', '').split(',') if request.args.get('day') and request.args.get('live', 'false').lower() == 'false' else [request.args.get('day')] if request.args.get('day') else None
@@ -18,6 +17,12 @@ def game_matches():
     live = request.args.get('live', 'false').lower() == 'true'
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 10))
+    # Days are calendar days in the client's timezone
+    timezone = request.args.get('timezone', 'UTC')
+    try:
+        ZoneInfo(timezone)
+    except Exception:
+        return jsonify({"error": f"Invalid timezone: {timezone}"}), 400
 
     if live and (not game or len(game) > 1 or (game and game[0] is None)):
         return jsonify({"error": "Exactly one game parameter is required when live=true"}), 400
@@ -25,26 +30,18 @@ def game_matches():
     conn = get_connection()
 
     if live and game and game[0]:
-        match_data = scrape_matches(game[0])
-        for status, tournaments in match_data.items():
-            for tournament_name, tournament_data in tournaments.items():
-                tournament_link = tournament_data["tournament_link"]
-                tournament_id = insert_or_update_tournament(
-                    conn, game[0], tournament_name, tournament_link, tournament_data["tournament_icon"]
-                )
-                for match in tournament_data["matches"]:
-                    match_id = match["match_id"]
-                    if match_id:
-                        insert_or_update_match(
-                            conn, tournament_id, match_id, status, match["team1"], match["team1_url"],
-                            match["logo1_light"], match["logo1_dark"], match["team2"], match["team2_url"],
-                            match["logo2_light"], match["logo2_dark"], match["timestamp"], match["match_time"],
-                            match["format"], match["score"], json.dumps(match["stream_link"]), match["details_link"],
-                            match.get("group")
-                        )
-                        insert_or_update_match_game(conn, match_id, game[0])
-
-    grouped_matches, total = get_grouped_matches(conn, game=game, day=day, tournament=tournament, page=page, per_page=per_page)
+        try:
+            match_data, revision = scrape_matches_if_changed(game[0])
+        except RateLimitExceeded:
+            # Throttled: answer from the stored matches instead of failing
+            match_data = None
+        if match_data is not None:
+            save_scraped_game_matches(conn, game[0], match_data)
+            revision.record()
+
+    grouped_matches, total = get_grouped_matches(conn, game=game, day=day, tournament=tournament, page=page,
+                                                 per_page=per_page, timezone=timezone)
+    conn.close()
     response = {
         "tournaments": grouped_matches,
         "total": total,
@@ -52,50 +49,3 @@ def game_matches():
         "per_page": per_page
     }
     return jsonify(response)
-
-def insert_or_update_tournament(conn, game, name, link, icon):
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO tournaments (game, name, link, icon)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(link) DO UPDATE SET
-            game = excluded.game,
-            name = excluded.name,
-            icon = excluded.icon,
-            updated_at = CURRENT_TIMESTAMP
-    ''', (game, name, link, icon))
-    conn.commit()
-    cursor.execute("SELECT id FROM tournaments WHERE link = ?", (link,))
-    return cursor.fetchone()['id']
-
-def insert_or_update_match(conn, tournament_id, match_id, status, team1, team1_url, logo1_light, logo1_dark,
-                           team2, team2_url, logo2_light, logo2_dark, timestamp, match_time, format_, score,
-                           stream_links, details_link, group_name):
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO matches (tournament_id, match_id, status, team1, team1_url, logo1_light, logo1_dark,
-                             team2, team2_url, logo2_light, logo2_dark, timestamp, match_time, format, score,
-                             stream_links, details_link, group_name)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(match_id) DO UPDATE SET
-            status = excluded.status,
-            team1 = excluded.team1,
-            team1_url = excluded.team1_url,
-            logo1_light = excluded.logo1_light,
-            logo1_dark = excluded.logo1_dark,
-            team2 = excluded.team2,
-            team2_url = excluded.team2_url,
-            logo2_light = excluded.logo2_light,
-            logo2_dark = excluded.logo2_dark,
-            timestamp = excluded.timestamp,
-            match_time = excluded.match_time,
-            format = excluded.format,
-            score = excluded.score,
-            stream_links = excluded.stream_links,
-            details_link = excluded.details_link,
-            group_name = excluded.group_name,
-            updated_at = CURRENT_TIMESTAMP
-    ''', (tournament_id, match_id, status, team1, team1_url, logo1_light, logo1_dark,
-          team2, team2_url, logo2_light, logo2_dark, timestamp, match_time, format_, score,
-          stream_links, details_link, group_name))
-    conn.commit()
\ No newline at end of file
@@ -2,10 +2,11 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from app.matches_mohamed import (
-    scrape_matches,
+    scrape_matches_if_changed,
     save_matches_to_db,
     get_matches_paginated
 )
+from app.liquipedia_client import RateLimitExceeded
 
 matches_bp = Blueprint('matches', __name__)
 
@@ -79,9 +80,21 @@ def get_matches():
                 }), 400
 
             print(f"🔄 Scraping live matches for {game}...")
-            scraped_matches = scrape_matches(game,use_matches_page=True)
-            save_matches_to_db(game, scraped_matches)
-            print(f"✅ Saved {game} matches to database")
+            try:
+                scraped_matches, revision = scrape_matches_if_changed(game, use_matches_page=True)
+            except RateLimitExceeded as e:
+                # Serve what is stored; a later request refreshes it
+                scraped_matches, revision = None, None
+                print(f"🟡 {game} not refreshed: {e}")
+            if revision is None:
+                sync_result = {"rate_limited": True}
+            elif scraped_matches is None:
+                sync_result = {"unchanged": True}
+                print(f"🟡 {game} matches unchanged since the last sync")
+            else:
+                sync_result = save_matches_to_db(game, scraped_matches)
+                revision.record()
+                print(f"✅ Saved {game} matches to database")
 
             result = get_matches_paginated(
                 games=[game],
@@ -94,6 +107,7 @@ def get_matches():
             result["metadata"] = {
                 "live_data": True,
                 "game": game,
+                "sync": sync_result,
                 "timezone": timezone,
                 "scraped_at": datetime.now(ZoneInfo('UTC')).isoformat(),
                 "day_filter": day if day else None
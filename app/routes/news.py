@@ -152,6 +152,11 @@ def get_news():
         type: string
         enum: [created_at, title]
         default: created_at
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Keyset pagination; pass empty for the first page, then each response's next_cursor
     responses:
       200:
         description: News items retrieved
@@ -171,7 +176,9 @@ def get_news():
         if sort not in ('created_at', 'title'):
             return jsonify({"error": "Invalid sort parameter"}), 400
 
-        result = get_news_items(page, per_page, writer, search, sort)
+        cursor = request.args.get('cursor')
+
+        result = get_news_items(page, per_page, writer, search, sort, cursor)
         response = jsonify(result)
         response.headers['Cache-Control'] = 'public, max-age=300'
         response.headers['X-Content-Type-Options'] = 'nosniff'
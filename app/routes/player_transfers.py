@@ -127,6 +127,10 @@ def get_transfers():
         type: string
         default: desc
         description: Sort order (asc, desc)
+      - name: cursor
+        in: query
+        type: string
+        description: Keyset pagination; pass empty for the first page, then each response's next_cursor
     responses:
       200:
         description: Transfers retrieved successfully
@@ -211,6 +215,7 @@ def get_transfers():
         # Sorting parameters
         sort_by = request.args.get('sort_by', 'date')
         sort_order = request.args.get('sort_order', 'desc')
+        cursor = request.args.get('cursor')
         
         # Validate page number
         if page < 1:
@@ -229,11 +234,14 @@ def get_transfers():
             page=page,
             per_page=per_page,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            cursor=cursor
         )
         
         return jsonify(result), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error in get_transfers: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
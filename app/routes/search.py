@@ -4,13 +4,16 @@ from app.search_logger import search_performance_decorator, get_search_analytics
 from app.enhanced_search import enhanced_search, search_with_filters
 from app.optimized_pagination import create_pagination_indexes
 from app.fts_search import populate_fts_tables, rebuild_fts_indexes
+from app.autocomplete import autocomplete
+from app.result_cache import cached_search, normalize_query, get_cache_stats
 
 search_bp = Blueprint('search', __name__)
 
 @search_bp.route('/search', methods=['GET'])
+@cached_search
 def search():
     """Enhanced search endpoint with multiple search modes"""
-    query = request.args.get('query', '')
+    query = normalize_query(request.args.get('query', ''))
     search_type = request.args.get('search_type')
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 10)), 100)  # Limit max per_page
@@ -20,16 +23,19 @@ def search():
     cursor = request.args.get('cursor')
     
     # Use enhanced search
-    result = enhanced_search.search(
-        query=query,
-        search_type=search_type,
-        page=page,
-        per_page=per_page,
-        search_mode=search_mode,
-        fuzzy_threshold=fuzzy_threshold,
-        use_cursor=use_cursor,
-        cursor=cursor
-    )
+    try:
+        result = enhanced_search.search(
+            query=query,
+            search_type=search_type,
+            page=page,
+            per_page=per_page,
+            search_mode=search_mode,
+            fuzzy_threshold=fuzzy_threshold,
+            use_cursor=use_cursor,
+            cursor=cursor
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     return jsonify(result)
 
@@ -118,6 +124,24 @@ def search_suggestions():
     
     return jsonify({'suggestions': suggestions})
 
+@search_bp.route('/search/autocomplete', methods=['GET'])
+def search_autocomplete():
+    """Typeahead suggestions for team, player, tournament and game names"""
+    query = request.args.get('query', '')
+    limit = int(request.args.get('limit', 10))
+    types = request.args.get('types')
+    types = [t.strip() for t in types.split(',') if t.strip()] if types else None
+
+    return jsonify({
+        'query': query,
+        'suggestions': autocomplete(query, limit, types)
+    })
+
+@search_bp.route('/search/cache/stats', methods=['GET'])
+def search_cache_stats():
+    """Search result cache hit/miss counters and size"""
+    return jsonify({'cache': get_cache_stats()})
+
 @search_bp.route('/search/admin/rebuild-indexes', methods=['POST'])
 def rebuild_search_indexes():
     """Admin endpoint to rebuild search indexes"""
@@ -4,16 +4,18 @@ from ..search_logger import log_search_query
 from ..enhanced_search_extended import enhanced_search_extended, search_with_filters_extended, get_all_table_names_extended, get_table_schema_extended, get_searchable_fields_by_table
 from ..fuzzy_search_extended import suggest_corrections_extended, get_table_field_suggestions_extended
 from ..fts_search import populate_fts_tables, rebuild_fts_indexes
+from ..result_cache import cached_search, normalize_query
 
 search_extended_bp = Blueprint('search_extended', __name__)
 logger = logging.getLogger(__name__)
 
 @search_extended_bp.route('/search', methods=['GET'])
+@cached_search
 def search():
     """Enhanced search endpoint with support for all database tables"""
     try:
         # Get query parameters
-        query = request.args.get('query', '').strip()
+        query = normalize_query(request.args.get('query', ''))
         search_mode = request.args.get('search_mode', 'auto')  # auto, fts, fuzzy, hybrid
         search_type = request.args.get('search_type')  # specific table or None for all
         fuzzy_threshold = int(request.args.get('fuzzy_threshold', 70))
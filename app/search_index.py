@@ -0,0 +1,443 @@
+import sqlite3
+import logging
+import base64
+import json
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from .db import get_connection
+from .data_versions import get_data_versions
+
+logger = logging.getLogger(__name__)
+
+# Declarative registry of searchable tables. Every entity type is fed into the
+# single search_documents FTS5 index through its title, keywords and body
+# columns (weighted by RANK_WEIGHTS), so adding a searchable table is one
+# entry here plus a migration that calls rebuild_search_documents().
+# `code` is part of each document's rowid and must never be reused.
+SEARCHABLE = {
+    'news': {
+        'code': 1, 'table': 'news',
+        'title': ('title',), 'keywords': ('writer',), 'body': ('description',)
+    },
+    'games': {
+        'code': 2, 'table': 'games',
+        'title': ('game_name',), 'keywords': ('genre', 'platform'), 'body': ('description',)
+    },
+    'matches': {
+        'code': 3, 'table': 'matches',
+        'title': ('team1', 'team2'), 'keywords': ('game', 'tournament'), 'body': ('match_group',)
+    },
+    'prize_distribution': {
+        'code': 4, 'table': 'prize_distribution',
+        'title': ('participants',), 'keywords': ('place', 'prize'), 'body': ()
+    },
+    'ewc_info': {
+        'code': 5, 'table': 'ewc_info',
+        'title': ('header',), 'keywords': ('series', 'organizers', 'location'),
+        'body': ('prize_pool', 'liquipedia_tier')
+    },
+    'transfers': {
+        'code': 6, 'table': 'transfers',
+        'title': ('player_name',), 'keywords': ('old_team_name', 'new_team_name'), 'body': ('game',)
+    },
+    'ewc_teams_players': {
+        'code': 7, 'table': 'ewc_teams_players',
+        'title': ('team_name',), 'keywords': ('game', 'tournament', 'placement'), 'body': ('players',)
+    },
+    'player_information': {
+        'code': 8, 'table': 'player_information',
+        'title': ('player_page_name',), 'keywords': ('game',), 'body': ('data',)
+    },
+    'team_information': {
+        'code': 9, 'table': 'team_information',
+        'title': ('team_page_name',), 'keywords': ('game',), 'body': ('data',)
+    },
+    'teams': {
+        'code': 10, 'table': 'game_teams',
+        'title': ('team_name',), 'keywords': ('game_name', 'logo_mode'), 'body': ()
+    },
+}
+
+# rowid = source id * TYPE_SLOTS + code, so a source row maps to exactly one
+# document and triggers can delete it by rowid
+TYPE_SLOTS = 16
+
+# bm25 weights for (entity_type, entity_id, title, keywords, body). Spelled
+# out per query: it is measurably faster than a persisted 'rank' option.
+RANK_WEIGHTS = (0.0, 0.0, 10.0, 4.0, 1.0)
+RANK = f"bm25(search_documents, {', '.join(str(weight) for weight in RANK_WEIGHTS)})"
+
+FIELDS = ('title', 'keywords', 'body')
+
+
+def _text(columns, prefix=''):
+    """SQL expression joining columns into one space-separated string"""
+    if not columns:
+        return "''"
+    return " || ' ' || ".join(f"COALESCE({prefix}{column}, '')" for column in columns)
+
+
+def _document_select(entity_type, spec, prefix=''):
+    values = [f"{prefix}id * {TYPE_SLOTS} + {spec['code']}", f"'{entity_type}'", f"{prefix}id"]
+    values += [_text(spec[field], prefix) for field in FIELDS]
+    return ', '.join(values)
+
+
+def create_search_documents_schema(cursor):
+    """Create the search_documents FTS5 index and one set of sync triggers per registered table"""
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_documents USING fts5(
+            entity_type UNINDEXED, entity_id UNINDEXED, title, keywords, body
+        )
+    ''')
+    # The text of every document the triggers add (sign 1) or remove (-1),
+    # until spelling.apply_spelling_changes() folds it into the spelling index
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_document_changes (
+            id INTEGER PRIMARY KEY,
+            sign INTEGER NOT NULL,
+            text TEXT NOT NULL
+        )
+    ''')
+
+    for entity_type, spec in SEARCHABLE.items():
+        table = spec['table']
+        columns = [column for field in FIELDS for column in spec[field]]
+        changed = ' OR '.join(f"old.{column} IS NOT new.{column}" for column in columns)
+        log_new = f"INSERT INTO search_document_changes(sign, text) VALUES (1, {_text(columns, 'new.')});"
+        log_old = f"INSERT INTO search_document_changes(sign, text) VALUES (-1, {_text(columns, 'old.')});"
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_documents(rowid, entity_type, entity_id, title, keywords, body)
+                VALUES ({_document_select(entity_type, spec, 'new.')});
+                {log_new}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_documents WHERE rowid = old.id * {TYPE_SLOTS} + {spec['code']};
+                {log_old}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_search_au
+            AFTER UPDATE OF {', '.join(columns)} ON {table}
+            WHEN {changed}
+            BEGIN
+                DELETE FROM search_documents WHERE rowid = old.id * {TYPE_SLOTS} + {spec['code']};
+                INSERT INTO search_documents(rowid, entity_type, entity_id, title, keywords, body)
+                VALUES ({_document_select(entity_type, spec, 'new.')});
+                {log_old}
+                {log_new}
+            END
+        ''')
+
+
+def populate_search_documents(cursor):
+    """Re-index every registered table from scratch"""
+    cursor.execute('DELETE FROM search_documents')
+    for entity_type, spec in SEARCHABLE.items():
+        cursor.execute(f'''
+            INSERT INTO search_documents(rowid, entity_type, entity_id, title, keywords, body)
+            SELECT {_document_select(entity_type, spec)} FROM {spec['table']}
+        ''')
+
+
+def _drop_search_triggers(cursor):
+    for spec in SEARCHABLE.values():
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {spec['table']}_search_{suffix}")
+
+
+def recreate_search_triggers(cursor):
+    """Regenerate the sync triggers from SEARCHABLE, keeping the indexed documents"""
+    _drop_search_triggers(cursor)
+    create_search_documents_schema(cursor)
+
+
+def rebuild_search_documents(cursor):
+    """Recreate search_documents and its triggers from SEARCHABLE, then re-index"""
+    _drop_search_triggers(cursor)
+    cursor.execute('DROP TABLE IF EXISTS search_documents')
+    create_search_documents_schema(cursor)
+    populate_search_documents(cursor)
+
+
+def _hydrate(cursor, entity_type, hits):
+    """Load the source rows for [(entity_id, rank)], keeping rank order"""
+    if not hits:
+        return []
+    ids = [entity_id for entity_id, _ in hits]
+    cursor.execute(
+        f"SELECT * FROM {SEARCHABLE[entity_type]['table']} WHERE id IN ({', '.join('?' * len(ids))})",
+        ids
+    )
+    rows = {row['id']: dict(row) for row in cursor.fetchall()}
+    results = []
+    for entity_id, rank in hits:
+        if entity_id in rows:
+            rows[entity_id]['rank'] = rank
+            results.append(rows[entity_id])
+    return results
+
+
+def search_entity(entity_type, query, page=1, per_page=10):
+    """Ranked full-text search over one entity type"""
+    if entity_type not in SEARCHABLE:
+        return [], 0
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        fts_query = query.replace('"', '""')
+        # Filter on the rowid-encoded type: reading the entity_type column
+        # would load every matching document's content
+        code = SEARCHABLE[entity_type]['code']
+
+        cursor.execute(f'''
+            SELECT COUNT(*) FROM search_documents
+            WHERE search_documents MATCH ? AND rowid % {TYPE_SLOTS} = ?
+        ''', (fts_query, code))
+        total = cursor.fetchone()[0]
+
+        offset = (page - 1) * per_page
+        cursor.execute(f'''
+            SELECT rowid / {TYPE_SLOTS}, {RANK} AS score FROM search_documents
+            WHERE search_documents MATCH ? AND rowid % {TYPE_SLOTS} = ?
+            ORDER BY score, rowid
+            LIMIT ? OFFSET ?
+        ''', (fts_query, code, per_page, offset))
+
+        return _hydrate(cursor, entity_type, cursor.fetchall()), total
+
+    except sqlite3.Error as e:
+        logger.error(f"FTS search error in {entity_type}: {str(e)}")
+        return [], 0
+    finally:
+        conn.close()
+
+
+def search_all(query, page=1, per_page=10):
+    """
+    One bm25-ranked query over every entity type.
+
+    Returns ({entity_type: rows}, total) where rows are this page of the
+    global ranking, grouped by entity type and in rank order within a type.
+    """
+    types = {spec['code']: entity_type for entity_type, spec in SEARCHABLE.items()}
+    results = {entity_type: [] for entity_type in SEARCHABLE}
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        fts_query = query.replace('"', '""')
+
+        cursor.execute('SELECT COUNT(*) FROM search_documents WHERE search_documents MATCH ?', (fts_query,))
+        total = cursor.fetchone()[0]
+
+        offset = (page - 1) * per_page
+        cursor.execute(f'''
+            SELECT rowid % {TYPE_SLOTS}, rowid / {TYPE_SLOTS}, {RANK} AS score
+            FROM search_documents
+            WHERE search_documents MATCH ?
+            ORDER BY score, rowid
+            LIMIT ? OFFSET ?
+        ''', (fts_query, per_page, offset))
+
+        hits = {}
+        for code, entity_id, score in cursor.fetchall():
+            if code in types:
+                hits.setdefault(types[code], []).append((entity_id, score))
+
+        for entity_type, entity_hits in hits.items():
+            results[entity_type] = _hydrate(cursor, entity_type, entity_hits)
+        return results, total
+
+    except sqlite3.Error as e:
+        logger.error(f"FTS global search error: {str(e)}")
+        return results, 0
+    finally:
+        conn.close()
+
+
+# Keyset pagination over the bm25 ranking. A cursor is the (score, rowid)
+# of the last document served; the next page is whatever ranks after it.
+#
+# bm25 has to be computed for every match whatever the page, so a page
+# fetched with a cursor also keeps the query's full ranking as a snapshot,
+# valid while data_versions is unchanged: following pages are a bisect into
+# it instead of another full ranking.
+TOTAL_CAP = 1000
+SNAPSHOT_LIMIT = 32
+SNAPSHOT_MAX_ROWS = 500000
+
+_snapshots = OrderedDict()
+_snapshot_lock = threading.Lock()
+
+
+def encode_rank_cursor(score, rowid):
+    """Opaque cursor for the document ranked (score, rowid)"""
+    encoded = base64.urlsafe_b64encode(json.dumps({'rank': score, 'rowid': rowid}).encode()).decode()
+    return encoded.rstrip('=')
+
+
+def decode_rank_cursor(cursor):
+    """
+    (score, rowid) from a cursor, or None when there is none; a malformed
+    cursor raises ValueError like KeysetPagination.decode_cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+        return float(data['rank']), int(data['rowid'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _type_filter(code):
+    return f" AND rowid % {TYPE_SLOTS} = {int(code)}" if code is not None else ''
+
+
+def _snapshot(cursor, fts_query, code):
+    """(scores, rowids) of every match in rank order, or None if too many to keep"""
+    signature = tuple(sorted(get_data_versions().items()))
+    key = (fts_query, code)
+    with _snapshot_lock:
+        cached = _snapshots.get(key)
+        if cached and cached[0] == signature:
+            _snapshots.move_to_end(key)
+            return cached[1]
+
+    cursor.execute(f'''
+        SELECT {RANK} AS score, rowid FROM search_documents
+        WHERE search_documents MATCH ?{_type_filter(code)}
+        LIMIT ?
+    ''', (fts_query, SNAPSHOT_MAX_ROWS + 1))
+    ranked = sorted(tuple(row) for row in cursor.fetchall())
+    if len(ranked) > SNAPSHOT_MAX_ROWS:
+        return None
+    snapshot = (array('d', (score for score, _ in ranked)), array('q', (rowid for _, rowid in ranked)))
+
+    with _snapshot_lock:
+        _snapshots[key] = (signature, snapshot)
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > SNAPSHOT_LIMIT:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _ranked_page(cursor, fts_query, code, after, per_page):
+    """Up to per_page + 1 [(rowid, score)] ranking after the (score, rowid) key"""
+    if after is not None:
+        snapshot = _snapshot(cursor, fts_query, code)
+        if snapshot is not None:
+            scores, rowids = snapshot
+            lo = bisect_left(scores, after[0])
+            hi = bisect_right(scores, after[0], lo)
+            start = bisect_right(rowids, after[1], lo, hi)
+            end = start + per_page + 1
+            return list(zip(rowids[start:end], scores[start:end]))
+
+    keyset, params = '', [fts_query]
+    if after is not None:
+        keyset, params = 'WHERE (score, rowid) > (?, ?)', params + list(after)
+    cursor.execute(f'''
+        SELECT rowid, score FROM (
+            SELECT rowid, {RANK} AS score FROM search_documents
+            WHERE search_documents MATCH ?{_type_filter(code)}
+        )
+        {keyset}
+        ORDER BY score, rowid
+        LIMIT ?
+    ''', params + [per_page + 1])
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def _keyset_result(cursor, fts_query, code, after, per_page, with_total):
+    """Page metadata shared by the keyset searches, plus this page's hits"""
+    hits = _ranked_page(cursor, fts_query, code, after, per_page)
+    has_next = len(hits) > per_page
+    hits = hits[:per_page]
+
+    total = None
+    total_capped = False
+    if with_total:
+        # Counting every match costs as much as ranking them; stop at the cap
+        cursor.execute(f'''
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM search_documents
+                WHERE search_documents MATCH ?{_type_filter(code)}
+                LIMIT ?
+            )
+        ''', (fts_query, TOTAL_CAP + 1))
+        total = cursor.fetchone()[0]
+        total_capped = total > TOTAL_CAP
+        total = min(total, TOTAL_CAP)
+
+    return hits, {
+        'has_next': has_next,
+        'next_cursor': encode_rank_cursor(hits[-1][1], hits[-1][0]) if has_next else None,
+        'limit': per_page,
+        'total': total,
+        'total_capped': total_capped
+    }
+
+
+def search_entity_keyset(entity_type, query, cursor=None, per_page=10, with_total=False):
+    """
+    Cursor-paginated search_entity. Returns {'data', 'has_next',
+    'next_cursor', 'limit', 'total', 'total_capped'}; total is only
+    counted when asked for, and never past TOTAL_CAP.
+    """
+    empty = {'data': [], 'has_next': False, 'next_cursor': None, 'limit': per_page,
+             'total': 0 if with_total else None, 'total_capped': False}
+    after = decode_rank_cursor(cursor)
+    if entity_type not in SEARCHABLE:
+        return empty
+
+    conn = get_connection()
+    try:
+        cursor_obj = conn.cursor()
+        hits, page = _keyset_result(cursor_obj, query.replace('"', '""'), SEARCHABLE[entity_type]['code'],
+                                    after, per_page, with_total)
+        page['data'] = _hydrate(cursor_obj, entity_type, [(rowid // TYPE_SLOTS, score) for rowid, score in hits])
+        return page
+
+    except sqlite3.Error as e:
+        logger.error(f"FTS keyset search error in {entity_type}: {str(e)}")
+        return empty
+    finally:
+        conn.close()
+
+
+def search_all_keyset(query, cursor=None, per_page=10, with_total=False):
+    """Cursor-paginated search_all; 'data' is {entity_type: rows} for the page"""
+    types = {spec['code']: entity_type for entity_type, spec in SEARCHABLE.items()}
+    results = {entity_type: [] for entity_type in SEARCHABLE}
+    empty = {'data': results, 'has_next': False, 'next_cursor': None, 'limit': per_page,
+             'total': 0 if with_total else None, 'total_capped': False}
+    after = decode_rank_cursor(cursor)
+
+    conn = get_connection()
+    try:
+        cursor_obj = conn.cursor()
+        hits, page = _keyset_result(cursor_obj, query.replace('"', '""'), None,
+                                    after, per_page, with_total)
+        grouped = {}
+        for rowid, score in hits:
+            if rowid % TYPE_SLOTS in types:
+                grouped.setdefault(types[rowid % TYPE_SLOTS], []).append((rowid // TYPE_SLOTS, score))
+        for entity_type, entity_hits in grouped.items():
+            results[entity_type] = _hydrate(cursor_obj, entity_type, entity_hits)
+        page['data'] = results
+        return page
+
+    except sqlite3.Error as e:
+        logger.error(f"FTS global keyset search error: {str(e)}")
+        return empty
+    finally:
+        conn.close()
@@ -0,0 +1,221 @@
+import sqlite3
+import logging
+from rapidfuzz import fuzz
+from rapidfuzz.distance import DamerauLevenshtein
+from .db import get_connection
+from .search_index import recreate_search_triggers
+
+logger = logging.getLogger(__name__)
+
+# SymSpell-style symmetric delete index. Every vocabulary term is stored
+# under each string reachable by deleting up to MAX_EDIT_DISTANCE characters
+# from its first PREFIX_LENGTH characters; a lookup generates the same
+# deletes for the query word and reads candidates by primary key, so its
+# cost depends on the word's length, not on the size of the corpus. Writers
+# keep it current through apply_spelling_changes(); lookups only read.
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_TERM_LENGTH = 3
+
+
+def _deletes(word, distance=MAX_EDIT_DISTANCE):
+    """word plus every string reachable by deleting up to distance characters"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _is_term(term):
+    return len(term) >= MIN_TERM_LENGTH and term.isalpha()
+
+
+def create_spelling_schema(cursor):
+    """Create the vocabulary view over search_documents and the symmetric delete tables"""
+    cursor.execute('CREATE VIRTUAL TABLE IF NOT EXISTS search_vocabulary USING fts5vocab(search_documents, row)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS spelling_terms (
+            term TEXT PRIMARY KEY,
+            frequency INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS spelling_deletes (
+            variant TEXT NOT NULL,
+            term TEXT NOT NULL,
+            PRIMARY KEY (variant, term)
+        ) WITHOUT ROWID
+    ''')
+    _sync(cursor)
+
+
+def create_spelling_changes_schema(cursor):
+    """Have the search triggers log changed documents, then start the log from a full sync"""
+    recreate_search_triggers(cursor)
+    cursor.execute('DROP TABLE IF EXISTS spelling_state')
+    _sync(cursor)
+
+
+def _store(cursor, added, removed, changed):
+    """Write {term: frequency} added, [term] removed and [(frequency, term)] changed"""
+    cursor.executemany('INSERT INTO spelling_terms (term, frequency) VALUES (?, ?)', added.items())
+    cursor.executemany('INSERT OR IGNORE INTO spelling_deletes (variant, term) VALUES (?, ?)',
+                       ((variant, term) for term in added for variant in _deletes(term[:PREFIX_LENGTH])))
+    cursor.executemany('DELETE FROM spelling_terms WHERE term = ?', ((term,) for term in removed))
+    cursor.executemany('DELETE FROM spelling_deletes WHERE variant = ? AND term = ?',
+                       ((variant, term) for term in removed for variant in _deletes(term[:PREFIX_LENGTH])))
+    cursor.executemany('UPDATE spelling_terms SET frequency = ? WHERE term = ?', changed)
+    return {"added": len(added), "removed": len(removed), "updated": len(changed)}
+
+
+def _sync(cursor):
+    """
+    Bring spelling_terms/spelling_deletes in line with the whole of
+    search_documents and empty the change log it already covers.
+    Returns the change counts.
+    """
+    cursor.execute('SELECT term, cnt FROM search_vocabulary')
+    current = {term: count for term, count in cursor.fetchall() if _is_term(term)}
+    cursor.execute('SELECT term, frequency FROM spelling_terms')
+    stored = dict(cursor.fetchall())
+    cursor.execute('DELETE FROM search_document_changes')
+
+    return _store(
+        cursor,
+        {term: count for term, count in current.items() if term not in stored},
+        [term for term in stored if term not in current],
+        [(current[term], term) for term in current if term in stored and stored[term] != current[term]]
+    )
+
+
+def _term_deltas(changes):
+    """
+    {term: change in its occurrence count (search_vocabulary.cnt)} for
+    logged [(id, sign, text)], tokenized by FTS5 itself so the terms are
+    exactly those of search_vocabulary.
+    """
+    scratch = sqlite3.connect(':memory:')
+    try:
+        scratch.execute('CREATE VIRTUAL TABLE docs USING fts5(sign UNINDEXED, text)')
+        scratch.execute('CREATE VIRTUAL TABLE terms USING fts5vocab(docs, instance)')
+        scratch.executemany('INSERT INTO docs (rowid, sign, text) VALUES (?, ?, ?)', changes)
+        return dict(scratch.execute('''
+            SELECT t.term, SUM(d.sign)
+            FROM terms t
+            JOIN docs d ON d.rowid = t.doc
+            GROUP BY t.term
+            HAVING SUM(d.sign) != 0
+        ''').fetchall())
+    finally:
+        scratch.close()
+
+
+def apply_spelling_changes(cursor):
+    """
+    Fold the documents logged in search_document_changes into the spelling
+    index. Writers call this inside their own transaction, before commit;
+    the work is proportional to the rows they changed. Returns the change
+    counts, or None when nothing was logged.
+    """
+    cursor.execute('SELECT id, sign, text FROM search_document_changes ORDER BY id')
+    changes = [tuple(row) for row in cursor.fetchall()]
+    if not changes:
+        return None
+    cursor.execute('DELETE FROM search_document_changes WHERE id <= ?', (changes[-1][0],))
+
+    deltas = {term: delta for term, delta in _term_deltas(changes).items() if _is_term(term)}
+    terms = list(deltas)
+    stored = {}
+    for i in range(0, len(terms), 500):
+        batch = terms[i:i + 500]
+        cursor.execute(f"SELECT term, frequency FROM spelling_terms WHERE term IN ({', '.join('?' * len(batch))})",
+                       batch)
+        stored.update((term, frequency) for term, frequency in cursor.fetchall())
+
+    added, removed, changed = {}, [], []
+    for term, delta in deltas.items():
+        frequency = stored.get(term, 0) + delta
+        if frequency <= 0:
+            if term in stored:
+                removed.append(term)
+        elif term in stored:
+            changed.append((frequency, term))
+        else:
+            added[term] = frequency
+    return _store(cursor, added, removed, changed)
+
+
+def rebuild_spelling_index():
+    """Rebuild the spelling index from the whole vocabulary, after search_documents was re-populated"""
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        counts = _sync(cursor)
+        conn.commit()
+        logger.info(f"Spelling index rebuilt: {counts}")
+        return counts
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Error rebuilding spelling index: {str(e)}")
+        return None
+    finally:
+        conn.close()
+
+
+def _candidates(cursor, word):
+    """[(distance, -frequency, term)] within edit distance of word, best first"""
+    max_distance = 1 if len(word) <= 4 else MAX_EDIT_DISTANCE
+    variants = list(_deletes(word[:PREFIX_LENGTH], max_distance))
+    cursor.execute(f'''
+        SELECT t.term, t.frequency
+        FROM spelling_deletes d
+        JOIN spelling_terms t ON t.term = d.term
+        WHERE d.variant IN ({', '.join('?' * len(variants))})
+    ''', variants)
+
+    candidates = set()
+    for term, frequency in cursor.fetchall():
+        distance = DamerauLevenshtein.distance(word, term, score_cutoff=max_distance)
+        if distance <= max_distance:
+            candidates.add((distance, -frequency, term))
+    return sorted(candidates)
+
+
+def suggest(query, threshold=60, limit=5):
+    """
+    Spelling suggestions for query from the indexed vocabulary.
+
+    A single word returns up to limit close terms, most frequent first among
+    equally close ones. Multi-word queries return the query with each word
+    replaced by its best correction. Suggestions scoring below threshold
+    (fuzz.ratio against the query) are dropped.
+    """
+    words = query.lower().split()
+    if not words:
+        return []
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        if len(words) == 1:
+            if not _is_term(words[0]):
+                return []
+            suggestions = [term for distance, _, term in _candidates(cursor, words[0]) if distance > 0]
+        else:
+            corrected = []
+            for word in words:
+                candidates = _candidates(cursor, word) if _is_term(word) else []
+                corrected.append(candidates[0][2] if candidates else word)
+            suggestions = [' '.join(corrected)] if corrected != words else []
+
+        return [s for s in suggestions if fuzz.ratio(query.lower(), s) >= threshold][:limit]
+
+    except sqlite3.Error as e:
+        logger.error(f"Error generating suggestions: {str(e)}")
+        return []
+    finally:
+        conn.close()
@@ -0,0 +1,180 @@
+import json
+
+TOURNAMENT_NAME_MAP = {
+    "OWCS Midseason": "Overwatch Champions",
+    "FCP": "FC Pro 25 World Championship",
+}
+
+# Tournaments shown on the matches dashboard, most important first. A
+# tournament takes the index of the first keyword found in its name.
+# Labels are computed at ingest, so changing either list needs a migration
+# that calls label_tournaments(cursor, relabel=True).
+PRIORITY_KEYWORDS = [
+    'FC',
+    'FCP',
+    'MSC',
+    'Hok World Cup',
+    'EWC',
+    'OWCS',
+    'OWCS Season',
+    'OWCS Midseason',
+    'Honor of Kings World Cup',
+    'Esports World Cup 2025',
+    'EWC 2025',
+    'Esports World Cup',
+    'Esports World',
+    'Esports',
+    'World Cup',
+    'PUBG Mobile World Cup',
+    'Overwatch',
+]
+NON_PRIORITY = len(PRIORITY_KEYWORDS) + 1
+
+
+def normalize_tournament_name(tournament_name: str) -> str:
+    for keyword, replacement in TOURNAMENT_NAME_MAP.items():
+        if keyword in tournament_name:
+            return replacement
+    return tournament_name
+
+
+def get_priority_index(name: str) -> int:
+    name_lower = name.lower()
+    for i, keyword in enumerate(PRIORITY_KEYWORDS):
+        if keyword.lower() in name_lower:
+            return i
+    return NON_PRIORITY
+
+
+def create_tournament_catalog_schema(cursor):
+    """
+    tournament_catalog has one row per (tournament, game) present in matches.
+    Triggers keep match_count exact on every write; the name labels are
+    filled in by label_tournaments, which writers call before committing.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tournament_catalog (
+            tournament TEXT NOT NULL,
+            game TEXT NOT NULL,
+            match_count INTEGER NOT NULL DEFAULT 0,
+            normalized_name TEXT,
+            name_key TEXT,
+            priority INTEGER,
+            is_featured INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tournament, game)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tournament_catalog_order
+        ON tournament_catalog(is_featured, priority, name_key, normalized_name)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tournament_catalog_normalized
+        ON tournament_catalog(normalized_name)
+    ''')
+    # A page's matches are read by raw tournament name
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_tournament_time ON matches(tournament, match_time)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tournament_catalog_unlabeled
+        ON tournament_catalog(tournament) WHERE normalized_name IS NULL
+    ''')
+
+    count_in = '''
+        INSERT INTO tournament_catalog (tournament, game, match_count) VALUES (new.tournament, new.game, 1)
+        ON CONFLICT (tournament, game) DO UPDATE SET match_count = match_count + 1;
+    '''
+    count_out = '''
+        UPDATE tournament_catalog SET match_count = match_count - 1
+        WHERE tournament = old.tournament AND game = old.game;
+        DELETE FROM tournament_catalog
+        WHERE tournament = old.tournament AND game = old.game AND match_count <= 0;
+    '''
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS matches_catalog_ai AFTER INSERT ON matches
+        WHEN new.tournament IS NOT NULL AND new.game IS NOT NULL BEGIN {count_in} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS matches_catalog_ad AFTER DELETE ON matches
+        WHEN old.tournament IS NOT NULL AND old.game IS NOT NULL BEGIN {count_out} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS matches_catalog_au_out AFTER UPDATE OF tournament, game ON matches
+        WHEN old.tournament IS NOT NULL AND old.game IS NOT NULL BEGIN {count_out} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS matches_catalog_au_in AFTER UPDATE OF tournament, game ON matches
+        WHEN new.tournament IS NOT NULL AND new.game IS NOT NULL BEGIN {count_in} END
+    ''')
+
+    cursor.execute('''
+        INSERT OR IGNORE INTO tournament_catalog (tournament, game, match_count)
+        SELECT tournament, game, COUNT(*) FROM matches
+        WHERE tournament IS NOT NULL AND game IS NOT NULL
+        GROUP BY tournament, game
+    ''')
+    label_tournaments(cursor)
+
+
+def label_tournaments(cursor, relabel=False):
+    """Fill normalized_name, priority and is_featured for new catalog rows"""
+    where = '' if relabel else 'WHERE normalized_name IS NULL'
+    cursor.execute(f'SELECT DISTINCT tournament FROM tournament_catalog {where}')
+    labels = []
+    for (tournament,) in cursor.fetchall():
+        normalized = normalize_tournament_name(tournament)
+        priority = get_priority_index(normalized)
+        labels.append((normalized, normalized.lower(), priority, int(priority != NON_PRIORITY), tournament))
+    cursor.executemany('''
+        UPDATE tournament_catalog SET normalized_name = ?, name_key = ?, priority = ?, is_featured = ?
+        WHERE tournament = ?
+    ''', labels)
+    return len(labels)
+
+
+def featured_tournaments_page(cursor, where_sql, params, page, per_page, scan_matches=False):
+    """
+    One page of featured tournament names in dashboard order, and how many
+    there are in total.
+
+    where_sql may only filter on game and tournament, which the catalog
+    shares with matches, unless scan_matches is set; then it can use any
+    matches column and only (tournament, game) pairs with a matching row
+    count.
+    """
+    # Writers label their rows before committing; this only catches rows
+    # inserted some other way
+    cursor.execute('SELECT 1 FROM tournament_catalog WHERE normalized_name IS NULL LIMIT 1')
+    if cursor.fetchone():
+        label_tournaments(cursor)
+        cursor.connection.commit()
+
+    if scan_matches:
+        where_sql = f"(tournament, game) IN (SELECT tournament, game FROM matches WHERE {where_sql})"
+    # Names differing only in case keep the order the first of their raw
+    # tournaments sorts in
+    cursor.execute(f'''
+        SELECT normalized_name, COUNT(*) OVER () AS total
+        FROM tournament_catalog
+        WHERE is_featured = 1 AND {where_sql}
+        GROUP BY normalized_name
+        ORDER BY MIN(priority), MIN(name_key), MIN(tournament)
+        LIMIT ? OFFSET ?
+    ''', list(params) + [per_page, max(page - 1, 0) * per_page])
+    rows = cursor.fetchall()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+
+    cursor.execute(f'''
+        SELECT COUNT(DISTINCT normalized_name) FROM tournament_catalog
+        WHERE is_featured = 1 AND {where_sql}
+    ''', params)
+    return [], cursor.fetchone()[0]
+
+
+def raw_tournament_names(cursor, names):
+    """{tournament: normalized_name} for every raw tournament behind names"""
+    cursor.execute('''
+        SELECT DISTINCT tournament, normalized_name FROM tournament_catalog
+        WHERE normalized_name IN (SELECT value FROM json_each(?))
+    ''', (json.dumps(names),))
+    return {row[0]: row[1] for row in cursor.fetchall()}
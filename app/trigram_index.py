@@ -0,0 +1,76 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shadow FTS5 indexes (tokenize='trigram') over the columns the API filters
+# with LIKE '%value%'. Each {table}_trigram is an external-content index on
+# its table, kept in sync by triggers.
+TRIGRAM_COLUMNS = {
+    'news': ('title', 'description', 'writer'),
+    'games': ('game_name', 'description'),
+    'transfers': ('player_name', 'old_team_name', 'new_team_name'),
+    'game_teams': ('team_name', 'game_name'),
+}
+
+# Trigram phrases shorter than this cannot be answered from the index
+MIN_TRIGRAM_LENGTH = 3
+
+
+def create_trigram_schema(cursor):
+    """Create and fill the {table}_trigram indexes and their sync triggers"""
+    for table, columns in TRIGRAM_COLUMNS.items():
+        fts = f'{table}_trigram'
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in columns)
+
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list}, content={table}, content_rowid=id, tokenize='trigram'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table}
+            WHEN {changed}
+            BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def substring_filter(table, columns, value):
+    """
+    Return (sql, params) for "any of columns contains value", matching
+    exactly the rows OR-ed `column LIKE '%value%'` filters match.
+
+    Goes through {table}_trigram when value is long enough and carries no
+    LIKE wildcards; otherwise falls back to the LIKE scan. The trigram
+    tokenizer folds case for non-ASCII text too ("Ö" matches "ö") while
+    LIKE only folds ASCII, so the trigram candidates are checked with the
+    LIKE filters as well.
+    """
+    columns = list(columns)
+    like_sql = "(" + " OR ".join(f"{column} LIKE ?" for column in columns) + ")"
+    like_params = [f"%{value}%"] * len(columns)
+    indexed = set(TRIGRAM_COLUMNS.get(table, ()))
+    if (len(value) >= MIN_TRIGRAM_LENGTH and '%' not in value and '_' not in value
+            and indexed.issuperset(columns)):
+        column_filter = columns[0] if len(columns) == 1 else '{' + ' '.join(columns) + '}'
+        phrase = '"' + value.replace('"', '""') + '"'
+        return (f"(id IN (SELECT rowid FROM {table}_trigram WHERE {table}_trigram MATCH ?) AND {like_sql})",
+                [f"{column_filter} : {phrase}"] + like_params)
+
+    return like_sql, like_params
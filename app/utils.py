@@ -6,9 +6,10 @@ from datetime import datetime
 from urllib.parse import urlparse
 from werkzeug.utils import secure_filename
 import requests
-from bs4 import BeautifulSoup
+from app.html_parsing import make_soup
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from app.liquipedia_client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,6 @@ logger = logging.getLogger(__name__)
 UPLOAD_FOLDER = 'static/uploads'
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 BASE_URL = 'https://liquipedia.net'
-HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
 
 from urllib.parse import urlparse, parse_qs
 
@@ -135,7 +135,7 @@ def get_html_via_api(game: str, page: str) -> str:
     """Fetch raw HTML of a specific Liquipedia page for a game"""
     try:
         url = f"{BASE_URL}/{game}/{page}"
-        res = requests.get(url, headers=HEADERS, timeout=10)
+        res = get_client().get(url)
         res.raise_for_status()
         return res.text
     except requests.RequestException as e:
@@ -146,7 +146,7 @@ def get_html_via_api(game: str, page: str) -> str:
 def extract_matches_from_html(html: str) -> dict:
     """Parse group stage matches from Liquipedia HTML"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, 'brackets')
         boxes = soup.select('div.template-box')
         if not boxes:
             return None
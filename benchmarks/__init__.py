@@ -0,0 +1,3 @@
+# Micro-benchmarks for the storage and scraping layers.
+# Run any of them with `python -m benchmarks.<module>` from the project root;
+# they work on temporary databases and never touch news.db.
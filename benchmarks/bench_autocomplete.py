@@ -0,0 +1,88 @@
+"""
+Typeahead latency: what a client pays today calling /api/search on each
+keystroke (enhanced_search.search) vs the /api/search/autocomplete index,
+typing each name one character at a time.
+
+    python -m benchmarks.bench_autocomplete [players]
+
+Reports p50/p99 over every prefix typed, plus the time of a full index
+build (which a stale index does in the background).
+"""
+import os
+import sys
+import random
+import tempfile
+import time
+
+from app import db
+
+TEAMS = ('Team Falcons', 'Team Liquid', 'Fnatic', 'Vitality', 'G2 Esports', 'NAVI', 'T1', 'Gen.G',
+         'Team Spirit', 'Team Secret', 'Cloud9', 'FaZe Clan', 'Paper Rex', 'Sentinels')
+GAMES = ('Valorant', 'Dota 2', 'Counter-Strike 2', 'League of Legends', 'Rocket League', 'Overwatch 2')
+TYPED = ('team li', 'falc', 'valo', 'player123', 'esports world', 'zzz')
+
+
+def seed(players):
+    rng = random.Random(0)
+    syllables = ('ka', 'ro', 'mi', 'zen', 'tor', 'lix', 'va', 'qu', 'no', 'shi', 'dex', 'ar')
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO transfers (unique_id, game, player_name, old_team_name, new_team_name) VALUES (?, ?, ?, ?, ?)",
+        ((f"t{i}", rng.choice(GAMES), ''.join(rng.choices(syllables, k=3)) + str(i % 1000),
+          rng.choice(TEAMS), rng.choice(TEAMS)) for i in range(players))
+    )
+    conn.executemany(
+        "INSERT INTO game_teams (game_name, team_name) VALUES (?, ?)",
+        ((game, f"{team} {suffix}") for game in GAMES for team in TEAMS for suffix in ('', 'Academy', 'Female'))
+    )
+    conn.executemany(
+        "INSERT INTO matches (uid, game, tournament, team1, team2) VALUES (?, ?, ?, ?, ?)",
+        ((f"m{i}", rng.choice(GAMES), f"Esports World Cup {2024 + i % 3} {rng.choice(GAMES)} Week {i % 8}",
+          rng.choice(TEAMS), rng.choice(TEAMS)) for i in range(players // 10))
+    )
+    conn.executemany(
+        "INSERT INTO search_logs (query, search_type, execution_time, result_count) VALUES (?, NULL, 0.01, 1)",
+        ((rng.choice(TEAMS).lower(),) for _ in range(500))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _percentiles(fn):
+    timings = []
+    for word in TYPED:
+        for end in range(1, len(word) + 1):
+            start = time.perf_counter()
+            fn(word[:end])
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    from app.migrations import migrate
+    from app.autocomplete import autocomplete, _rebuild
+    from app.enhanced_search import enhanced_search
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(players)
+
+        start = time.perf_counter()
+        index = _rebuild()
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"{players} transfers, {len(index['entries'])} suggestions, index build {build_ms:.0f} ms")
+
+        for label, fn in (("/api/search", lambda prefix: enhanced_search.search(query=prefix, per_page=10)),
+                          ("autocomplete", lambda prefix: autocomplete(prefix, 10))):
+            for _ in range(3):
+                p50, p99 = _percentiles(fn)
+            print(f"  {label:14s} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms")
+        print(f"  'team li' -> {[s['text'] for s in autocomplete('team li', 5)]}")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
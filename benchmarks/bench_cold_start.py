@@ -0,0 +1,58 @@
+"""
+Cold-start cost of the schema step across N concurrently booting workers:
+the old unversioned DDL (create_core_schema() + init_game_teams_db(), what
+init_db() used to run on every boot) vs migrate() on a database that is
+already at the latest version.
+
+    python -m benchmarks.bench_cold_start [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+import multiprocessing
+
+
+def _boot(args):
+    path, mode = args
+    from app import db
+    db.close_connection()  # every boot starts without a pooled connection
+    db.DB_PATH = path
+    start = time.perf_counter()
+    if mode == 'legacy':
+        from app.game_teams_init_db import init_game_teams_db
+        conn = db.get_connection()
+        db.create_core_schema(conn.cursor())
+        conn.commit()
+        conn.close()
+        init_game_teams_db()
+    else:
+        from app.migrations import migrate
+        migrate(legacy_dir=None)
+    return time.perf_counter() - start
+
+
+def _measure(path, mode, workers):
+    with multiprocessing.get_context('spawn').Pool(workers) as pool:
+        pool.map(_boot, [(path, mode)] * workers)  # warm interpreter imports
+        start = time.perf_counter()
+        timings = pool.map(_boot, [(path, mode)] * workers)
+        wall = time.perf_counter() - start
+    return wall, sum(timings) / len(timings), max(timings)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        _boot((path, 'migrate'))
+
+        print(f"{workers} workers booting concurrently")
+        for mode in ('legacy', 'migrate'):
+            wall, mean, worst = _measure(path, mode, workers)
+            print(f"  {mode:8s} wall {wall * 1000:8.2f} ms   "
+                  f"per-worker mean {mean * 1000:7.2f} ms   max {worst * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Per-request connection overhead: fresh sqlite3.connect() per query (the old
+get_connection) vs the pooled per-thread connection.
+
+Each simulated request runs QUERIES_PER_REQUEST small SELECTs, matching the
+fan-out of a global search.
+
+    python -m benchmarks.bench_connections [requests]
+"""
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+
+from app import db
+
+QUERIES_PER_REQUEST = 13
+
+
+def _legacy_connection():
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _run(get_conn, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        for _ in range(QUERIES_PER_REQUEST):
+            conn = get_conn()
+            conn.execute("SELECT id, title FROM news WHERE id = ?", (1,)).fetchall()
+            conn.close()
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        from app.migrations import migrate
+        migrate(legacy_dir=None)
+
+        legacy = _run(_legacy_connection, requests)
+        pooled = _run(db.get_connection, requests)
+        db.close_connection()
+
+    print(f"{requests} requests x {QUERIES_PER_REQUEST} queries")
+    print(f"  connect per query : {legacy * 1000:8.3f} ms/request")
+    print(f"  pooled connection : {pooled * 1000:8.3f} ms/request")
+    print(f"  speedup           : {legacy / pooled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+get_ewc_rank_data without live: json.load of the standings file plus the
+flatten-copy-sort it replaced vs a page of the latest ewc_standings snapshot.
+
+    python -m benchmarks.bench_ewc_standings [snapshots]
+
+Seeds the history with that many scrapes (each moving some teams' points),
+stores the last one again to check it is not duplicated, and checks every
+page against the old code run on the same scrape.
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import time
+
+from app import db
+
+WEEKS = 7
+TEAMS = 79
+CASES = (
+    {},
+    {'page': 3, 'per_page': 25},
+    {'week': 'Week 4'},
+    {'week': 'week 2', 'per_page': 5, 'page': 4},
+    {'team': 'team'},
+    {'team': 'ESPORTS', 'week': 'Week 7', 'page': 50},
+    {'team': 'no such team'},
+)
+
+
+def make_scrape(rng, teams, points):
+    data = {}
+    for week in range(1, WEEKS + 1):
+        ranked = sorted(teams, key=lambda t: -points[t][week - 1])
+        data[f"Week {week}"] = [{
+            "id": "", "Ranking": f"{i + 1}." if i % 17 else "-", "Trend": rng.choice(("-", "New", "▲2", "▼1")),
+            "Team": team, "Logo_Light": f"https://img/{i}.png", "Logo_Dark": None,
+            "Points": str(points[team][week - 1]), "Total Rank": rng.choice(("-", "500", "1000"))}
+            for i, team in enumerate(ranked)]
+    return data
+
+
+def make_scrapes(count):
+    rng = random.Random(0)
+    teams = [f"Team {name} Esports" if i % 3 else f"Ésport Ünited {i}" for i, name in
+             enumerate(f"{chr(65 + i % 26)}{i}" for i in range(TEAMS))]
+    points = {team: [rng.randrange(0, 3000, 50) for _ in range(WEEKS)] for team in teams}
+    scrapes = []
+    for _ in range(count):
+        for team in rng.sample(teams, 10):
+            points[team][rng.randrange(WEEKS)] += 100
+        scrapes.append(make_scrape(rng, teams, points))
+    return scrapes
+
+
+def legacy_page(data, week=None, team=None, page=1, per_page=10):
+    """apply_filters_and_pagination before ewc_standings, minus its comments"""
+    all_teams = []
+    for week_name, teams in data.items():
+        if week and week.lower() != week_name.lower():
+            continue
+        for record in teams:
+            if team and team.lower() not in record['Team'].lower():
+                continue
+            all_teams.append(dict(record, Week=week_name))
+
+    def sort_key(record):
+        week_num = int(record['Week'].split()[-1]) if record['Week'].split()[-1].isdigit() else 999
+        ranking = record['Ranking'].replace('.', '')
+        return (week_num, int(ranking) if ranking.isdigit() else 999)
+
+    all_teams.sort(key=sort_key)
+    total_items = len(all_teams)
+    total_pages = (total_items + per_page - 1) // per_page
+    if page < 1:
+        page = 1
+    elif page > total_pages and total_pages > 0:
+        page = total_pages
+    return all_teams[(page - 1) * per_page:page * per_page], total_items, page
+
+
+def _median_ms(fn, repeat=15):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    from app.migrations import migrate
+    from app.ewc_rank import calculate_hash
+    from app.ewc_standings import latest_snapshot_ts, standings_page, store_standings_snapshot
+
+    scrapes = make_scrapes(count)
+    latest = scrapes[-1]
+    for week_name, teams in latest.items():
+        for record in teams:
+            record["id"] = calculate_hash(week_name, record["Team"], record["Points"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        json_path = os.path.join(tmp, 'standings.json')
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(latest, f, ensure_ascii=False, indent=2)
+        migrate(legacy_dir=None)
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        for n, scrape in enumerate(scrapes):
+            store_standings_snapshot(cursor, scrape, 1750000000 + n * 3600)
+        duplicate = store_standings_snapshot(cursor, latest)
+        conn.commit()
+        snapshot_ts = latest_snapshot_ts(cursor)
+        stored = cursor.execute("SELECT COUNT(*) FROM ewc_standings").fetchone()[0]
+
+        def from_file(case):
+            with open(json_path, "r", encoding="utf-8") as f:
+                return legacy_page(json.load(f), **case)
+
+        def from_table(case):
+            return standings_page(cursor, snapshot_ts, case.get('week'), case.get('team'),
+                                  case.get('page', 1), case.get('per_page', 10))
+
+        mismatches = [case for case in CASES if from_file(case) != from_table(case)]
+        print(f"{count} snapshots, {stored} stored rows; repeated scrape stored again: {duplicate is not None}; "
+              f"pages identical to the JSON file path: {not mismatches} {mismatches or ''}")
+        for case in CASES[:5]:
+            label = ' '.join(f"{key}={value}" for key, value in case.items()) or 'page 1'
+            print(f"  {label:30s} json file {_median_ms(lambda: from_file(case)):7.2f} ms"
+                  f"   ewc_standings {_median_ms(lambda: from_table(case)):6.2f} ms")
+        conn.close()
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
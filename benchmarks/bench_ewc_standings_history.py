@@ -0,0 +1,103 @@
+"""
+/api/ewc_rank/history: the per-team arrays built at ingest vs recomputing
+the same deltas from every stored ewc_standings row of the team.
+
+    python -m benchmarks.bench_ewc_standings_history [snapshots]
+
+Checks every team's history against the recomputation, and times ingest
+with and without the history update.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app import db
+from benchmarks.bench_ewc_standings import make_scrapes
+
+
+def history_from_snapshots(cursor, team):
+    """The same history, rebuilt from all of the team's stored rows"""
+    cursor.execute("SELECT snapshot_ts, week, ranking, points FROM ewc_standings WHERE team = ? "
+                   "ORDER BY snapshot_ts, week, position", (team,))
+    snapshots = {}
+    for row in cursor.fetchall():
+        ranking = None if row['ranking'] == 999 else row['ranking']
+        snapshots.setdefault(row['snapshot_ts'], {}).setdefault(row['week'], (row['points'], ranking))
+    if not snapshots:
+        return None
+    order = sorted(snapshots)
+    latest = snapshots[order[-1]]
+    before = snapshots[order[-2]] if len(order) > 1 else {}
+
+    def delta(a, b):
+        return a - b if a is not None and b is not None else None
+
+    weeks, previous = [], None
+    for week in sorted(latest):
+        points, ranking = latest[week]
+        before_points, before_ranking = before.get(week, (None, None))
+        weeks.append({
+            "week": f"Week {week}", "points": points, "ranking": ranking,
+            "points_change": delta(points, previous[0]) if previous else None,
+            "rank_change": delta(previous[1], ranking) if previous else None,
+            "points_change_since_last_scrape": delta(points, before_points),
+            "rank_change_since_last_scrape": delta(before_ranking, ranking),
+        })
+        previous = (points, ranking)
+    return {"team": team, "snapshot_ts": order[-1], "previous_snapshot_ts": order[-2] if len(order) > 1 else None,
+            "snapshots": len(order), "weeks": weeks}
+
+
+def _median_ms(fn, repeat=15):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    from app.migrations import migrate
+    from app.ewc_standings import _insert_snapshot, get_team_history, store_standings_snapshot
+
+    scrapes = make_scrapes(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        conn = db.get_connection()
+        cursor = conn.cursor()
+
+        start = time.perf_counter()
+        for n, scrape in enumerate(scrapes):
+            store_standings_snapshot(cursor, scrape, 1750000000 + n * 3600)
+        with_history = (time.perf_counter() - start) / count * 1000
+        conn.commit()
+
+        # Plain inserts into a scratch copy of the tables, for the ingest overhead
+        cursor.execute("SAVEPOINT plain")
+        cursor.execute("DELETE FROM ewc_standings")
+        cursor.execute("DELETE FROM ewc_standings_snapshots")
+        start = time.perf_counter()
+        for n, scrape in enumerate(scrapes):
+            _insert_snapshot(cursor, scrape, 1750000000 + n * 3600)
+        without_history = (time.perf_counter() - start) / count * 1000
+        cursor.execute("ROLLBACK TO plain")
+        cursor.execute("RELEASE plain")
+
+        teams = [row[0] for row in cursor.execute("SELECT team FROM ewc_standings_history ORDER BY team")]
+        mismatches = [team for team in teams if get_team_history(cursor, team) != history_from_snapshots(cursor, team)]
+        print(f"{count} snapshots of {len(teams)} teams; histories match the raw snapshots: {not mismatches} "
+              f"{mismatches[:3] or ''}")
+        print(f"  ingest per snapshot: {without_history:.2f} ms plain, {with_history:.2f} ms with the history update")
+        team = teams[len(teams) // 2]
+        print(f"  one team: rescan snapshots {_median_ms(lambda: history_from_snapshots(cursor, team)):7.2f} ms"
+              f"   history arrays {_median_ms(lambda: get_team_history(cursor, team)):6.3f} ms")
+        conn.close()
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
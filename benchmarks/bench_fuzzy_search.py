@@ -0,0 +1,89 @@
+"""
+Fuzzy transfer search at 10k/100k/1M rows: the old SELECT * + fuzzywuzzy
+partial_ratio loop vs the cached RapidFuzz index in app.fuzzy_index.
+
+    python -m benchmarks.bench_fuzzy_search [rows ...]
+
+The old loop is only timed up to LEGACY_MAX_ROWS; beyond that it runs for
+minutes per query.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app import db
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+LEGACY_MAX_ROWS = 100000
+QUERIES = ('falcns', 'player4242', 'team liqiud')
+TEAMS = ('Team Falcons', 'Team Liquid', 'Fnatic', 'Vitality', 'G2 Esports', 'NAVI', 'T1', 'Gen.G')
+
+
+def legacy_fuzzy_search(query, threshold=70, page=1, per_page=10):
+    """The pre-index fuzzy_search_transfers"""
+    from fuzzywuzzy import fuzz
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM transfers')
+    all_records = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    matches = []
+    for record in all_records:
+        searchable_text = (f"{record.get('game', '')} {record.get('player_name', '')} "
+                           f"{record.get('old_team_name', '')} {record.get('new_team_name', '')}")
+        score = fuzz.partial_ratio(query.lower(), searchable_text.lower())
+        if score >= threshold:
+            record['fuzzy_score'] = score
+            matches.append(record)
+    matches.sort(key=lambda x: x['fuzzy_score'], reverse=True)
+    start = (page - 1) * per_page
+    return matches[start:start + per_page], len(matches)
+
+
+def seed(rows):
+    conn = db.get_connection()
+    conn.execute('DELETE FROM transfers')
+    conn.executemany(
+        'INSERT INTO transfers (unique_id, game, player_name, old_team_name, new_team_name) VALUES (?, ?, ?, ?, ?)',
+        ((f"t{i}", 'valorant', f"player{i}", TEAMS[i % len(TEAMS)], TEAMS[(i + 3) % len(TEAMS)])
+         for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _ms(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    from app.migrations import migrate
+    from app.fuzzy_index import fuzzy_search, clear_indexes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+
+        for rows in sizes:
+            seed(rows)
+            clear_indexes()
+            build_ms, _ = _ms(fuzzy_search, 'transfers', QUERIES[0])
+            print(f"{rows} transfers (first call builds the index: {build_ms:.0f} ms)")
+            for query in QUERIES:
+                cached_ms, (_, total) = _ms(fuzzy_search, 'transfers', query)
+                line = f"  {query:12s} cached index {cached_ms:9.1f} ms"
+                if rows <= LEGACY_MAX_ROWS:
+                    legacy_ms, (_, legacy_total) = _ms(legacy_fuzzy_search, query)
+                    line += f"   legacy loop {legacy_ms:9.1f} ms   matches {total} vs {legacy_total}"
+                else:
+                    line += f"   legacy loop  (skipped)   matches {total}"
+                print(line)
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+/api/game_matches throughput with and without the per-request
+init_game_matches_db() DDL the GET handler used to run.
+
+Requests go through the Flask test client against a temporary database
+seeded with MATCHES game matches.
+
+    python -m benchmarks.bench_game_matches [requests]
+"""
+import os
+import sys
+import json
+import tempfile
+import time
+
+from app import db
+
+MATCHES = 2000
+GAMES = ['valorant', 'dota2', 'counterstrike', 'leagueoflegends', 'rocketleague']
+
+
+def _seed():
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    for t in range(MATCHES // 20):
+        game = GAMES[t % len(GAMES)]
+        cursor.execute('INSERT INTO tournaments (game, name, link) VALUES (?, ?, ?)',
+                       (game, f'Tournament {t}', f'/{game}/tournament_{t}'))
+        tournament_id = cursor.lastrowid
+        for m in range(20):
+            match_id = f'{t}-{m}'
+            cursor.execute('''
+                INSERT INTO game_matches (tournament_id, match_id, status, team1, team2,
+                                          timestamp, stream_links)
+                VALUES (?, ?, 'Upcoming', ?, ?, ?, ?)
+            ''', (tournament_id, match_id, f'Team {m}', f'Team {m + 1}',
+                  1752000000 + t * 3600 + m * 60, json.dumps([])))
+            cursor.execute('INSERT INTO matches_games (match_id, game) VALUES (?, ?)', (match_id, game))
+    conn.commit()
+    conn.close()
+
+
+def _throughput(client, requests):
+    start = time.perf_counter()
+    for i in range(requests):
+        response = client.get(f'/api/game_matches?game=valorant,dota2&page={i % 5 + 1}')
+        assert response.status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        from app import create_app
+        from app.game_matches_init_db import init_game_matches_db
+        app = create_app()
+        legacy_mode = {'enabled': False}
+
+        @app.before_request
+        def legacy_ddl():
+            if legacy_mode['enabled']:
+                init_game_matches_db()
+
+        _seed()
+        client = app.test_client()
+        current = _throughput(client, requests)
+        legacy_mode['enabled'] = True
+        legacy = _throughput(client, requests)
+        db.close_connection()
+
+    print(f"{requests} GET /api/game_matches over {MATCHES} matches")
+    print(f"  DDL on every GET  : {legacy:8.1f} req/s")
+    print(f"  migrated at boot  : {current:8.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
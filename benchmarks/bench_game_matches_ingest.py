@@ -0,0 +1,169 @@
+"""
+/game_matches?live=true ingest: the per-row upserts it replaced (a commit
+after every tournament, match and match-game link) vs
+save_scraped_game_matches writing the whole scrape in one transaction.
+
+    python -m benchmarks.bench_game_matches_ingest [matches per scrape] [scrapes]
+
+Each scrape is the scrape_matches() shape: most matches re-sent unchanged,
+some with a new score or status, some new. Counts the commits that wrote
+something (in WAL mode each is one fsync of the WAL with synchronous=FULL;
+with NORMAL they are synced at checkpoints, in proportion to the WAL frames
+written) and checks both versions leave the same rows behind.
+"""
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import time
+
+from app import db
+
+GAME = 'valorant'
+TOURNAMENTS = 40
+
+
+def make_match(rng, i):
+    return {
+        "match_id": f"m{i}", "team1": f"team{rng.randint(0, 300)}", "team1_url": "", "logo1_light": "",
+        "logo1_dark": "", "team2": f"team{rng.randint(0, 300)}", "team2_url": "", "logo2_light": "",
+        "logo2_dark": "", "timestamp": 1735689600 + i * 600, "match_time": "", "format": "Bo3", "score": "",
+        "stream_link": [f"https://twitch.tv/{i % 9}"], "details_link": f"/m/{i}", "group": "A",
+    }
+
+
+def make_scrapes(size, count):
+    rng = random.Random(0)
+    current = {i: ("Upcoming", rng.randrange(TOURNAMENTS), make_match(rng, i)) for i in range(size)}
+    scrapes = []
+    for n in range(count):
+        if n:
+            for i in rng.sample(sorted(current), size // 10):
+                _, tournament, match = current[i]
+                current[i] = ("Completed", tournament, dict(match, score=f"{rng.randint(0, 2)}:{rng.randint(0, 2)}"))
+            for i in range(size * n, size * n + size // 20):
+                current[i] = ("Upcoming", rng.randrange(TOURNAMENTS), make_match(rng, i))
+        data = {"Upcoming": {}, "Completed": {}}
+        for status, tournament, match in current.values():
+            entry = data[status].setdefault(f"Tournament {tournament}", {
+                "tournament_link": f"/tournament/{tournament}", "tournament_icon": f"{tournament}.png",
+                "matches": []})
+            entry["matches"].append(dict(match))
+        scrapes.append(data)
+    return scrapes
+
+
+def legacy_save(conn, game, match_data):
+    """The live branch of the /game_matches route before the batch writer"""
+    from app.crud.game_matches_crud import insert_or_update_match_game
+    cursor = conn.cursor()
+    for status, tournaments in match_data.items():
+        for tournament_name, tournament_data in tournaments.items():
+            cursor.execute('''
+                INSERT INTO tournaments (game, name, link, icon) VALUES (?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET game = excluded.game, name = excluded.name,
+                    icon = excluded.icon, updated_at = CURRENT_TIMESTAMP
+            ''', (game, tournament_name, tournament_data["tournament_link"], tournament_data["tournament_icon"]))
+            conn.commit()
+            cursor.execute("SELECT id FROM tournaments WHERE link = ?", (tournament_data["tournament_link"],))
+            tournament_id = cursor.fetchone()['id']
+            for match in tournament_data["matches"]:
+                if match["match_id"]:
+                    cursor.execute('''
+                        INSERT INTO game_matches (tournament_id, match_id, status, team1, team1_url, logo1_light,
+                            logo1_dark, team2, team2_url, logo2_light, logo2_dark, timestamp, match_time, format,
+                            score, stream_links, details_link, group_name)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(match_id) DO UPDATE SET status = excluded.status, team1 = excluded.team1,
+                            team1_url = excluded.team1_url, logo1_light = excluded.logo1_light,
+                            logo1_dark = excluded.logo1_dark, team2 = excluded.team2, team2_url = excluded.team2_url,
+                            logo2_light = excluded.logo2_light, logo2_dark = excluded.logo2_dark,
+                            timestamp = excluded.timestamp, match_time = excluded.match_time,
+                            format = excluded.format, score = excluded.score, stream_links = excluded.stream_links,
+                            details_link = excluded.details_link, group_name = excluded.group_name,
+                            updated_at = CURRENT_TIMESTAMP
+                    ''', (tournament_id, match["match_id"], status, match["team1"], match["team1_url"],
+                          match["logo1_light"], match["logo1_dark"], match["team2"], match["team2_url"],
+                          match["logo2_light"], match["logo2_dark"], match["timestamp"], match["match_time"],
+                          match["format"], match["score"], json.dumps(match["stream_link"]), match["details_link"],
+                          match.get("group")))
+                    conn.commit()
+                    insert_or_update_match_game(conn, match["match_id"], game)
+
+
+def _stored_rows(conn):
+    tournaments = conn.execute("SELECT id, game, name, link, icon FROM tournaments ORDER BY link").fetchall()
+    matches = conn.execute(
+        "SELECT tournament_id, match_id, status, team1, team2, timestamp, score, stream_links, group_name "
+        "FROM game_matches ORDER BY match_id").fetchall()
+    links = conn.execute("SELECT match_id, game FROM matches_games ORDER BY match_id").fetchall()
+    return [[tuple(row) for row in rows] for rows in (tournaments, matches, links)]
+
+
+def _ingest(path, save, scrapes, synchronous):
+    """Seconds, commits that wrote, and WAL frames written per scrape"""
+    db.close_connection()
+    db.DB_PATH = path
+    conn = db.get_connection()
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    writes = {'commits': 0, 'changes': conn.total_changes}
+
+    def count_commit(statement):
+        if statement == 'COMMIT' and conn.total_changes != writes['changes']:
+            writes['commits'] += 1
+            writes['changes'] = conn.total_changes
+
+    conn.set_trace_callback(count_commit)
+    elapsed, commits, frames, results = [], [], [], []
+    for scrape in scrapes:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        writes['commits'] = 0
+        start = time.perf_counter()
+        results.append(save(conn, GAME, scrape))
+        elapsed.append(time.perf_counter() - start)
+        commits.append(writes['commits'])
+        frames.append(conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()[1])
+    conn.set_trace_callback(None)
+    rows = _stored_rows(conn)
+    conn.close()
+    return elapsed, commits, frames, results, rows
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    from app.migrations import migrate
+    from app.crud.game_matches_crud import save_scraped_game_matches
+
+    scrapes = make_scrapes(size, count)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'base.db')
+        db.DB_PATH = base
+        migrate(legacy_dir=None)
+        db.close_connection()
+
+        runs = {}
+        for synchronous in ('NORMAL', 'FULL'):
+            for name, save in (('per-row commits', legacy_save), ('one transaction', save_scraped_game_matches)):
+                path = os.path.join(tmp, f"{name}-{synchronous}.db".replace(' ', '-'))
+                shutil.copy(base, path)
+                runs[name, synchronous] = _ingest(path, save, scrapes, synchronous)
+        db.close_connection()
+
+    legacy_rows = runs['per-row commits', 'NORMAL'][4]
+    batch = runs['one transaction', 'NORMAL']
+    print(f"{count} scrapes of {size} matches in {TOURNAMENTS} tournaments; same stored rows: "
+          f"{legacy_rows == batch[4]}")
+    for n, result in enumerate(batch[3]):
+        print(f"  scrape {n + 1}: {result}")
+    for (name, synchronous), (elapsed, commits, frames, _, _) in runs.items():
+        print(f"  {name:16s} synchronous={synchronous:6s} {sum(elapsed) / count * 1000:8.1f} ms/scrape"
+              f"  commits (WAL fsyncs at FULL) {sum(commits) / count:7.1f}/scrape"
+              f"  WAL frames {sum(frames) / count:7.1f}/scrape")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Global search latency: the old fan-out over 13 per-table FTS5 tables vs one
+bm25 query against the unified search_documents index.
+
+    python -m benchmarks.bench_global_search [rows_per_table]
+
+The legacy *_fts tables are recreated next to search_documents in the same
+database and only tables that both paths index are seeded, so they rank the
+same documents.
+"""
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+
+from app import db
+
+QUERIES = ('falcons', 'team liquid', 'valorant', 'player42', 'zzznomatch')
+
+# (name, fts table, source table) exactly as the old fts_search_* functions used them
+LEGACY_TABLES = (
+    ('news', 'news_fts', 'news'), ('teams', 'teams_fts', 'teams'),
+    ('events', 'events_fts', 'events'), ('games', 'games_fts', 'games'),
+    ('matches', 'matches_fts', 'matches'),
+    ('prize_distribution', 'prize_distribution_fts', 'prize_distribution'),
+    ('ewc_info', 'ewc_info_fts', 'ewc_info'),
+    ('group_matches', 'group_matches_fts', 'group_matches'),
+    ('transfers', 'transfers_fts', 'transfers'),
+    ('global_matches', 'global_matches_fts', 'global_matches'),
+    ('ewc_teams_players', 'ewc_teams_players_fts', 'ewc_teams_players'),
+    ('player_information', 'player_information_fts', 'player_information'),
+    ('team_information', 'team_information_fts', 'team_information'),
+)
+
+TEAMS = ('Team Falcons', 'Team Liquid', 'Fnatic', 'Vitality', 'G2 Esports', 'NAVI', 'T1', 'Gen.G')
+GAMES = ('valorant', 'dota2', 'counterstrike', 'leagueoflegends', 'rocketleague')
+
+
+def seed(cursor, rows):
+    for i in range(rows):
+        team, other, game = TEAMS[i % len(TEAMS)], TEAMS[(i + 3) % len(TEAMS)], GAMES[i % len(GAMES)]
+        cursor.execute("INSERT INTO news (title, description, writer) VALUES (?, ?, ?)",
+                       (f"{team} win {game} week {i}", f"Recap of {team} vs {other} in {game}", f"writer{i % 40}"))
+        cursor.execute("INSERT INTO transfers (unique_id, game, player_name, old_team_name, new_team_name) "
+                       "VALUES (?, ?, ?, ?, ?)", (f"t{i}", game, f"player{i}", team, other))
+        cursor.execute("INSERT INTO ewc_teams_players (game, team_name, tournament, players) VALUES (?, ?, ?, ?)",
+                       (game, f"{team} {i}", f"EWC {game}", f'["player{i}", "player{i + 1}"]'))
+        cursor.execute("INSERT INTO player_information (game, player_page_name, data) VALUES (?, ?, ?)",
+                       (game, f"player{i}", f'{{"team": "{team}", "role": "rifler"}}'))
+
+
+def legacy_global_search(query, per_page=10):
+    """The pre-unification fan-out: a COUNT and a ranked SELECT per table"""
+    per_table = max(1, per_page // len(LEGACY_TABLES))
+    results, total = {}, 0
+    fts_query = query.replace('"', '""')
+    for name, fts_table, table in LEGACY_TABLES:
+        conn = db.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {fts_table} WHERE {fts_table} MATCH ?", (fts_query,))
+            total += cursor.fetchone()[0]
+            cursor.execute(f'''
+                SELECT t.*, rank FROM {fts_table}
+                JOIN {table} t ON {fts_table}.rowid = t.id
+                WHERE {fts_table} MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET 0
+            ''', (fts_query, per_table))
+            results[name] = [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error:
+            results[name] = []
+        finally:
+            conn.close()
+    return results, total
+
+
+def _bench(fn, repeat):
+    """Median ms per query"""
+    medians = {}
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(query, 1, 10)
+            timings.append((time.perf_counter() - start) * 1000)
+        medians[query] = sorted(timings)[repeat // 2]
+    return medians
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    from app.migrations import migrate
+    from app.fts_search import fts_global_search
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        # Recreate the legacy per-table FTS tables and triggers alongside search_documents
+        db.create_core_schema(cursor)
+        seed(cursor, rows)
+        for _, fts_table, _ in LEGACY_TABLES:
+            try:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            except sqlite3.Error:
+                pass
+        conn.commit()
+        conn.close()
+
+        print(f"{rows} rows in each of news, transfers, ewc_teams_players, player_information")
+        for label, fn in (("13-table fan-out", lambda q, p, n: legacy_global_search(q, n)),
+                          ("search_documents", fts_global_search)):
+            fn(QUERIES[0], 1, 10)
+            medians = _bench(fn, 21)
+            print(f"  {label:18s} " + "  ".join(f"{query} {ms:6.2f} ms" for query, ms in medians.items()))
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
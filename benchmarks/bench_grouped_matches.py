@@ -0,0 +1,134 @@
+"""
+get_grouped_matches: DATE(m.timestamp, 'unixepoch') filters with a second
+COUNT(*) join (as it was) vs timestamp ranges, counted with COUNT(*) OVER ()
+in the same pass whenever a game, day or tournament filter is set.
+
+    python -m benchmarks.bench_grouped_matches [rows]
+
+Asserts that each filter's query plan stays index-backed (no full scan of
+game_matches, the game filter read from the covering matches_games index),
+and checks the pages and totals against the old queries in UTC.
+"""
+import os
+import sys
+import random
+import tempfile
+import time
+
+from app import db
+
+GAMES = ('valorant', 'dota2', 'counterstrike', 'rocketleague', 'overwatch', 'pubg')
+START = 1735689600  # 2025-01-01 UTC
+CASES = (
+    {},
+    {'day': ['2025-03-01']},
+    {'day': ['2025-03-01', '2025-03-02', 'March 3']},
+    {'game': ['valorant', 'dota2']},
+    {'game': ['valorant'], 'day': ['2025-06-10'], 'page': 2, 'per_page': 5},
+    {'tournament': ['Tournament 7', 'Tournament 8']},
+    {'status': 'completed', 'day': ['2025-02-14'], 'tournament': ['Tournament 7']},
+    {'game': ['pubg'], 'page': 10000},
+)
+# Filter -> index its plan must use
+PLAN_INDEXES = (
+    ({'day': ['2025-03-01']}, 'idx_game_matches_timestamp'),
+    ({'day': ['2025-03-01', '2025-03-02'], 'timezone': 'Asia/Tokyo'}, 'idx_game_matches_timestamp'),
+    ({'game': ['valorant', 'dota2']}, 'COVERING INDEX idx_matches_games_game_match'),
+    ({'game': ['valorant'], 'day': ['2025-06-10']}, 'idx_game_matches_timestamp'),
+    ({'tournament': ['Tournament 7']}, 'idx_tournaments_name'),
+)
+
+
+def seed(rows):
+    rng = random.Random(0)
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO tournaments (game, name, link, icon) VALUES (?, ?, ?, ?)",
+        ((GAMES[i % len(GAMES)], f"Tournament {i}", f"/tournament/{i}", f"{i}.png") for i in range(200))
+    )
+    # Distinct timestamps and one game per match keep the old ORDER BY total
+    conn.executemany(
+        "INSERT INTO game_matches (tournament_id, match_id, status, team1, team2, timestamp, match_time, "
+        "stream_links) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ((rng.randint(1, 200), f"m{i}", rng.choice(('upcoming', 'completed')), f"team{rng.randint(0, 300)}",
+          f"team{rng.randint(0, 300)}", START + i * 315 + rng.randrange(300), '', '[]') for i in range(rows))
+    )
+    conn.executemany("INSERT INTO matches_games (match_id, game) VALUES (?, ?)",
+                     ((f"m{i}", rng.choice(GAMES)) for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def legacy_page(conn, game=None, day=None, tournament=None, status=None, page=1, per_page=10):
+    """The page and total queries of get_grouped_matches before the rewrite"""
+    where, params = '', []
+    for column, values in (('mg.game', game), ("DATE(m.timestamp, 'unixepoch')", day), ('t.name', tournament)):
+        if values:
+            where += f" AND {column} IN ({','.join(['?'] * len(values))})"
+            params.extend(values)
+    if status:
+        where += " AND m.status = ?"
+        params.append(status)
+    joins = ("FROM game_matches m JOIN tournaments t ON m.tournament_id = t.id "
+             "JOIN matches_games mg ON m.match_id = mg.match_id WHERE 1=1")
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT m.id, mg.game {joins}{where} ORDER BY m.timestamp ASC LIMIT ? OFFSET ?",
+                   params + [per_page, (page - 1) * per_page])
+    rows = [tuple(row) for row in cursor.fetchall()]
+    cursor.execute(f"SELECT COUNT(*) {joins}{where}", params)
+    return rows, cursor.fetchone()[0]
+
+
+def _page_ids(grouped):
+    return sorted((match['id'], game['game']) for t in grouped for game in t['games'] for match in game['matches'])
+
+
+def _median_ms(fn, repeat=7):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    from app.migrations import migrate
+    from app.crud.game_matches_crud import get_grouped_matches, grouped_matches_filters
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(rows)
+        conn = db.get_connection()
+
+        joins = ("FROM game_matches m JOIN tournaments t ON m.tournament_id = t.id "
+                 "JOIN matches_games mg ON m.match_id = mg.match_id")
+        for filters, index in PLAN_INDEXES:
+            where_sql, params = grouped_matches_filters(**filters)
+            plan = ' | '.join(row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT m.*, COUNT(*) OVER () {joins} WHERE {where_sql} "
+                f"ORDER BY m.timestamp, m.id, mg.game LIMIT 10", params))
+            assert index in plan, f"{filters}: {plan}"
+            assert 'SCAN m' not in plan, f"{filters}: {plan}"
+
+        mismatches = []
+        for case in CASES:
+            grouped, total = get_grouped_matches(conn, **case)
+            legacy_rows, legacy_total = legacy_page(conn, **case)
+            if (_page_ids(grouped), total) != (sorted(legacy_rows), legacy_total):
+                mismatches.append(case)
+        print(f"{rows} game matches; plans index-backed; pages and totals match the old queries: "
+              f"{not mismatches} {mismatches or ''}")
+
+        for case in CASES[:6]:
+            label = ' '.join(f"{key}={value}" for key, value in case.items()) or 'no filters'
+            print(f"  {label:45s} DATE() + COUNT join {_median_ms(lambda: legacy_page(conn, **case)):8.2f} ms"
+                  f"   ranges {_median_ms(lambda: get_grouped_matches(conn, **case)):8.2f} ms")
+        conn.close()
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Parse throughput of every Liquipedia extractor with each HTML backend:
+html.parser on the whole page (what every scraper did before), html.parser
+and lxml restricted to the subtrees the extractor reads, and lxml on the
+whole page. "parse" times make_soup() alone as the extractor calls it;
+"extract" times the whole extractor on a page replayed from a response
+cache, so it includes the selectors and a local gzip read.
+
+    python -m benchmarks.bench_html_parsing [rounds] [fixture_dir]
+
+fixture_dir is a LIQUIPEDIA_CACHE_DIR recorded with LIQUIPEDIA_CACHE=cache
+holding the pages in liquipedia_fixtures.PAGES; without it the synthetic
+renders are recorded and used. Every backend must give exactly the output
+of html.parser on the whole page.
+"""
+import gc
+import os
+import sys
+import time
+import tempfile
+
+from benchmarks.liquipedia_fixtures import SCRAPER_PAGES, record_fixtures, scrapers
+
+# The STRAINERS entry each extractor parses with
+STRAINED = {
+    "scrape_matches": "matches",
+    "game_matches.scrape_matches": "matches",
+    "parse_transfer_html": "transfers",
+    "get_team_info": None,
+    "get_player_info": None,
+    "fetch_teams_players": None,
+    "extract_matches_from_html": "brackets",
+    "parse_ewc_games_html": "tables",
+    "extract_standings_from_html": "standings",
+}
+
+# (label, parser, strain); the first is the reference output
+BACKENDS = [
+    ("html.parser, whole page", "html.parser", False),
+    ("html.parser, strained", "html.parser", True),
+    ("lxml, whole page", "lxml", False),
+    ("lxml, strained", "lxml", True),
+]
+
+
+def _median_ms(fn, rounds):
+    timings = []
+    for _ in range(rounds):
+        # Trees are full of reference cycles; collect them outside the timing
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[rounds // 2]
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    fixture_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    from app import html_parsing
+    from app.html_parsing import make_soup
+    from app.page_revisions import fetch_page_html
+    from app.response_cache import ResponseCache, set_response_cache
+
+    if not html_parsing.HAVE_LXML:
+        print("lxml is not installed; only html.parser can be compared")
+    backends = [b for b in BACKENDS if html_parsing.HAVE_LXML or b[1] != "lxml"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if fixture_dir is None:
+            fixture_dir = os.path.join(tmp, "fixtures")
+            record_fixtures(ResponseCache(fixture_dir))
+        set_response_cache(ResponseCache(fixture_dir, replay=True))
+        extractors = scrapers()
+
+        pages = {name: fetch_page_html(*page) for name, page in SCRAPER_PAGES.items()}
+        sizes = {name: len(html.encode("utf-8")) for name, html in pages.items()}
+        expected, parse_ms, extract_ms = {}, {}, {}
+        configured = html_parsing.HTML_PARSER, html_parsing.STRAIN
+        for label, parser, strain in backends:
+            html_parsing.set_html_parser(parser, strain)
+            outputs = {name: extract() for name, extract in extractors.items()}
+            if not expected:
+                expected = outputs
+            different = [name for name in outputs if outputs[name] != expected[name]]
+            parse_ms[label] = {name: _median_ms(lambda: make_soup(pages[name], STRAINED[name]), rounds)
+                               for name in extractors}
+            extract_ms[label] = {name: _median_ms(extract, rounds) for name, extract in extractors.items()}
+            print(f"{label:24s} identical output: {'yes' if not different else 'NO: ' + ', '.join(different)}")
+        html_parsing.set_html_parser(*configured)
+        set_response_cache(None)
+
+    reference = backends[0][0]
+    for title, timings in (("parse", parse_ms), ("extract", extract_ms)):
+        print(f"\n{title}: ms per page (median of {rounds}), speedup over {reference}")
+        print(f"  {'extractor':28s} {'KiB':>5s}" + "".join(f" {label:>24s}" for label, _, _ in backends))
+        for name in extractors:
+            cells = "".join(f" {timings[label][name]:9.1f} ms {timings[reference][name] / timings[label][name]:5.1f}x   "
+                            for label, _, _ in backends)
+            print(f"  {name:28s} {sizes[name] / 1024:5.0f}{cells}")
+        total_mib = sum(sizes.values()) / 1024 / 1024
+        for label, _, _ in backends:
+            total = sum(timings[label].values())
+            print(f"  {label:24s} all pages {total:8.1f} ms  {total_mib / (total / 1000):6.2f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+List endpoint pagination: LIMIT/OFFSET vs KeysetPagination over
+(sort column, id) for news and transfers, at page 1 and deep pages.
+
+    python -m benchmarks.bench_keyset_pagination [rows]
+
+Also walks every keyset page for each sort order (with NULL and duplicate
+sort values in the data) and checks it against a plain ORDER BY.
+"""
+import os
+import sys
+import random
+import tempfile
+import time
+
+from app import db
+
+PER_PAGE = 20
+GAMES = ('valorant', 'dota2', 'counterstrike', 'rocketleague')
+
+
+def seed(rows):
+    rng = random.Random(0)
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO transfers (unique_id, game, date, player_name, old_team_name, new_team_name, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((f"t{i}", rng.choice(GAMES),
+          None if rng.random() < 0.05 else f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+          None if rng.random() < 0.02 else f"player{rng.randint(0, rows // 3)}",
+          f"team{rng.randint(0, 50)}", None if rng.random() < 0.1 else f"team{rng.randint(0, 50)}",
+          f"2024-01-01 00:{i % 60:02d}:00") for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO news (title, description, writer, created_at) VALUES (?, ?, ?, ?)",
+        ((f"title {rng.randint(0, rows // 10)}", 'd', f"writer{i % 20}",
+          f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00") for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median_ms(fn, repeat=7):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def _walk(fetch):
+    """ids of every page, following next_cursor from the first page"""
+    ids, cursor = [], ''
+    while True:
+        items, cursor = fetch(cursor)
+        ids.extend(item['id'] for item in items)
+        if not cursor:
+            return ids
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    from app.migrations import migrate
+    from app.news import get_news_items
+    from app.player_transfers import get_transfers_from_db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(rows)
+
+        conn = db.get_connection()
+        mismatches = []
+        for sort_by in ('date', 'player_name', 'old_team_name', 'new_team_name', 'created_at'):
+            for order in ('asc', 'desc'):
+                for game in (None, 'dota2'):
+                    where, params = ('WHERE game = ?', [game]) if game else ('', [])
+                    expected = [row[0] for row in conn.execute(
+                        f"SELECT id FROM transfers {where} ORDER BY {sort_by} {order}, id {order}", params)]
+                    walked = _walk(lambda c: (lambda r: (r['transfers'], r['pagination']['next_cursor']))(
+                        get_transfers_from_db(game=game, per_page=500, sort_by=sort_by, sort_order=order, cursor=c)))
+                    if walked != expected:
+                        mismatches.append((sort_by, order, game))
+        for sort in ('created_at', 'title'):
+            expected = [row[0] for row in conn.execute(f"SELECT id FROM news ORDER BY {sort} DESC, id DESC")]
+            walked = _walk(lambda c: (lambda r: (r['news'], r['pagination']['next_cursor']))(
+                get_news_items(per_page=100, sort=sort, cursor=c)))
+            if walked != expected:
+                mismatches.append(('news', sort))
+        conn.close()
+        print(f"{rows} transfers and news rows; every keyset walk matches ORDER BY: {not mismatches} {mismatches or ''}")
+
+        # A deep page whose offset is a whole number of 100-row news pages
+        deep = (rows // PER_PAGE - 10) // 5 * 5 + 1
+        transfers_cursor = get_transfers_from_db(per_page=PER_PAGE * (deep - 1), cursor='')['pagination']['next_cursor']
+        news_cursor = get_news_items(per_page=100, cursor='')['pagination']['next_cursor']
+        for _ in range(PER_PAGE * (deep - 1) // 100 - 1):
+            news_cursor = get_news_items(per_page=100, cursor=news_cursor)['pagination']['next_cursor']
+
+        cases = (
+            ('transfers by date', lambda p: get_transfers_from_db(page=p, per_page=PER_PAGE),
+             lambda c: get_transfers_from_db(per_page=PER_PAGE, cursor=c), transfers_cursor),
+            ('news by created_at', lambda p: get_news_items(page=p, per_page=PER_PAGE),
+             lambda c: get_news_items(per_page=PER_PAGE, cursor=c), news_cursor),
+        )
+        for label, offset_fn, keyset_fn, deep_cursor in cases:
+            print(f"  {label:20s} offset page 1 {_median_ms(lambda: offset_fn(1)):7.2f} ms"
+                  f"   page {deep} {_median_ms(lambda: offset_fn(deep)):7.2f} ms")
+            print(f"  {'':20s} keyset page 1 {_median_ms(lambda: keyset_fn('')):7.2f} ms"
+                  f"   page {deep} {_median_ms(lambda: keyset_fn(deep_cursor)):7.2f} ms")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+LiquipediaClient against a local stand-in for the parse API: a fresh
+requests.get per call (what most scrapers did) vs the pooled client, plus
+checks of gzip, the token bucket and retries on 503/429 with Retry-After.
+
+    python -m benchmarks.bench_liquipedia_client [calls]
+
+The limiter intervals are turned off for the latency comparison and set
+explicitly for the limiter check, so nothing here touches the network.
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+os.environ.setdefault("LIQUIPEDIA_PARSE_INTERVAL", "0")
+os.environ.setdefault("LIQUIPEDIA_REQUEST_INTERVAL", "0")
+
+import requests
+
+# About the size of a Liquipedia:Matches parse response, as compressible
+PAGE = json.dumps({"parse": {"text": {"*": "".join(
+    f"<div class='match-info'><span class='name'>team{i}</span><span>{i % 3}:{i % 2}</span></div>"
+    for i in range(3000))}}}).encode()
+# Compressed once, so the server's gzip time is not charged to the client
+PAGE_GZIP = gzip.compress(PAGE, 5)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # kept-alive response would stall on delayed ACKs
+    disable_nagle_algorithm = True
+    failures = {}
+    connections = set()
+    bytes_sent = 0
+
+    def do_GET(self):
+        Handler.connections.add(self.client_address)
+        query = parse_qs(urlparse(self.path).query)
+        page = query.get("page", [""])[0]
+        remaining = Handler.failures.get(page, 0)
+        if remaining:
+            Handler.failures[page] = remaining - 1
+            status, body, headers = (429, b"slow down", {"Retry-After": "0"}) if page == "throttled" \
+                else (503, b"unavailable", {})
+        else:
+            status, body, headers = 200, PAGE, {"Content-Type": "application/json"}
+        if status == 200 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = PAGE_GZIP
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        Handler.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _run(fn, calls):
+    Handler.connections.clear()
+    Handler.bytes_sent = 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        assert fn().json()["parse"]
+    return (time.perf_counter() - start) / calls * 1000, len(Handler.connections), Handler.bytes_sent / calls
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    from app import liquipedia_client
+    from app.liquipedia_client import LiquipediaClient, TokenBucket
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/valorant/api.php"
+    params = {"action": "parse", "page": "Liquipedia:Matches", "format": "json", "prop": "text"}
+
+    def bare():
+        # The old scrapers: no session, no gzip negotiation of their own
+        return requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"},
+                            timeout=10)
+
+    client = LiquipediaClient()
+    bare_ms, bare_conns, bare_bytes = _run(bare, calls)
+    pooled_ms, pooled_conns, pooled_bytes = _run(lambda: client.get(url, params=params), calls)
+    print(f"{calls} parse calls to a local server")
+    print(f"  requests.get per call   {bare_ms:6.2f} ms/call  {bare_conns:4d} connections  {bare_bytes / 1024:7.1f} KiB/call")
+    print(f"  LiquipediaClient        {pooled_ms:6.2f} ms/call  {pooled_conns:4d} connections  "
+          f"{pooled_bytes / 1024:7.1f} KiB/call (gzip)")
+
+    Handler.failures = {"flaky": 2, "throttled": 1}
+    liquipedia_client.BACKOFF_BASE = 0.01
+    flaky = client.get(url, params=dict(params, page="flaky"))
+    throttled = client.get(url, params=dict(params, page="throttled"))
+    Handler.failures = {"down": 10}
+    down = client.get(url, params=dict(params, page="down"))
+    print(f"  503 twice then 200 -> {flaky.status_code}; 429 with Retry-After -> {throttled.status_code}; "
+          f"always 503 -> {down.status_code} after {client.max_retries} retries")
+
+    bucket = TokenBucket(interval=0.05, burst=3)
+    start = time.perf_counter()
+    for _ in range(23):
+        time.sleep(bucket.reserve())
+    print(f"  token bucket, 0.05 s interval, burst 3: 23 calls in {time.perf_counter() - start:.2f} s (expected ~1.00)")
+    bucket = TokenBucket(interval=60, burst=1)
+    bucket.reserve()
+    try:
+        bucket.reserve(max_wait=5)
+        print("  max_wait not enforced")
+    except liquipedia_client.RateLimitExceeded as e:
+        print(f"  second call within max_wait=5 of a 60 s interval: {e}")
+
+    for key, stats in client.metrics.summary().items():
+        print(f"  metrics {key}: {stats}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
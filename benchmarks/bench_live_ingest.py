@@ -0,0 +1,173 @@
+"""
+save_live_matches_to_db throughput for 5k-match batches: the per-match
+duplicate SELECT + INSERT it replaced vs one INSERT ... SELECT ... RETURNING
+probing matches.match_key.
+
+    python -m benchmarks.bench_live_ingest [stored rows] [batches]
+
+The per-match version is also timed on its first batch without the
+matches(tournament, match_time) index, i.e. the full scan per match it
+did before the tournament catalog added that index.
+
+Each batch mixes new matches, re-sent matches (some with the teams
+swapped), repeats within the batch and invalid N/A vs N/A rows. Both
+versions ingest the same batches into copies of the same database, and
+their results and stored rows are compared.
+"""
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import time
+import uuid
+
+from app import db
+from app.matches_dashborad.match_model import MatchModel
+
+BATCH_SIZE = 5000
+GAMES = ('valorant', 'dota2', 'counterstrike')
+
+
+def make_match(rng, i, game=None):
+    return MatchModel(
+        game=game or rng.choice(GAMES), status=rng.choice(('Upcoming', 'Completed')),
+        tournament=f"Cup {i % 40}", tournament_link='/cup', tournament_icon='cup.png',
+        team1=f"team{rng.randint(0, 5000)}", team1_url='', logo1_light='', logo1_dark='',
+        team2=f"team{rng.randint(0, 5000)}", team2_url='', logo2_light='', logo2_dark='',
+        score=rng.choice(('', '1:0', '2:1')),
+        match_time=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+        format='Bo3', stream_links=[], details_link=f"/m/{i}", match_group='A')
+
+
+def make_batch(rng, seen, start):
+    batch = []
+    for i in range(start, start + BATCH_SIZE):
+        roll = rng.random()
+        if roll < 0.2 and seen:
+            match = MatchModel(**vars(rng.choice(seen)))
+            if rng.random() < 0.5:
+                match.team1, match.team2 = match.team2, match.team1
+        elif roll < 0.25 and batch:
+            match = MatchModel(**vars(rng.choice(batch)))
+        elif roll < 0.26:
+            match = make_match(rng, i)
+            match.team1 = match.team2 = 'N/A'
+        else:
+            match = make_match(rng, i)
+        batch.append(match)
+    seen.extend(batch)
+    return batch
+
+
+def legacy_save_live_matches_to_db(game, matches):
+    """save_live_matches_to_db before match_key, minus its comments"""
+    from app.matches_dashborad.matches_dashbord_test import validate_match_data, determine_match_status
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    saved_matches, skipped_matches = 0, 0
+    status_summary = {"Upcoming": 0, "live": 0, "Completed": 0}
+    duplicate_matches = []
+    for match in matches:
+        if not validate_match_data({"team1": match.team1, "team2": match.team2})[0]:
+            skipped_matches += 1
+            continue
+        cursor.execute('''
+            SELECT uid FROM matches
+            WHERE ((team1 = ? AND team2 = ?) OR (team1 = ? AND team2 = ?))
+              AND match_time = ? AND tournament = ?
+        ''', (match.team1, match.team2, match.team2, match.team1, match.match_time, match.tournament))
+        if cursor.fetchone():
+            skipped_matches += 1
+            duplicate_matches.append({"team1": match.team1, "team2": match.team2,
+                                      "match_time": match.match_time, "tournament": match.tournament})
+            continue
+        actual_status = determine_match_status(match.status, match.score)
+        status_summary[actual_status] += 1
+        cursor.execute('''
+            INSERT INTO matches (
+                uid, game, status, tournament, tournament_link, tournament_icon,
+                team1, team1_url, logo1_light, logo1_dark,
+                team2, team2_url, logo2_light, logo2_dark,
+                score, match_time, format, stream_links, details_link, match_group
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (str(uuid.uuid4()), match.game, actual_status, match.tournament, match.tournament_link,
+              match.tournament_icon, match.team1, match.team1_url, match.logo1_light, match.logo1_dark,
+              match.team2, match.team2_url, match.logo2_light, match.logo2_dark, match.score, match.match_time,
+              match.format, json.dumps(match.stream_links) if match.stream_links else json.dumps([]),
+              match.details_link, match.match_group))
+        saved_matches += 1
+    conn.commit()
+    conn.close()
+    return {'saved': saved_matches, 'skipped': skipped_matches,
+            'status_distribution': status_summary, 'duplicates': duplicate_matches}
+
+
+def _stored_rows():
+    conn = db.get_connection()
+    rows = conn.execute("SELECT game, status, tournament, team1, team2, score, match_time, details_link "
+                        "FROM matches ORDER BY id").fetchall()
+    conn.close()
+    return [tuple(row) for row in rows]
+
+
+def _ingest(path, save, batches):
+    db.close_connection()
+    db.DB_PATH = path
+    results, elapsed = [], 0.0
+    for batch in batches:
+        start = time.perf_counter()
+        results.append(save('valorant', batch))
+        elapsed += time.perf_counter() - start
+    return results, _stored_rows(), elapsed
+
+
+def main():
+    stored = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    batch_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    from app.migrations import migrate
+    from app.matches_dashborad.matches_dashbord_test import save_live_matches_to_db
+
+    rng = random.Random(0)
+    seen = [make_match(rng, -i - 1) for i in range(stored)]
+    batches = [make_batch(rng, seen, n * BATCH_SIZE) for n in range(batch_count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'base.db')
+        db.DB_PATH = base
+        migrate(legacy_dir=None)
+        save_live_matches_to_db('valorant', seen[:stored])
+        db.close_connection()
+        for name in ('legacy.db', 'unindexed.db', 'batch.db'):
+            shutil.copy(base, os.path.join(tmp, name))
+        # The per-match SELECT was a full scan until matches(tournament, match_time) was indexed
+        db.DB_PATH = os.path.join(tmp, 'unindexed.db')
+        conn = db.get_connection()
+        conn.execute("DROP INDEX idx_matches_tournament_time")
+        conn.close()
+
+        legacy_results, legacy_rows, legacy_time = _ingest(
+            os.path.join(tmp, 'legacy.db'), legacy_save_live_matches_to_db, batches)
+        _, _, unindexed_time = _ingest(
+            os.path.join(tmp, 'unindexed.db'), legacy_save_live_matches_to_db, batches[:1])
+        batch_results, batch_rows, batch_time = _ingest(
+            os.path.join(tmp, 'batch.db'), save_live_matches_to_db, batches)
+        db.close_connection()
+
+    total = BATCH_SIZE * batch_count
+    print(f"{batch_count} batches of {BATCH_SIZE} into {stored} stored matches; "
+          f"same results and rows: {legacy_results == batch_results and legacy_rows == batch_rows}")
+    print(f"  saved {sum(r['saved'] for r in batch_results)}, "
+          f"duplicates {sum(len(r['duplicates']) for r in batch_results)}, "
+          f"skipped {sum(r['skipped'] for r in batch_results)}")
+    print(f"  per-match, full scan      {unindexed_time * 1000:9.1f} ms/batch "
+          f"{BATCH_SIZE / unindexed_time:9.0f} matches/s")
+    print(f"  per-match SELECT + INSERT {legacy_time / batch_count * 1000:9.1f} ms/batch "
+          f"{total / legacy_time:9.0f} matches/s")
+    print(f"  INSERT ... RETURNING      {batch_time / batch_count * 1000:9.1f} ms/batch "
+          f"{total / batch_time:9.0f} matches/s")
+
+
+if __name__ == '__main__':
+    main()
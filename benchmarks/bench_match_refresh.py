@@ -0,0 +1,140 @@
+"""
+Refreshing both match stores for many games: the sequential scrape_matches
++ save loop per game and store vs refresh_all_matches at several
+concurrency levels, against a local stand-in for the API that answers
+action=parse after PARSE_LATENCY and prop=info after QUERY_LATENCY.
+
+    python -m benchmarks.bench_match_refresh [games]
+
+The rate limits are off for the concurrency comparison; a last run puts a
+0.2 s parse interval back to show fan-out still goes through the shared
+limiter. Every run starts from an empty database and must store the same
+rows as the sequential loop. Parsing runs on min(games, CPUs) worker
+processes, so on one CPU only the downloads overlap.
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+os.environ.setdefault("LIQUIPEDIA_PARSE_INTERVAL", "0")
+os.environ.setdefault("LIQUIPEDIA_REQUEST_INTERVAL", "0")
+
+from app import db
+from benchmarks.bench_page_revisions import Handler, Wiki
+from benchmarks.liquipedia_fixtures import MATCHES_PAGE, matches_html
+
+# Roughly what Liquipedia takes to answer each, from a nearby region
+PARSE_LATENCY = 0.6
+QUERY_LATENCY = 0.08
+
+
+class SlowHandler(Handler):
+    def do_GET(self):
+        time.sleep(PARSE_LATENCY if "action=parse" in self.path else QUERY_LATENCY)
+        super().do_GET()
+
+
+def _fresh_db(tmp, name):
+    from app.migrations import migrate
+    db.close_connection()
+    db.DB_PATH = os.path.join(tmp, f"{name}.db")
+    migrate(legacy_dir=None)
+
+
+def _stored_rows():
+    conn = db.get_connection()
+    try:
+        matches = conn.execute("SELECT game, uid, content_hash FROM matches ORDER BY game, uid").fetchall()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(game_matches)")
+                   if row[1] not in ("id", "created_at", "updated_at")]
+        game_matches = conn.execute(f"SELECT {', '.join(columns)} FROM game_matches "
+                                    f"ORDER BY match_id").fetchall()
+        return [tuple(row) for row in matches], [tuple(row) for row in game_matches]
+    finally:
+        conn.close()
+
+
+def sequential_refresh(games):
+    """The loop refresh_all_matches replaces: each scraper and store in turn, game by game"""
+    from app import matches_mohamed, game_matches
+    from app.match_refresh import _store_game_matches
+    for game in games:
+        matches_mohamed.save_matches_to_db(game, matches_mohamed.scrape_matches(game))
+        _store_game_matches(game, game_matches.scrape_matches(game))
+
+
+def download_all(games, concurrency):
+    """Only the downloads of a refresh, through the async client"""
+    import asyncio
+    from app.liquipedia_client import AsyncLiquipediaClient
+    from app.page_revisions import fetch_page_html_async
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        async with AsyncLiquipediaClient(max_connections=concurrency) as client:
+            async def one(game):
+                async with semaphore:
+                    return await fetch_page_html_async(client, game, MATCHES_PAGE)
+            return await asyncio.gather(*(one(game) for game in games))
+    return asyncio.run(run())
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    from app import page_revisions, liquipedia_client
+    from app.match_refresh import refresh_all_matches
+
+    games = [f"game{i:02d}" for i in range(count)]
+    for i, game in enumerate(games):
+        Wiki.publish(game, MATCHES_PAGE, matches_html(20 + 2 * i))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page_revisions.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{count} games, parse {PARSE_LATENCY * 1000:.0f} ms, query {QUERY_LATENCY * 1000:.0f} ms, "
+              f"{os.cpu_count()} CPUs")
+        from app.page_revisions import fetch_page_html
+        _, elapsed = _timed(lambda: [fetch_page_html(game, MATCHES_PAGE) for game in games])
+        print(f"  downloads only, one by one    {elapsed:6.2f} s")
+        for concurrency in (4, 20):
+            _, elapsed = _timed(lambda: download_all(games, concurrency))
+            print(f"  downloads only, conc {concurrency:2d}       {elapsed:6.2f} s")
+        _fresh_db(tmp, "sequential")
+        _, elapsed = _timed(lambda: sequential_refresh(games))
+        expected = _stored_rows()
+        print(f"  sequential scrape + save      {elapsed:6.2f} s   "
+              f"{len(expected[0])} matches rows, {len(expected[1])} game_matches rows")
+
+        for concurrency in (1, 4, 8, 20):
+            _fresh_db(tmp, f"fanout{concurrency}")
+            results, elapsed = _timed(lambda: refresh_all_matches(games, concurrency=concurrency))
+            errors = [game for game, result in results.items() if "error" in result]
+            print(f"  refresh_all_matches, conc {concurrency:2d}  {elapsed:6.2f} s   "
+                  f"same rows {_stored_rows() == expected}  errors {errors or 0}")
+
+        results, elapsed = _timed(lambda: refresh_all_matches(games, concurrency=20))
+        unchanged = sum(all(r.get("unchanged") for r in result.values()) for result in results.values())
+        print(f"  again with nothing changed    {elapsed:6.2f} s   {unchanged}/{count} games skipped after prop=info")
+
+        liquipedia_client.PARSE_BUCKET = liquipedia_client.TokenBucket(0.2)
+        _fresh_db(tmp, "limited")
+        _, elapsed = _timed(lambda: refresh_all_matches(games, concurrency=20))
+        floor = (count - 1) * 0.2
+        print(f"  conc 20, 0.2 s parse interval {elapsed:6.2f} s   (limiter floor {floor:.2f} s + one round trip)")
+        db.close_connection()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
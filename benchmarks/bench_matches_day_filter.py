@@ -0,0 +1,175 @@
+"""
+get_matches_paginated with a day filter: the Python scan it replaced (every
+row loaded, converted and date-checked) vs the match_ts_utc range query.
+
+    python -m benchmarks.bench_matches_day_filter [rows]
+
+Also checks that both produce the same JSON for a spread of games, days,
+timezones (including DST change days) and pages.
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from app import db
+
+GAMES = ('valorant', 'dota2', 'counterstrike', 'rocketleague', 'overwatch')
+TOURNAMENTS = ('Esports World Cup 2025', 'EWC 2025 Qualifier', 'VCT Masters', 'OWCS Midseason Championship',
+               'FCP Finals', 'PUBG Mobile World Cup', 'MSC 2025', 'Riyadh League', 'DreamHack Open')
+CASES = (
+    {'day': '2025-03-09', 'timezone': 'America/New_York'},
+    {'day': '2025-03-30', 'timezone': 'Europe/Berlin'},
+    {'day': '2025-04-02', 'timezone': 'Asia/Tokyo', 'games': ['valorant', 'dota2']},
+    {'day': '2025-04-02', 'timezone': 'UTC', 'tournaments': ['VCT Masters', 'FCP Finals']},
+    {'day': '2025-04-02', 'timezone': 'Australia/Sydney', 'page': 2, 'per_page': 3},
+    {'day': '2025-04-02', 'timezone': None},
+    {'day': '2025-04-02', 'live': True},
+    {'day': 'not-a-day', 'timezone': 'Africa/Cairo', 'games': ['overwatch']},
+    {'timezone': 'Asia/Kolkata', 'games': ['rocketleague']},
+)
+
+
+def seed(rows):
+    rng = random.Random(0)
+    base = datetime(2025, 3, 1, tzinfo=dt_timezone.utc)
+
+    def match_time():
+        if rng.random() < 0.03:
+            return 'N/A'
+        at = base + timedelta(minutes=rng.randrange(60 * 24 * 60) // 15 * 15)
+        if rng.random() < 0.05:
+            return at.astimezone(ZoneInfo('Asia/Riyadh')).isoformat()
+        return at.isoformat().replace('+00:00', 'Z') if rng.random() < 0.05 else at.isoformat()
+
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO matches (uid, game, status, tournament, tournament_link, tournament_icon, team1, team2, "
+        "score, match_time, format, stream_links, match_group) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((f"m{i}", rng.choice(GAMES), rng.choice(('Not Started', 'Completed')), tournament,
+          f"/{tournament}", f"{tournament}.png", f"team{rng.randint(0, 200)}", f"team{rng.randint(0, 200)}",
+          '0:0', match_time(), 'Bo3', json.dumps([f"https://twitch.tv/{i % 7}"]), 'Group A')
+         for i, tournament in ((i, rng.choice(TOURNAMENTS)) for i in range(rows)))
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_matches_paginated(games=[], tournaments=[], live=False, day=None, page=1, per_page=10,
+                             timezone="UTC"):
+    """get_matches_paginated before match_ts_utc, minus its comments"""
+    from app.tournament_catalog import normalize_tournament_name
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    where_clauses, params = [], []
+    if games:
+        where_clauses.append(f"game IN ({','.join(['?'] * len(games))})")
+        params.extend(games)
+    if tournaments:
+        where_clauses.append(f"tournament IN ({','.join(['?'] * len(tournaments))})")
+        params.extend(tournaments)
+    if live:
+        where_clauses.append("status = 'Not Started'")
+    if day:
+        try:
+            datetime.strptime(day, "%Y-%m-%d")
+            where_clauses.append("match_time != 'N/A' AND match_time IS NOT NULL")
+        except ValueError:
+            pass
+    where_sql = ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
+    cursor.execute(f"SELECT * FROM matches {where_sql} ORDER BY tournament, match_time", params)
+    keys = [column[0] for column in cursor.description]
+    matches_data = [dict(zip(keys, row)) for row in cursor.fetchall()]
+    conn.close()
+
+    if not live and timezone:
+        for match in matches_data:
+            if match['match_time'] and match['match_time'] != 'N/A':
+                try:
+                    match['match_time'] = datetime.fromisoformat(match['match_time']).astimezone(
+                        ZoneInfo(timezone)).isoformat()
+                except ValueError:
+                    match['match_time'] = None
+    if day:
+        try:
+            filter_date = datetime.strptime(day, "%Y-%m-%d").date()
+            matches_data = [m for m in matches_data if m['match_time'] and m['match_time'] != 'N/A'
+                            and datetime.fromisoformat(m['match_time']).date() == filter_date]
+        except ValueError:
+            pass
+
+    tournaments_map = {}
+    for match in matches_data:
+        name = normalize_tournament_name(match['tournament'])
+        entry = tournaments_map.setdefault(name, {
+            "tournament_name": name, "tournament_icon": match.get("tournament_icon", ""),
+            "tournament_link": match.get("tournament_link", ""), "games": []})
+        game_entry = next((g for g in entry["games"] if g["game"] == match["game"]), None)
+        if not game_entry:
+            game_entry = {"game": match["game"], "matches": []}
+            entry["games"].append(game_entry)
+        game_entry["matches"].append({
+            "team1": match["team1"], "team1_url": match.get("team1_url"), "logo1_light": match["logo1_light"],
+            "logo1_dark": match["logo1_dark"], "team2": match["team2"], "team2_url": match.get("team2_url"),
+            "logo2_light": match["logo2_light"], "logo2_dark": match["logo2_dark"], "score": match["score"],
+            "match_time": match["match_time"], "format": match["format"],
+            "stream_link": json.loads(match["stream_links"]) if match.get("stream_links") else [],
+            "details_link": match.get("details_link"), "group": match["match_group"], "status": match["status"]})
+
+    priority_keywords = ['FC', 'FCP', 'MSC', 'Hok World Cup', 'EWC', 'OWCS', 'OWCS Season', 'OWCS Midseason',
+                         'Honor of Kings World Cup', 'Esports World Cup 2025', 'EWC 2025', 'Esports World Cup',
+                         'Esports World', 'Esports', 'World Cup', 'PUBG Mobile World Cup', 'Overwatch']
+
+    def get_priority_index(name):
+        return next((i for i, k in enumerate(priority_keywords) if k.lower() in name.lower()),
+                    len(priority_keywords) + 1)
+
+    tournament_list = [t for t in tournaments_map.values()
+                       if any(k.lower() in t["tournament_name"].lower() for k in priority_keywords)]
+    tournament_list.sort(key=lambda t: (get_priority_index(t["tournament_name"]), t["tournament_name"].lower()))
+    paginated = tournament_list[(page - 1) * per_page:page * per_page]
+    for tournament in paginated:
+        for game_entry in tournament["games"]:
+            game_entry["matches"].sort(key=lambda m: m["match_time"])
+        tournament["games"] = sorted(tournament["games"], key=lambda g: g["game"])
+    return {"page": page, "per_page": per_page, "total": len(tournament_list), "tournaments": paginated}
+
+
+def _median_ms(fn, repeat=7):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    from app.migrations import migrate
+    from app.matches_mohamed import get_matches_paginated
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(rows)
+
+        mismatches = [case for case in CASES
+                      if json.dumps(legacy_matches_paginated(**case)) != json.dumps(get_matches_paginated(**case))]
+        print(f"{rows} matches over 60 days; responses identical to the Python scan: {not mismatches} "
+              f"{mismatches or ''}")
+
+        for case in CASES[:3]:
+            label = ' '.join(f"{key}={value}" for key, value in case.items())
+            print(f"  {label}")
+            print(f"    python scan {_median_ms(lambda: legacy_matches_paginated(**case)):8.2f} ms"
+                  f"   match_ts_utc range {_median_ms(lambda: get_matches_paginated(**case)):7.2f} ms")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Polling unchanged Liquipedia pages: the old flow (action=parse, then an MD5
+of the HTML against a hash file, or BeautifulSoup plus a row diff for
+transfers) vs page_revisions, which asks action=query&prop=info first.
+
+    python -m benchmarks.bench_page_revisions [polls]
+
+A local stand-in for the API serves Main_Page and Esports_World_Cup/2025;
+every tenth poll edits the page, and one poll in between only bumps
+touched, as a purge does. Both flows must store the same transfers.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+os.environ.setdefault("LIQUIPEDIA_PARSE_INTERVAL", "0")
+os.environ.setdefault("LIQUIPEDIA_REQUEST_INTERVAL", "0")
+
+from app import db
+
+WIKI = "valorant"
+# Main_Page carries far more than the transfer table
+FILLER = "".join(f"<div class='mainpage-box'><p>news item {i}</p><a href='/valorant/N{i}'>more</a></div>"
+                 for i in range(2500))
+
+
+def transfers_html(edition, rows=60):
+    body = "".join(
+        f"<div class='divRow'><div class='Date'>2025-0{1 + (i + edition) % 9}-{10 + i % 18}</div>"
+        f"<div class='Name'><span class='block-player'><img src='/flag/{i % 7}.png'>"
+        f"<span class='name'><a>player{i}e{edition if i < 3 else 0}</a></span></span></div>"
+        f"<div class='OldTeam'><span class='team-template-lightmode'><img alt='Old {i % 11}' src='/o{i}.png'></span></div>"
+        f"<div class='NewTeam'><span class='team-template-darkmode'><img alt='New {i % 13}' src='/n{i}.png'></span></div>"
+        f"</div>" for i in range(rows))
+    return f"{FILLER}<div class='divTable mainpage-transfer Ref'>{body}</div>"
+
+
+def games_html(edition):
+    rows = "".join(f"<tr><td><img src='/g{i}.png'>Game {i}.{edition}</td><td>a</td><td>b</td><td>c</td></tr>"
+                   for i in range(25))
+    return f"{FILLER}<table><tr><th colspan='8'>List of Tournaments</th></tr>{rows}</table>"
+
+
+class Wiki:
+    pages = {}
+    requests = {}
+    bytes_sent = 0
+    renders = 0
+
+    @classmethod
+    def publish(cls, wiki, page, html, new_revision=True):
+        current = cls.pages.get((wiki, page))
+        revid = (current["revid"] + 1 if new_revision else current["revid"]) if current else 1000
+        cls.renders += 1
+        touched = f"2025-07-01T{cls.renders // 60:02d}:{cls.renders % 60:02d}:00Z"
+        cls.pages[(wiki, page)] = {"revid": revid, "touched": touched, "html": html}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        wiki = urlparse(self.path).path.strip("/").split("/")[0]
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        action = query.get("action")
+        Wiki.requests[action] = Wiki.requests.get(action, 0) + 1
+        if action == "query":
+            page = Wiki.pages[(wiki, query["titles"])]
+            payload = {"query": {"pages": [{"title": query["titles"], "lastrevid": page["revid"],
+                                            "touched": page["touched"], "length": len(page["html"])}]}}
+        else:
+            payload = {"parse": {"title": query["page"], "revid": Wiki.pages[(wiki, query["page"])]["revid"],
+                                 "text": {"*": Wiki.pages[(wiki, query["page"])]["html"]}}}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        Wiki.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_fetch_and_store_transfers(game):
+    """fetch_and_store_transfers before page_revisions: parse, BeautifulSoup and diff on every poll"""
+    from app.player_transfers import parse_transfer_html, store_transfers_in_db
+    from app.page_revisions import fetch_page_html
+    transfers_data = parse_transfer_html(fetch_page_html(game, "Main_Page"))
+    counts = store_transfers_in_db(game, transfers_data)
+    return "updated" if counts["inserted"] or counts["updated"] or counts["deleted"] else "no_changes"
+
+
+def legacy_fetch_ewc_games(hash_file):
+    """fetch_ewc_games_from_web before page_revisions: parse, then MD5 against a hash file"""
+    from app.liquipedia import parse_ewc_games_html
+    from app.page_revisions import fetch_page_html
+    html = fetch_page_html("esports", "Esports_World_Cup/2025")
+    current_hash = hashlib.md5(html.encode("utf-8")).hexdigest()
+    if os.path.exists(hash_file):
+        with open(hash_file, "r", encoding="utf-8") as f:
+            if f.read().strip() == current_hash:
+                return []
+    games_data = parse_ewc_games_html(html)
+    with open(hash_file, "w", encoding="utf-8") as f:
+        f.write(current_hash)
+    return games_data
+
+
+def _poll(fn, polls, edit):
+    Wiki.requests, Wiki.bytes_sent = {}, 0
+    results, timings = [], []
+    for n in range(polls):
+        edit(n)
+        start = time.perf_counter()
+        results.append(fn())
+        timings.append((time.perf_counter() - start) * 1000)
+    quiet = [t for n, t in enumerate(timings) if n % 10 not in (0, 5)]
+    return results, dict(Wiki.requests), Wiki.bytes_sent / polls, sorted(quiet)[len(quiet) // 2]
+
+
+def _stored_transfers():
+    conn = db.get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM transfers").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _editor(wiki, page, render):
+    def edit(n):
+        if n % 10 == 0:
+            Wiki.publish(wiki, page, render(n // 10))
+        elif n % 10 == 5:
+            # A purge: touched moves, the output does not
+            Wiki.publish(wiki, page, render(n // 10), new_revision=False)
+    return edit
+
+
+def _report(label, requests, per_poll_bytes, quiet_ms):
+    print(f"  {label:16s} parse {requests.get('parse', 0):3d}  query {requests.get('query', 0):3d}  "
+          f"{per_poll_bytes / 1024:7.1f} KiB/poll  unchanged poll {quiet_ms:6.2f} ms")
+
+
+def main():
+    polls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    from app import page_revisions
+    from app.migrations import migrate
+    from app.liquipedia import fetch_ewc_games_from_web
+    from app.player_transfers import fetch_and_store_transfers, delete_transfers
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page_revisions.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        migrate(legacy_dir=None)
+
+        print(f"{polls} polls, an edit every 10th and a purge every 10th in between")
+        edit = _editor(WIKI, "Main_Page", transfers_html)
+        Wiki.pages.clear()
+        legacy, requests, per_poll, quiet_ms = _poll(lambda: legacy_fetch_and_store_transfers(WIKI), polls, edit)
+        legacy_rows = _stored_transfers()
+        print(f"Main_Page transfers ({len(transfers_html(0)) / 1024:.0f} KiB of HTML)")
+        _report("parse every poll", requests, per_poll, quiet_ms)
+        delete_transfers(WIKI)
+
+        Wiki.pages.clear()
+        results, requests, per_poll, quiet_ms = _poll(lambda: fetch_and_store_transfers(WIKI)["status"], polls, edit)
+        rows = _stored_transfers()
+        _report("page_revisions", requests, per_poll, quiet_ms)
+        print(f"  same statuses: {results == legacy}; same stored rows: {rows == legacy_rows} ({rows})")
+
+        edit = _editor("esports", "Esports_World_Cup/2025", games_html)
+        Wiki.pages.clear()
+        hash_file = os.path.join(tmp, "ewc_2025_games_hash.txt")
+        legacy, requests, per_poll, quiet_ms = _poll(lambda: legacy_fetch_ewc_games(hash_file), polls, edit)
+        print("Esports_World_Cup/2025 games")
+        _report("hash file", requests, per_poll, quiet_ms)
+        Wiki.pages.clear()
+        # fetch_ewc_games_from_web prints "No changes detected." on every skip
+        with open(os.devnull, "w") as quiet:
+            with redirect_stdout(quiet):
+                results, requests, per_poll, quiet_ms = _poll(fetch_ewc_games_from_web, polls, edit)
+        _report("page_revisions", requests, per_poll, quiet_ms)
+        print(f"  same results: {results == legacy}")
+
+        db.close_connection()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
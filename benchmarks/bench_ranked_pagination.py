@@ -0,0 +1,87 @@
+"""
+Ranked search pagination: page 1 vs page 500 with LIMIT/OFFSET + COUNT(*)
+(search_entity) and with (rank, rowid) cursors (search_entity_keyset).
+
+    python -m benchmarks.bench_ranked_pagination [rows]
+
+Keyset pages are timed with the ranking snapshot that a cursor request
+keeps, and without it (the plain keyset SQL every worker falls back to).
+Also checks that walking the cursors yields the same documents as the
+offset pages.
+"""
+import os
+import sys
+import random
+import tempfile
+import time
+
+from app import db
+
+PER_PAGE = 10
+DEEP_PAGE = 500
+
+
+def seed(rows):
+    rng = random.Random(0)
+    words = ('valorant', 'falcons', 'liquid', 'final', 'week', 'recap', 'clutch', 'ace')
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO news (title, description, writer) VALUES (?, ?, ?)",
+        ((f"valorant {' '.join(rng.choices(words, k=rng.randint(2, 12)))}",
+          ' '.join(rng.choices(words, k=20)), f"writer{i % 40}") for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median_ms(fn, repeat=7):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    from app.migrations import migrate
+    from app import search_index
+    from app.search_index import search_entity, search_entity_keyset
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(rows)
+
+        # Walk the cursors to the deep page, checking each page against OFFSET
+        cursors, cursor, mismatches = [None], None, 0
+        for page in range(1, DEEP_PAGE + 1):
+            keyset = search_entity_keyset('news', 'valorant', cursor, PER_PAGE)
+            if page in (1, 2, 100, DEEP_PAGE):
+                offset_ids = [row['id'] for row in search_entity('news', 'valorant', page, PER_PAGE)[0]]
+                mismatches += offset_ids != [row['id'] for row in keyset['data']]
+            cursor = keyset['next_cursor']
+            cursors.append(cursor)
+        deep_cursor = cursors[DEEP_PAGE - 1]
+
+        print(f"{rows} news rows matching 'valorant', {PER_PAGE} per page "
+              f"(keyset and offset pages identical: {mismatches == 0})")
+        timings = {
+            'offset + COUNT(*)': (lambda: search_entity('news', 'valorant', 1, PER_PAGE),
+                                  lambda: search_entity('news', 'valorant', DEEP_PAGE, PER_PAGE)),
+            'keyset, snapshot': (lambda: search_entity_keyset('news', 'valorant', None, PER_PAGE, True),
+                                 lambda: search_entity_keyset('news', 'valorant', deep_cursor, PER_PAGE)),
+        }
+        for label, (first, deep) in timings.items():
+            print(f"  {label:20s} page 1 {_median_ms(first):8.2f} ms   page {DEEP_PAGE} {_median_ms(deep):8.2f} ms")
+
+        search_index.SNAPSHOT_MAX_ROWS = 0
+        search_index._snapshots.clear()
+        deep = _median_ms(lambda: search_entity_keyset('news', 'valorant', deep_cursor, PER_PAGE))
+        print(f"  {'keyset, no snapshot':20s} page {DEEP_PAGE} {deep:8.2f} ms")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
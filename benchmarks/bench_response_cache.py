@@ -0,0 +1,103 @@
+"""
+The on-disk response cache: fetching the pages nine scrapers read from a
+local stand-in for the API with no cache, with a cold and a warm cache,
+and in replay mode with the server gone. Also checks that eviction keeps
+the cache under max_bytes in LRU order and that identical renders share
+one body.
+
+Against Liquipedia each parse call also takes a 30 s slot of the parse
+limit and each query a 2 s one; "limiter" is that time per round.
+
+    python -m benchmarks.bench_response_cache [rounds]
+
+The scrapers must give exactly the same output in every mode.
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+os.environ.setdefault("LIQUIPEDIA_PARSE_INTERVAL", "0")
+os.environ.setdefault("LIQUIPEDIA_REQUEST_INTERVAL", "0")
+
+from benchmarks.bench_page_revisions import Handler, Wiki
+from benchmarks.liquipedia_fixtures import PAGES, SCRAPER_PAGES, WIKI, MATCHES_PAGE, matches_html, run_scrapers
+
+
+# The pages run_scrapers() fetches, in order: both match scrapers read
+# Liquipedia:Matches
+FETCHES = list(SCRAPER_PAGES.values())
+
+
+def _run(rounds):
+    """Median ms per round of fetching what the scrapers read, with the parse left out"""
+    from app.page_revisions import fetch_page_html
+    Wiki.requests, Wiki.bytes_sent = {}, 0
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for wiki, page in FETCHES:
+            fetch_page_html(wiki, page)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[rounds // 2], dict(Wiki.requests), Wiki.bytes_sent / rounds, rounds
+
+
+def _report(label, ms, requests, per_round_bytes, rounds):
+    parse, query = requests.get('parse', 0), requests.get('query', 0)
+    print(f"  {label:18s} {ms:6.2f} ms/round  parse {parse:3d}  query {query:3d}  "
+          f"{per_round_bytes / 1024:7.1f} KiB/round  limiter {(parse * 30 + query * 2) / rounds:5.0f} s/round")
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    from app import page_revisions
+    from app.response_cache import ResponseCache, set_response_cache
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page_revisions.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    for (wiki, page), render in PAGES.items():
+        Wiki.publish(wiki, page, render())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{len(FETCHES)} fetches of {len(PAGES)} pages per round, {rounds} rounds")
+        set_response_cache(None)
+        _report("no cache", *_run(rounds))
+        live = run_scrapers()
+
+        cache_dir = os.path.join(tmp, "cache")
+        set_response_cache(ResponseCache(cache_dir))
+        _report("cache, cold", *_run(1))
+        _report("cache, warm", *_run(rounds))
+        warm = run_scrapers()
+
+        server.shutdown()
+        server.server_close()
+        page_revisions.BASE_URL = "http://127.0.0.1:9"
+        set_response_cache(ResponseCache(cache_dir, replay=True))
+        _report("replay, no server", *_run(rounds))
+        replayed = run_scrapers()
+        print(f"  identical scraper output: cache {warm == live}, replay {replayed == live}")
+        print(f"  on disk: {ResponseCache(cache_dir).stats()}")
+
+        lru = ResponseCache(os.path.join(tmp, "lru"), max_bytes=256 * 1024)
+        html = {n: matches_html(150 + n) for n in range(40)}
+        for n in range(40):
+            lru.put(WIKI, MATCHES_PAGE, {"lastrevid": n, "touched": ""}, html[n])
+            # Revision 0 stays in use, so it should outlive everything around it
+            lru.get(WIKI, MATCHES_PAGE, {"lastrevid": 0, "touched": ""})
+        kept = [n for n in range(40) if lru.get(WIKI, MATCHES_PAGE, {"lastrevid": n, "touched": ""})]
+        stats = lru.stats()
+        print(f"  LRU, 256 KiB cap, 40 renders: {stats['entries']} kept, {stats['bytes'] / 1024:.0f} KiB; "
+              f"revision 0 kept {0 in kept}; kept are the newest {kept[1:] == list(range(40 - len(kept) + 1, 40))}")
+        lru.put(WIKI, MATCHES_PAGE, {"lastrevid": 39, "touched": "purged"}, html[39])
+        after = lru.stats()
+        print(f"  same render under a new touched: entries {stats['entries']} -> {after['entries']}, "
+              f"bodies {stats['bodies']} -> {after['bodies']}")
+        set_response_cache(None)
+
+
+if __name__ == "__main__":
+    main()
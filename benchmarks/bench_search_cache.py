@@ -0,0 +1,112 @@
+"""
+/api/search and /api/extended/search latency for repeated popular queries,
+with the result cache bypassed vs in use, through the Flask test client.
+
+    python -m benchmarks.bench_search_cache [rows]
+
+Also checks that a write to one table keeps a typed entry on another table
+cached while invalidating global results. It also checks that cache hits
+from either tier write nothing, and that the shared tier stays within
+SHARED_MAX_ENTRIES with search_cache_size equal to its row count.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app import db
+
+QUERIES = ('team falcons', 'valorant', 'player42', 'liquid')
+TEAMS = ('Team Falcons', 'Team Liquid', 'Fnatic', 'Vitality', 'G2 Esports', 'NAVI')
+GAMES = ('valorant', 'dota2', 'counterstrike', 'rocketleague')
+
+
+def seed(rows):
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO news (title, description, writer) VALUES (?, ?, ?)",
+        ((f"{TEAMS[i % 6]} win {GAMES[i % 4]} week {i}", f"Recap of {TEAMS[(i + 2) % 6]}", f"writer{i % 30}")
+         for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO transfers (unique_id, game, player_name, old_team_name, new_team_name) VALUES (?, ?, ?, ?, ?)",
+        ((f"t{i}", GAMES[i % 4], f"player{i}", TEAMS[i % 6], TEAMS[(i + 1) % 6]) for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median_ms(client, url, repeat=21):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    from app import create_app, result_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        app = create_app()
+        seed(rows)
+        client = app.test_client()
+        cached_views = {name: app.view_functions[name] for name in ('search.search', 'search_extended.search')}
+
+        print(f"{rows} rows in news and transfers, median of 21 requests")
+        for prefix in ('/api/search', '/api/extended/search'):
+            for query in QUERIES:
+                url = f"{prefix}?query={query}&search_mode=auto"
+                app.view_functions.update({name: view.__wrapped__ for name, view in cached_views.items()})
+                uncached = _median_ms(client, url)
+                app.view_functions.update(cached_views)
+                client.get(url)
+                cached = _median_ms(client, url)
+                print(f"  {prefix:22s} {query:13s} uncached {uncached:8.2f} ms   cached {cached:6.2f} ms")
+
+        typed = client.get('/api/search?query=falcons&search_type=transfers')
+        client.get('/api/search?query=falcons')
+        conn = db.get_connection()
+        conn.execute("INSERT INTO news (title, description, writer) VALUES ('Falcons sign', 'x', 'y')")
+        conn.commit()
+        conn.close()
+        typed_after = client.get('/api/search?query=falcons&search_type=transfers')
+        global_after = client.get('/api/search?query=falcons')
+        print(f"  after a news insert: transfers-only entry {typed_after.headers['X-Cache']} "
+              f"(unchanged body: {typed.data == typed_after.data}), global entry {global_after.headers['X-Cache']}")
+        print(f"  {result_cache.get_cache_stats()}")
+
+        url = '/api/search?query=valorant&search_mode=auto'
+        client.get(url)
+        conn = db.get_connection()
+
+        def cache_writes(hits, drop_memory):
+            # Every hit logs a search_logs row on purpose; count the rest
+            before = conn.total_changes
+            logs = conn.execute('SELECT COUNT(*) FROM search_logs').fetchone()[0]
+            for _ in range(hits):
+                if drop_memory:
+                    result_cache._memory.clear()
+                client.get(url)
+            return conn.total_changes - before - (conn.execute('SELECT COUNT(*) FROM search_logs').fetchone()[0] - logs)
+        print(f"  cache rows written by 50 memory hits: {cache_writes(50, False)}, "
+              f"by 50 shared hits: {cache_writes(50, True)}")
+
+        result_cache.SHARED_MAX_ENTRIES = 200
+        start = time.perf_counter()
+        for i in range(600):
+            client.get(f'/api/search?query=player{i}&search_type=transfers')
+        elapsed = (time.perf_counter() - start) * 1000 / 600
+        entries = conn.execute('SELECT COUNT(*) FROM search_cache').fetchone()[0]
+        counter = conn.execute('SELECT entries FROM search_cache_size').fetchone()[0]
+        print(f"  600 stores with a cap of 200: {entries} shared entries, counter {counter}, "
+              f"{elapsed:.2f} ms per miss + store")
+        conn.close()
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Suggestion latency: the old suggest_corrections_extended (re-read every
+table, split into words, fuzz.ratio over the whole vocabulary per call) vs
+the symmetric delete index in app.spelling, at growing corpus sizes.
+Each batch of rows is written the way ingest writes it, with
+apply_spelling_changes() in the same transaction; "one news row" is the
+cost a single insert adds. The index must match a full rebuild from the
+vocabulary after every step, and suggest() never writes.
+
+    python -m benchmarks.bench_spelling [rows ...]
+
+The old function's teams/events reads are left out: those tables do not
+exist, which made it return [] on every call.
+"""
+import os
+import sys
+import random
+import tempfile
+import time
+
+from app import db
+
+DEFAULT_SIZES = (10000, 100000)
+QUERIES = ('falcns', 'valorat', 'championshp', 'liqiud team')
+WORDS = ('falcons', 'liquid', 'valorant', 'championship', 'qualifier', 'fnatic', 'vitality',
+         'counterstrike', 'tournament', 'playoffs', 'grand', 'final', 'rocket', 'league')
+
+
+def legacy_suggest(query, threshold=60):
+    from fuzzywuzzy import fuzz, process
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    searchable_terms = set()
+    for sql in ('SELECT title, writer FROM news', 'SELECT game_name, genre FROM games',
+                'SELECT player_name, old_team_name, new_team_name FROM transfers',
+                'SELECT header, series, organizers, location FROM ewc_info',
+                'SELECT team_name, tournament FROM ewc_teams_players'):
+        cursor.execute(sql)
+        for row in cursor.fetchall():
+            for field in row:
+                if field:
+                    searchable_terms.update(field.split())
+    conn.close()
+    searchable_terms = {term.strip().lower() for term in searchable_terms
+                        if term and len(term) > 2 and term.isalpha()}
+    matches = process.extract(query.lower(), list(searchable_terms), scorer=fuzz.ratio, limit=5)
+    return [match[0] for match in matches if match[1] >= threshold][:3]
+
+
+def seed(start, rows):
+    """Insert rows news items and fold them into the spelling index, in one transaction"""
+    from app.spelling import apply_spelling_changes
+    rng = random.Random(start)
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO news (title, description, writer) VALUES (?, ?, ?)",
+        ((' '.join(rng.sample(WORDS, 4)) + f" {''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=8))}",
+          ' '.join(rng.sample(WORDS, 6)), f"writer{i % 50}") for i in range(start, start + rows))
+    )
+    counts = apply_spelling_changes(cursor)
+    conn.commit()
+    conn.close()
+    return counts
+
+
+def matches_full_rebuild():
+    """Whether the incrementally kept index equals one built from the whole vocabulary"""
+    from app.spelling import _is_term
+    conn = db.get_connection()
+    try:
+        current = {term: count for term, count in conn.execute('SELECT term, cnt FROM search_vocabulary')
+                   if _is_term(term)}
+        stored = dict(conn.execute('SELECT term, frequency FROM spelling_terms').fetchall())
+        variants = conn.execute('SELECT COUNT(DISTINCT term) FROM spelling_deletes').fetchone()[0]
+        return current == stored and variants == len(stored)
+    finally:
+        conn.close()
+
+
+def _total_changes():
+    conn = db.get_connection()
+    try:
+        return conn.total_changes
+    finally:
+        conn.close()
+
+
+def _median_ms(fn, *args, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2], result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    from app.migrations import migrate
+    from app.spelling import suggest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+
+        seeded = 0
+        for rows in sizes:
+            seed_ms, counts = _median_ms(seed, seeded, rows - seeded, repeat=1)
+            seeded = rows
+            one_ms, _ = _median_ms(seed, seeded, 1, repeat=1)
+            seeded += 1
+            vocabulary = db.get_connection().execute('SELECT COUNT(*) FROM spelling_terms').fetchone()[0]
+            print(f"{rows} news rows, {vocabulary} terms (ingest incl. index {seed_ms:.0f} ms: {counts}; "
+                  f"one news row {one_ms:.2f} ms; same as full rebuild {matches_full_rebuild()})")
+            before = _total_changes()
+            for query in QUERIES:
+                new_ms, new = _median_ms(suggest, query, 60, 3, repeat=51)
+                old_ms, old = _median_ms(legacy_suggest, query)
+                print(f"  {query:12s} index {new_ms:6.3f} ms {new}   legacy {old_ms:8.1f} ms {old}")
+            print(f"  rows written by suggest(): {_total_changes() - before}")
+
+        # Deletes and edits must take terms back out
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM news WHERE id % 3 = 0")
+        cursor.execute("UPDATE news SET writer = 'guestwriter' WHERE id % 3 = 1")
+        from app.spelling import apply_spelling_changes
+        start = time.perf_counter()
+        counts = apply_spelling_changes(cursor)
+        conn.commit()
+        conn.close()
+        print(f"delete a third, edit a third: index {(time.perf_counter() - start) * 1000:.0f} ms {counts}; "
+              f"same as full rebuild {matches_full_rebuild()}")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Substring filter latency on 100k-row tables: LIKE '%q%' scans vs the
+trigram shadow indexes, through the real query functions.
+
+    python -m benchmarks.bench_substring_filters [rows]
+
+The LIKE baseline is produced by raising trigram_index.MIN_TRIGRAM_LENGTH
+so substring_filter falls back to LIKE; results are checked to be identical.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app import db
+from app import trigram_index
+
+TEAMS = ('Team Falcons', 'Team Liquid', 'Fnatic', 'Vitality', 'G2 Esports', 'NAVI', 'T1', 'Gen.G')
+GAMES = ('valorant', 'dota2', 'counterstrike', 'leagueoflegends', 'rocketleague')
+
+
+def seed(rows):
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO news (title, description, writer) VALUES (?, ?, ?)",
+        ((f"{TEAMS[i % 8]} take {GAMES[i % 5]} week {i}", f"Match report number {i} from the qualifiers",
+          f"writer{i % 40}") for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO transfers (unique_id, game, date, player_name, old_team_name, new_team_name) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"t{i}", GAMES[i % 5], f"2025-{i % 12 + 1:02d}-01", f"player{i}", TEAMS[i % 8], TEAMS[(i + 3) % 8])
+         for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO game_teams (team_name, game_name, logo_mode) VALUES (?, ?, ?)",
+        ((f"{TEAMS[i % 8]} {i // 8}", GAMES[i % 5], 'light') for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median_ms(fn, repeat=11):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2], result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    from app.migrations import migrate
+    from app.news import get_news_items
+    from app.player_transfers import get_transfers_from_db
+    from app.crud.game_teams_crud import get_teams
+    from app.crud.search_crud import search_table
+
+    cases = (
+        ("news search='week 4242'", lambda: get_news_items(search='week 4242')),
+        ("news search='falcons'", lambda: get_news_items(search='falcons')),
+        ("transfers player_name='er1234'", lambda: get_transfers_from_db(player_name='er1234')),
+        ("game_teams name_filter='liquid 99'", lambda: get_teams(name_filter='liquid 99')),
+        ("search_table news 'report number 777'", lambda: search_table('news', 'report number 777', 1, 10)),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(rows)
+
+        print(f"{rows} rows in news, transfers and game_teams")
+        for label, fn in cases:
+            min_length = trigram_index.MIN_TRIGRAM_LENGTH
+            trigram_index.MIN_TRIGRAM_LENGTH = sys.maxsize
+            like_ms, like_result = _median_ms(fn)
+            trigram_index.MIN_TRIGRAM_LENGTH = min_length
+            trigram_ms, trigram_result = _median_ms(fn)
+            same = "same results" if like_result == trigram_result else "RESULTS DIFFER"
+            print(f"  {label:40s} LIKE {like_ms:8.2f} ms   trigram {trigram_ms:7.2f} ms   {same}")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+get_matches_paginated without a day filter: the Python scan that grouped,
+ranked and sorted every match per request vs tournament_catalog pagination.
+
+    python -m benchmarks.bench_tournament_catalog [rows]
+
+Also checks the JSON against the scan for a spread of filters and pages
+(including tournament names that differ only in case), and that the
+catalog's per-game counts stay exact through inserts, updates and deletes.
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import time
+
+from app import db
+from benchmarks.bench_matches_day_filter import legacy_matches_paginated
+
+GAMES = ('valorant', 'dota2', 'counterstrike', 'rocketleague', 'overwatch')
+SERIES = ('Esports World Cup', 'EWC', 'OWCS Midseason', 'FCP', 'PUBG Mobile World Cup', 'MSC', 'Overwatch',
+          'VCT Challengers', 'DreamHack', 'ESL Pro League', 'Riyadh Masters')
+CASES = (
+    {},
+    {'page': 3, 'per_page': 5},
+    {'page': 40},
+    {'games': ['valorant', 'overwatch'], 'timezone': 'Europe/Berlin'},
+    {'tournaments': ['EWC 2025 Stage 3', 'ewc 2025 stage 3', 'Overwatch Cup 7'], 'timezone': 'Asia/Tokyo'},
+    {'live': True, 'page': 2},
+)
+
+
+def seed(rows):
+    rng = random.Random(0)
+    tournaments = [f"{series} {'2025' if i % 2 else 'Cup'} {'Stage' if i % 3 else 'Finals'} {i}"
+                   for series in SERIES for i in range(25)]
+    tournaments += ['EWC 2025 Stage 3', 'ewc 2025 stage 3', 'Overwatch Cup 7', 'Ésports Ünited 2025']
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO matches (uid, game, status, tournament, tournament_link, tournament_icon, team1, team2, "
+        "score, match_time, format, stream_links, match_group) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((f"m{i}", rng.choice(GAMES), rng.choice(('Not Started', 'Completed')), tournament,
+          f"/{tournament}/{i}", f"{tournament}.png", f"team{rng.randint(0, 200)}", f"team{rng.randint(0, 200)}",
+          '0:0', f"2025-{rng.randint(3, 5):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00+00:00",
+          'Bo3', '[]', 'Group A')
+         for i, tournament in ((i, rng.choice(tournaments)) for i in range(rows)))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median_ms(fn, repeat=7):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[repeat // 2]
+
+
+def _counts_exact():
+    conn = db.get_connection()
+    catalog = conn.execute("SELECT tournament, game, match_count FROM tournament_catalog ORDER BY 1, 2").fetchall()
+    actual = conn.execute("SELECT tournament, game, COUNT(*) FROM matches GROUP BY 1, 2 ORDER BY 1, 2").fetchall()
+    conn.close()
+    return [tuple(row) for row in catalog] == [tuple(row) for row in actual]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    from app.migrations import migrate
+    from app.matches_mohamed import get_matches_paginated
+    from app.matches_dashborad.matches_dashbord_test import update_match_in_db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        migrate(legacy_dir=None)
+        seed(rows)
+
+        mismatches = [case for case in CASES
+                      if json.dumps(legacy_matches_paginated(**case)) != json.dumps(get_matches_paginated(**case))]
+        print(f"{rows} matches in {len(SERIES) * 25 + 4} tournaments; responses identical to the Python scan: "
+              f"{not mismatches} {mismatches or ''}")
+
+        update_match_in_db('m1', {'tournament': 'Brand New EWC Showmatch', 'game': 'dota2'})
+        update_match_in_db('m2', {'game': 'valorant'})
+        conn = db.get_connection()
+        conn.execute("DELETE FROM matches WHERE id % 7 = 0")
+        conn.commit()
+        conn.close()
+        same_after_writes = all(json.dumps(legacy_matches_paginated(**case)) == json.dumps(get_matches_paginated(**case))
+                                for case in CASES)
+        print(f"  after updates and deletes: counts exact {_counts_exact()}, responses identical {same_after_writes}")
+
+        for case in CASES[:4]:
+            label = ' '.join(f"{key}={value}" for key, value in case.items()) or 'page 1, all games'
+            print(f"  {label}")
+            print(f"    python scan {_median_ms(lambda: legacy_matches_paginated(**case)):8.2f} ms"
+                  f"   catalog {_median_ms(lambda: get_matches_paginated(**case)):7.2f} ms")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+FTS write amplification of transfers ingestion on a synthetic 50k-transfer
+page: the old DELETE-then-INSERT-per-row store vs the incremental
+store_transfers_in_db.
+
+    python -m benchmarks.bench_transfers_ingest [transfers]
+
+WAL bytes are measured with auto-checkpointing disabled, so they count every
+page the refresh wrote to transfers, its indexes and transfers_fts.
+
+Each store starts from its own freshly migrated database, and both fold
+their search_document_changes into the spelling index before committing,
+as every writer does now; otherwise one run would pay for the change log
+the other left behind.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app import db
+
+GAME = 'valorant'
+
+
+def make_transfers(transfers, logo_every=0, team_every=0):
+    """Synthetic parse_transfer_html() output, one player per transfer"""
+    data = []
+    for i in range(transfers):
+        new_team = f"Team {i % 211}"
+        if team_every and i % team_every == 0:
+            new_team = f"Team {i % 211} Academy"
+        logo = "new.png" if logo_every and i % logo_every == 0 else "logo.png"
+        data.append({
+            "Date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "Players": [{"Name": f"player{i}", "Flag": "Saudi Arabia"}],
+            "OldTeam": {"Name": f"Team {i % 173}", "Logo_Light": "logo.png", "Logo_Dark": "logo.png"},
+            "NewTeam": {"Name": new_team, "Logo_Light": logo, "Logo_Dark": logo},
+        })
+    return data
+
+
+def legacy_store(game, transfers_data):
+    from app.spelling import apply_spelling_changes
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM transfers WHERE game = ?", (game,))
+    for transfer in transfers_data:
+        old_team = transfer['OldTeam']
+        new_team = transfer['NewTeam']
+        for i, player in enumerate(transfer['Players']):
+            cursor.execute("""
+                INSERT INTO transfers (
+                    unique_id, game, date, player_name, player_flag,
+                    old_team_name, old_team_logo_light, old_team_logo_dark,
+                    new_team_name, new_team_logo_light, new_team_logo_dark,
+                    hash_value
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (f"{transfer['Date']}_{player['Name']}_{i}", game, transfer['Date'],
+                  player['Name'], player['Flag'],
+                  old_team['Name'], old_team['Logo_Light'], old_team['Logo_Dark'],
+                  new_team['Name'], new_team['Logo_Light'], new_team['Logo_Dark'],
+                  'page-hash'))
+    apply_spelling_changes(cursor)
+    conn.commit()
+    conn.close()
+
+
+def _wal_bytes():
+    path = db.DB_PATH + '-wal'
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _fresh_db(tmp, name):
+    from app.migrations import migrate
+    db.close_connection()
+    db.DB_PATH = os.path.join(tmp, f"{name}.db")
+    migrate(legacy_dir=None)
+    db.get_connection().execute('PRAGMA wal_autocheckpoint=0')
+
+
+def _pending_changes():
+    conn = db.get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM search_document_changes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _timed(fn, *args):
+    """Run fn from a fresh WAL, returning (ms, rows written, WAL bytes, result)"""
+    conn = db.get_connection()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    changes = conn.total_changes
+    start = time.perf_counter()
+    result = fn(*args)
+    ms = (time.perf_counter() - start) * 1000
+    written = conn.total_changes - changes
+    conn.close()
+    return ms, written, _wal_bytes(), result
+
+
+def main():
+    transfers = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    from app.player_transfers import store_transfers_in_db
+
+    runs = (
+        ("initial load", make_transfers(transfers)),
+        ("unchanged refresh", make_transfers(transfers)),
+        ("1% logos changed", make_transfers(transfers, logo_every=100)),
+        ("1% teams changed", make_transfers(transfers, logo_every=100, team_every=100)),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{transfers} transfers, game={GAME}")
+        for name, store in (("legacy", legacy_store), ("incremental", store_transfers_in_db)):
+            _fresh_db(tmp, name)
+            for label, data in runs:
+                ms, written, wal, _ = _timed(store, GAME, data)
+                print(f"  {name:12s} {label:18s} {ms:8.1f} ms  {written:7d} rows written"
+                      f"  {wal / 1024:9.1f} KiB WAL  {_pending_changes()} changes left unapplied")
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Synthetic Liquipedia renders of the pages the scrapers read, shaped like
+the real markup closely enough for every parser to find its data, and the
+scraper calls that read them. Shared by the response cache and parser
+benchmarks and the parser tests.
+
+    python -m benchmarks.liquipedia_fixtures directory
+
+records Liquipedia's current renders of the same pages into a response
+cache directory instead, for bench_html_parsing's fixture_dir.
+"""
+import sys
+
+from benchmarks.bench_page_revisions import FILLER, games_html, transfers_html
+
+WIKI = "valorant"
+MATCHES_PAGE = "Liquipedia:Matches"
+TEAM_PAGE = "Team_Heretics"
+PLAYER_PAGE = "Boo"
+TOURNAMENT_PAGE = "VCT/2025/Champions"
+GROUPS_PAGE = "VCT/2025/Champions/Group_Stage"
+EWC_WIKI = "esports"
+EWC_PAGE = "Esports_World_Cup/2025"
+STANDINGS_PAGE = "Esports_World_Cup/2025/Club_Championship_Standings"
+
+
+def _filler(fraction):
+    """Part of the Main_Page filler, cut at an element boundary"""
+    return FILLER[:FILLER.rfind("</div>", 0, int(len(FILLER) * fraction)) + len("</div>")]
+
+
+def _opponent(side, i):
+    return (f"<div class='match-info-header-opponent{' match-info-header-opponent-left' if side == 'left' else ''}'>"
+            f"<span class='team-template-lightmode'><img src='/l{i}.png'></span>"
+            f"<span class='team-template-darkmode'><img src='/d{i}.png'></span>"
+            f"<span class='name'><a href='/valorant/T{side}{i}'>Team {side} {i}</a></span></div>")
+
+
+def matches_html(matches=150):
+    """Both match layouts: .match-info for /matches and .match for /game_matches"""
+    sections = []
+    for area in ("1", "2"):
+        blocks = []
+        for i in range(matches):
+            blocks.append(
+                f"<div class='match-info'>{_opponent('left', i)}"
+                f"<div class='match-info-header-scoreholder'><span class='match-info-header-scoreholder-score'>{i % 3}</span>"
+                f"<span class='match-info-header-scoreholder-score'>{i % 2}</span>"
+                f"<span class='match-info-header-scoreholder-lower'>(Bo3)</span></div>{_opponent('right', i)}"
+                f"<span class='timer-object' data-timestamp='{1751000000 + i * 3600}'></span>"
+                f"<div class='match-info-tournament'><a href='/valorant/VCT/{i % 5}'><span>VCT Stage {i % 5} &amp; Playoffs</span></a>"
+                f"<span class='lightmode'><img src='/vct{i % 5}.png'></span></div>"
+                f"<div class='match-info-links'><a href='/valorant/Match:ID_{area}_{i}'>details</a>"
+                f"<a href='https://twitch.tv/vct{i % 4}'>stream</a></div>"
+                f"<div class='bracket-header'><!-- round {i} --><span>Group&nbsp;{'ABCD'[i % 4]}<br></span></div></div>"
+                f"<div class='match'><div class='team-left'><span class='team-template-text'>"
+                f"<a href='/valorant/L{i}'>Left {i}</a></span></div>"
+                f"<div class='team-right'><span class='team-template-text'><a href='/valorant/R{i}'>Right {i}</a></span></div>"
+                f"<div class='versus-upper'><span>{i % 3}</span><span>{i % 2}</span></div>"
+                f"<div class='versus-lower'><abbr>Bo3</abbr></div>"
+                f"<span class='timer-object' data-timestamp='{1751000000 + i * 3600}'></span>"
+                f"<div class='match-tournament'><span class='tournament-icon'><img src='/vct{i % 5}.png'></span>"
+                f"<span class='tournament-name'><a href='/valorant/VCT/{i % 5}'>VCT Stage {i % 5}</a></span></div>"
+                f"<div class='match-bottom-bar'><a href='/valorant/Match:ID_{area}_{i}'>details</a></div></div>")
+        sections.append(f"<div data-toggle-area-content='{area}'>{''.join(blocks)}</div>")
+    return _filler(0.25) + "".join(sections)
+
+
+def team_html():
+    cells = "".join(f"<div><div class='infobox-cell-2 infobox-description'>{key}:</div>"
+                    f"<div class='infobox-cell-2'><img src='/{key[:3]}.png'>{key} value</div></div>"
+                    for key in ('Location', 'Region', 'Coach', 'Manager'))
+    matches = "".join(
+        f"<table class='infobox_matches_content'><tr><td class='team-left'><a title='Heretics'><img src='/h.png'></a></td>"
+        f"<td class='versus'><div>vs</div><abbr title='Best of 3'>Bo3</abbr></td>"
+        f"<td class='team-right'><a title='Opponent {i}'><img src='/o{i}.png'></a></td></tr>"
+        f"<tr><td><span class='timer-object' data-timestamp='{1751000000 + i * 86400}'></span>"
+        f"<a title='VCT {i}'><img src='/vct{i}.png'></a></td></tr></table>" for i in range(8))
+    return (f"{_filler(0.33)}<div class='fo-nttax-infobox'><div class='infobox-header'>Team Heretics</div>"
+            f"<div class='infobox-image-wrapper'><img src='/heretics.png'></div>{cells}"
+            f"<div class='infobox-center infobox-icons'><a class='external text' href='https://x.com/heretics'>"
+            f"<i class='lp-icon lp-twitter'></i></a></div>{matches}</div>")
+
+
+def tournament_html(teams=16):
+    cards = "".join(
+        f"<div class='teamcard' data-toggle-area='{t}'><center><a href='/valorant/Team_{t}'>Team {t}</a></center></div>"
+        f"<table data-toggle-area-content='{t}'>" + "".join(
+            f"<tr><th>{role}</th><td><span class='flag'><a title='Country {p}'><img src='/f{p}.png'></a></span>"
+            f"<a title='Player {t}-{p}' href='/valorant/P{t}_{p}'>Player {t}-{p}</a></td></tr>"
+            for p, role in enumerate(('1', '2', '3', '4', '5', 'C')))
+        + "</table>" for t in range(teams))
+    return _filler(0.25) + cards
+
+
+def player_html():
+    cells = "".join(f"<div><div class='infobox-cell-2 infobox-description'>{key}:</div>"
+                    f"<div class='infobox-cell-2'><span class='flag'><img src='/{key[:3]}.png'></span>{key} value</div></div>"
+                    for key in ('Romanized Name', 'Nationality', 'Born', 'Region', 'Role'))
+    heroes = "".join(f"<a title='Agent {h}'><img src='/a{h}.png'></a>" for h in range(3))
+    history = "".join(f"<tr><td>202{y}-01-01 — 202{y + 1}-01-01</td><td><a title='Team {y}'>Team {y}</a>"
+                      f"<span>(Loan)</span></td></tr>" for y in range(4))
+    matches = "".join(
+        f"<table class='infobox_matches_content'><tr><td class='team-left'><a title='Heretics'><img src='/h.png'></a></td>"
+        f"<td class='versus'><div>vs</div><abbr title='Best of 3'>Bo3</abbr></td>"
+        f"<td class='team-right'><a title='Opponent {i}'><img src='/o{i}.png'></a></td></tr>"
+        f"<tr><td><span class='timer-object' data-timestamp='{1751000000 + i * 86400}'></span>"
+        f"<a title='VCT {i}'><img src='/vct{i}.png'></a></td></tr></table>" for i in range(6))
+    return (f"{_filler(0.33)}<div class='fo-nttax-infobox'><div class='infobox-header'>Boo"
+            f"<span class='team-template-team-icon'><a title='Team Heretics'><img src='/h.png'></a></span></div>"
+            f"<div class='infobox-image-wrapper'><img src='/boo.png'></div>{cells}"
+            f"<div><div class='infobox-cell-2 infobox-description'>Signature Hero:</div><div>{heroes}</div></div>"
+            f"<div class='infobox-center infobox-icons'><a class='external text' href='https://x.com/boo'>"
+            f"<i class='lp-icon lp-twitter'></i></a></div>"
+            f"<div class='infobox-center'><table><tbody>{history}</tbody></table></div></div>{matches}")
+
+
+def standings_html(teams=24):
+    rows = "".join(
+        f"<tr data-toggle-area-content='{area}'><td>{t + 1}.</td><td>+{t % 3}</td>"
+        f"<td><span class='team-template-lightmode'><img src='/l{t}.png'></span>"
+        f"<span class='team-template-darkmode'><img src='/d{t}.png'></span>"
+        f"<span class='team-template-text'><a>Club {t}</a></span></td><td>{(24 - t) * 100 + int(area)}</td>"
+        f"<td>{t + 1}</td></tr>" for area in ("4", "8", "11", "15", "18", "22", "25") for t in range(teams))
+    return (f"{_filler(0.25)}<table class='wikitable'><tr><th>Prize</th></tr><tr><td>$1,000,000</td></tr></table>"
+            f"<table class='wikitable sortable'><tr><th>#</th><th></th><th>Club</th><th>Points</th><th>Total</th></tr>"
+            f"{rows}</table>")
+
+
+def groups_html(groups=4, matches=12):
+    boxes = "".join(
+        f"<div class='template-box'><div class='brkts-matchlist-title'>Group {'ABCD'[g]}</div>" + "".join(
+            f"<div class='brkts-matchlist-match'>"
+            f"<div class='brkts-matchlist-opponent' aria-label='Team {g}-{m}a'><img src='/{g}{m}a.png'></div>"
+            f"<div class='brkts-matchlist-score'>{m % 3}</div>"
+            f"<div class='brkts-matchlist-opponent' aria-label='Team {g}-{m}b'><img src='/{g}{m}b.png'></div>"
+            f"<span class='timer-object'>June {m + 1}, 2025 - 17:00 CEST</span></div>" for m in range(matches))
+        + "</div>" for g in range(groups))
+    return _filler(0.25) + boxes
+
+
+PAGES = {
+    (WIKI, MATCHES_PAGE): matches_html,
+    (WIKI, "Main_Page"): lambda: transfers_html(0),
+    (WIKI, TEAM_PAGE): team_html,
+    (WIKI, PLAYER_PAGE): player_html,
+    (WIKI, TOURNAMENT_PAGE): tournament_html,
+    (WIKI, GROUPS_PAGE): groups_html,
+    (EWC_WIKI, EWC_PAGE): lambda: games_html(0),
+    (EWC_WIKI, STANDINGS_PAGE): standings_html,
+}
+
+
+def scrapers():
+    """{name: call} of each scraper that reads PAGES"""
+    from app import matches_mohamed, game_matches
+    from app.page_revisions import fetch_page_html
+    from app.player_transfers import parse_transfer_html
+    from app.team_information import get_team_info
+    from app.player_information import get_player_info
+    from app.ewc_teams_players import fetch_teams_players
+    from app.ewc_rank import extract_standings_from_html
+    from app.liquipedia import parse_ewc_games_html
+    from app.utils import extract_matches_from_html
+    return {
+        "scrape_matches": lambda: matches_mohamed.scrape_matches(WIKI),
+        "game_matches.scrape_matches": lambda: game_matches.scrape_matches(WIKI),
+        "parse_transfer_html": lambda: parse_transfer_html(fetch_page_html(WIKI, "Main_Page")),
+        "get_team_info": lambda: get_team_info(WIKI, TEAM_PAGE),
+        "get_player_info": lambda: get_player_info(WIKI, PLAYER_PAGE),
+        "fetch_teams_players": lambda: fetch_teams_players(WIKI, TOURNAMENT_PAGE),
+        "extract_matches_from_html": lambda: extract_matches_from_html(fetch_page_html(WIKI, GROUPS_PAGE)),
+        "parse_ewc_games_html": lambda: parse_ewc_games_html(fetch_page_html(EWC_WIKI, EWC_PAGE)),
+        "extract_standings_from_html":
+            lambda: extract_standings_from_html(fetch_page_html(EWC_WIKI, STANDINGS_PAGE)),
+    }
+
+
+# The page each scraper reads
+SCRAPER_PAGES = {
+    "scrape_matches": (WIKI, MATCHES_PAGE),
+    "game_matches.scrape_matches": (WIKI, MATCHES_PAGE),
+    "parse_transfer_html": (WIKI, "Main_Page"),
+    "get_team_info": (WIKI, TEAM_PAGE),
+    "get_player_info": (WIKI, PLAYER_PAGE),
+    "fetch_teams_players": (WIKI, TOURNAMENT_PAGE),
+    "extract_matches_from_html": (WIKI, GROUPS_PAGE),
+    "parse_ewc_games_html": (EWC_WIKI, EWC_PAGE),
+    "extract_standings_from_html": (EWC_WIKI, STANDINGS_PAGE),
+}
+
+
+def run_scrapers():
+    """{name: output} of each scraper that reads PAGES"""
+    return {name: scrape() for name, scrape in scrapers().items()}
+
+
+def record_fixtures(cache, lastrevid=1000, touched="2025-07-01T00:00:00Z"):
+    """Store every page in a ResponseCache, for replay"""
+    for (wiki, page), render in PAGES.items():
+        cache.put(wiki, page, {"lastrevid": lastrevid, "touched": touched}, render())
+
+
+def record_live(directory):
+    """
+    Store Liquipedia's current render of every page in PAGES in a
+    ResponseCache at directory, waiting out the rate limits between them
+    """
+    from app.liquipedia_client import get_client
+    from app.page_revisions import _parse_params, api_url, fetch_page_info
+    from app.response_cache import ResponseCache
+    cache = ResponseCache(directory)
+    for wiki, page in PAGES:
+        info = fetch_page_info(wiki, page)
+        if info is None:
+            raise RuntimeError(f"{wiki}/{page} has no revision to record")
+        response = get_client().get(api_url(wiki), params=_parse_params(page), max_wait=None)
+        response.raise_for_status()
+        cache.put(wiki, page, info, response.json()['parse']['text']['*'])
+        print(f"recorded {wiki}/{page} at revision {info['lastrevid']}")
+
+
+if __name__ == "__main__":
+    record_live(sys.argv[1])
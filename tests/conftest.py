@@ -0,0 +1,14 @@
+import pytest
+
+from app import db
+from app.migrations import migrate
+
+
+@pytest.fixture
+def migrated_db(tmp_path, monkeypatch):
+    """A fresh database at the latest schema behind get_connection()"""
+    db.close_connection()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "test.db"))
+    migrate(legacy_dir=None)
+    yield db.DB_PATH
+    db.close_connection()
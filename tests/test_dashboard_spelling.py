@@ -0,0 +1,36 @@
+from app import db
+from app.matches_dashborad.match_model import MatchModel
+from app.matches_dashborad.matches_dashbord_test import save_live_matches_to_db, update_match_in_db
+from app.spelling import suggest
+
+
+def _match(team1, team2):
+    return MatchModel(
+        game='valorant', status='Upcoming', tournament='VCT Masters', tournament_link='', tournament_icon='',
+        team1=team1, team1_url='', logo1_light='', logo1_dark='',
+        team2=team2, team2_url='', logo2_light='', logo2_dark='',
+        score='', match_time='2025-07-01T17:00:00+00:00', format='Bo3', stream_links=[], details_link='')
+
+
+def _pending_changes():
+    conn = db.get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM search_document_changes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_dashboard_insert_and_update_reach_suggest(migrated_db):
+    assert save_live_matches_to_db('valorant', [_match('Quarkwyvern', 'Team Heretics')])['saved'] == 1
+    assert _pending_changes() == 0
+    assert 'quarkwyvern' in suggest('quarkwyvren')
+
+    conn = db.get_connection()
+    try:
+        uid = conn.execute("SELECT uid FROM matches WHERE team1 = 'Quarkwyvern'").fetchone()[0]
+    finally:
+        conn.close()
+    assert update_match_in_db(uid, {'team1': 'Zephyrdrake'}) == {"success": True}
+    assert _pending_changes() == 0
+    assert 'zephyrdrake' in suggest('zephyrdrak')
+    assert 'quarkwyvern' not in suggest('quarkwyvren')
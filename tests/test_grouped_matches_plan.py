@@ -0,0 +1,63 @@
+import pytest
+
+from app import db
+from app.crud.game_matches_crud import get_grouped_matches
+from benchmarks.bench_grouped_matches import seed
+
+
+class _RecordingConnection:
+    """The connection get_grouped_matches is given, keeping each statement it runs"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = []
+
+    def cursor(self):
+        return _RecordingCursor(self, self.conn.cursor())
+
+
+class _RecordingCursor:
+    def __init__(self, owner, cursor):
+        self.owner = owner
+        self.cursor = cursor
+
+    def execute(self, sql, params=()):
+        self.owner.statements.append((sql, list(params)))
+        return self.cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+@pytest.fixture
+def conn(migrated_db):
+    seed(5000)
+    conn = db.get_connection()
+    yield conn
+    conn.close()
+
+
+def _page_plan(conn, **filters):
+    """EXPLAIN QUERY PLAN of the page query get_grouped_matches runs for filters"""
+    recording = _RecordingConnection(conn)
+    get_grouped_matches(recording, **filters)
+    sql, params = recording.statements[0]
+    return ' | '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+@pytest.mark.parametrize("filters, index", [
+    ({'day': ['2025-03-01']}, 'idx_game_matches_timestamp'),
+    ({'day': ['2025-03-01', '2025-03-02'], 'timezone': 'Asia/Tokyo'}, 'idx_game_matches_timestamp'),
+    ({'game': ['valorant', 'dota2']}, 'COVERING INDEX idx_matches_games_game_match'),
+    ({'game': ['valorant'], 'day': ['2025-06-10']}, 'idx_game_matches_timestamp'),
+    ({'tournament': ['Tournament 7']}, 'idx_tournaments_name'),
+])
+def test_filtered_pages_are_index_backed(conn, filters, index):
+    plan = _page_plan(conn, **filters)
+    assert index in plan
+    assert 'SCAN m' not in plan
+
+
+def test_game_filter_index_covers_game_and_match_id(conn):
+    columns = [row['name'] for row in conn.execute("PRAGMA index_info('idx_matches_games_game_match')")]
+    assert columns == ['game', 'match_id']
@@ -0,0 +1,39 @@
+import pytest
+
+from app import html_parsing
+from app.response_cache import ResponseCache, set_response_cache
+from benchmarks.bench_html_parsing import BACKENDS
+from benchmarks.liquipedia_fixtures import record_fixtures, scrapers
+
+
+@pytest.fixture(scope="module")
+def replay(tmp_path_factory):
+    """Replay the synthetic render of every page the scrapers read"""
+    configured = html_parsing.HTML_PARSER, html_parsing.STRAIN
+    directory = str(tmp_path_factory.mktemp("liquipedia_cache"))
+    record_fixtures(ResponseCache(directory))
+    set_response_cache(ResponseCache(directory, replay=True))
+    yield
+    set_response_cache(None)
+    html_parsing.set_html_parser(*configured)
+
+
+def _outputs(parser, strain):
+    html_parsing.set_html_parser(parser, strain)
+    return {name: scrape() for name, scrape in scrapers().items()}
+
+
+@pytest.fixture(scope="module")
+def expected(replay):
+    """What every scraper returns with html.parser on the whole page"""
+    _, parser, strain = BACKENDS[0]
+    outputs = _outputs(parser, strain)
+    assert all(outputs.values()), [name for name, output in outputs.items() if not output]
+    return outputs
+
+
+@pytest.mark.parametrize("label, parser, strain", BACKENDS[1:], ids=[label for label, _, _ in BACKENDS[1:]])
+def test_backends_match_html_parser_on_the_whole_page(replay, expected, label, parser, strain):
+    if parser == "lxml" and not html_parsing.HAVE_LXML:
+        pytest.skip("lxml is not installed")
+    assert _outputs(parser, strain) == expected
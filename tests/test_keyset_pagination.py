@@ -0,0 +1,72 @@
+import pytest
+
+from app import db
+from app.matches_mohamed import get_matches_by_filters, get_matches_by_filters_keyset
+from app.optimized_pagination import KeysetPagination
+from benchmarks.bench_keyset_pagination import seed
+
+
+class _RecordingCursor:
+    """The cursor KeysetPagination is given, keeping each statement it runs"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, list(params)))
+        return self.cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+@pytest.fixture
+def conn(migrated_db):
+    seed(2000)
+    conn = db.get_connection()
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("sort_by", ['date', 'player_name', 'old_team_name', 'new_team_name', 'created_at'])
+@pytest.mark.parametrize("order", ['ASC', 'DESC'])
+def test_transfer_keyset_pages_read_an_index_in_order(conn, sort_by, order):
+    paginator = KeysetPagination('transfers', sort_by, order)
+    first = paginator.paginate(conn.cursor(), '1=1', [], 50, '')
+    recording = _RecordingCursor(conn.cursor())
+    paginator.paginate(recording, '1=1', [], 50, first['next_cursor'])
+    for sql, params in recording.statements:
+        plan = ' | '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        assert f'idx_transfers_{sort_by}_id' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+def _insert_matches(count):
+    conn = db.get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO matches (game, tournament, team1, team2, status, uid) VALUES (?, ?, ?, ?, ?, ?)",
+            (('valorant' if i % 2 else 'dota2', 'Tournament', f'team{i}', f'team{i + 1}', 'Not Started', f'm{i}')
+             for i in range(count)))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_matches_keyset_walk_matches_offset_pages(migrated_db):
+    _insert_matches(25)
+    walked, cursor = [], None
+    while True:
+        matches, cursor = get_matches_by_filters_keyset(games=['valorant'], per_page=5, cursor=cursor)
+        walked.extend(match['id'] for match in matches)
+        if cursor is None:
+            break
+    matches, total = get_matches_by_filters(games=['valorant'], per_page=100)
+    assert walked == [match['id'] for match in matches]
+    assert total == 12
+
+
+def test_matches_keyset_rejects_a_malformed_cursor(migrated_db):
+    with pytest.raises(ValueError):
+        get_matches_by_filters_keyset(cursor='not-a-cursor')
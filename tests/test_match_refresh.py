@@ -0,0 +1,43 @@
+import asyncio
+import functools
+
+import httpx
+
+from app import liquipedia_client, match_refresh
+from app.liquipedia_client import AsyncLiquipediaClient, TokenBucket
+from benchmarks.liquipedia_fixtures import MATCHES_PAGE, matches_html
+
+GAMES = [f"game{i:02d}" for i in range(20)]
+
+
+def _wiki(request):
+    """Answer prop=info and action=parse for every game's Liquipedia:Matches"""
+    params = request.url.params
+    if params.get("action") == "parse":
+        assert params["page"] == MATCHES_PAGE
+        return httpx.Response(200, json={"parse": {"title": MATCHES_PAGE, "text": {"*": matches_html(5)}}})
+    return httpx.Response(200, json={"query": {"pages": [
+        {"title": params["titles"], "lastrevid": 1000, "touched": "2025-07-01T00:00:00Z"}]}})
+
+
+def test_refresh_all_matches_waits_out_real_intervals(migrated_db, monkeypatch):
+    # The production limits, with the waits recorded instead of slept
+    monkeypatch.setattr(liquipedia_client, "PARSE_BUCKET", TokenBucket(30))
+    monkeypatch.setattr(liquipedia_client, "REQUEST_BUCKET", TokenBucket(2, 3))
+    waits = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        waits.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(liquipedia_client.asyncio, "sleep", sleep)
+    monkeypatch.setattr(match_refresh, "AsyncLiquipediaClient",
+                        functools.partial(AsyncLiquipediaClient, transport=httpx.MockTransport(_wiki)))
+
+    results = match_refresh.refresh_all_matches(GAMES, concurrency=20, processes=1)
+
+    assert [game for game, result in results.items() if "error" in result] == []
+    assert all(results[game]["matches"]["inserted"] > 0 for game in GAMES)
+    # The last of 20 parses is queued 19 parse intervals out
+    assert max(waits) >= 19 * 30 - 1
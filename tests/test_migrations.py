@@ -0,0 +1,52 @@
+import json
+
+from app import db
+from app.migrations import migrate
+
+STANDINGS = {"Week 1": [
+    {"Ranking": "1.", "Trend": "New", "Team": "Team Heretics", "Logo_Light": "", "Logo_Dark": "",
+     "Points": "1000", "Total Rank": "-"},
+]}
+
+
+def _legacy_files(directory):
+    (directory / "club_championship_standings_api.json").write_text(json.dumps(STANDINGS), encoding="utf-8")
+    (directory / "valorant_transfer_hash.txt").write_text("abc123\n", encoding="utf-8")
+
+
+def _imported():
+    conn = db.get_connection()
+    try:
+        return (conn.execute("SELECT COUNT(*) FROM ewc_standings").fetchone()[0],
+                [tuple(row) for row in conn.execute("SELECT consumer, wiki, content_hash FROM page_revisions")])
+    finally:
+        conn.close()
+
+
+def test_legacy_files_come_from_legacy_dir_not_the_working_directory(tmp_path, monkeypatch):
+    legacy, elsewhere = tmp_path / "legacy", tmp_path / "elsewhere"
+    legacy.mkdir()
+    elsewhere.mkdir()
+    _legacy_files(legacy)
+    _legacy_files(elsewhere)
+    db.close_connection()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "imported.db"))
+    monkeypatch.chdir(elsewhere)
+    migrate(legacy_dir=str(legacy))
+    assert _imported() == (1, [("transfers_file", "valorant", "abc123")])
+
+    # Imports run with their migration only, never again
+    (legacy / "valorant_transfer_hash.txt").write_text("def456\n", encoding="utf-8")
+    assert migrate(legacy_dir=str(legacy)) == 0
+    assert _imported() == (1, [("transfers_file", "valorant", "abc123")])
+    db.close_connection()
+
+
+def test_migrations_without_legacy_dir_start_empty(tmp_path, monkeypatch):
+    _legacy_files(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    db.close_connection()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "empty.db"))
+    migrate(legacy_dir=None)
+    assert _imported() == (0, [])
+    db.close_connection()
@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+from app import db, trigram_index
+from app.news import get_news_items
+from app.player_transfers import get_transfers_from_db
+
+PLAYERS = ('Östen', 'östen', 'OSTEN', 'Björn', 'BJÖRN', 'Zoë', 'ZOË')
+
+
+@pytest.fixture
+def names(migrated_db):
+    conn = db.get_connection()
+    try:
+        conn.executemany("INSERT INTO transfers (unique_id, game, player_name) VALUES (?, 'valorant', ?)",
+                         ((f"t{i}", name) for i, name in enumerate(PLAYERS)))
+        conn.executemany("INSERT INTO news (title, description, writer) VALUES (?, '', ?)",
+                         ((f"{name} signs", name) for name in PLAYERS))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _like_only(fn, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(trigram_index, 'MIN_TRIGRAM_LENGTH', sys.maxsize)
+        return fn()
+
+
+@pytest.mark.parametrize("value", ['Öst', 'öst', 'ost', 'JÖRN', 'jörn', 'björn', 'Zoë', 'OË'])
+def test_trigram_filters_match_like_for_non_ascii_case(names, monkeypatch, value):
+    def transfers():
+        return sorted(t['player']['name'] for t in get_transfers_from_db(player_name=value, per_page=50)['transfers'])
+
+    def news():
+        return sorted(n['writer'] for n in get_news_items(writer=value, search=value, per_page=50)['news'])
+
+    assert transfers() == _like_only(transfers, monkeypatch)
+    assert news() == _like_only(news, monkeypatch)